@@ -1,8 +1,7 @@
-import time
-from django.contrib import admin
-from django.core.management import call_command
-from .models import Contest, Problem, Participant, RatingHistory
+from django.contrib import admin, messages
+from .models import Contest, Problem, Participant, RatingHistory, Submission, ParticipantProblemResult, ProblemStatistics
 from .utils import fetch_contest_data
+from .tasks import start_rating_job, replay_contest_ratings
 
 # 1. 대회(Contest)
 @admin.register(Contest)
@@ -20,23 +19,39 @@ class ContestAdmin(admin.ModelAdmin):
     def has_editorial(self, obj):
         return bool(obj.editorial_pdf)
     
-    actions = ['refresh_from_codeforces', 'apply_elo_rating']
+    actions = ['refresh_from_codeforces', 'apply_elo_rating', 'revert_elo_rating', 'replay_elo_ratings']
 
     @admin.action(description='ELO rating 적용 (선택된 대회)')
     def apply_elo_rating(self, request, queryset):
-        success_count = 0
-        fail_count = 0
+        # 계산은 Celery 태스크에서 진행 (요청 처리 중에 기다리지 않음)
+        job_count = 0
+        skip_count = 0
         for contest in queryset:
-            try:
-                # apply_rating management command를 프로그래매틱하게 호출 (인자: contest_id)
-                call_command('apply_rating', contest.id)
-                success_count += 1
-            except Exception as e:
-                fail_count += 1
-                from django.contrib import messages
-                self.message_user(request, f"대회 {contest.id} ELO 적용 중 오류 발생: {str(e)}", level=messages.ERROR)
-        
-        self.message_user(request, f"{success_count}건의 대회 ELO rating 산정이 완료되었습니다. (실패: {fail_count}건)")
+            if contest.is_rating_applied:
+                skip_count += 1
+                continue
+            job_id, created = start_rating_job(contest.id)
+            if created:
+                job_count += 1
+            else:
+                skip_count += 1
+
+        self.message_user(request, f"{job_count}건의 대회 ELO rating 산정 작업이 접수되었습니다. (이미 반영/접수됨: {skip_count}건)")
+
+    @admin.action(description='ELO rating 반영 취소 후 전체 재계산 (선택된 대회)')
+    def revert_elo_rating(self, request, queryset):
+        # 이후 대회들이 취소된 대회의 결과에 의존하므로 개별 차감이 아니라 전체 대회를 다시 계산
+        result = replay_contest_ratings(list(queryset.values_list('id', flat=True)))
+        if not result['success']:
+            # 반영 중인 작업이 있으면 아무것도 취소하지 않음
+            self.message_user(request, result['message'], level=messages.ERROR)
+            return
+        self.message_user(request, f"{result['unapplied']}건의 대회 반영을 취소했습니다. {result['message']}")
+
+    @admin.action(description='ELO rating 전체 재계산 (반영된 모든 대회를 시간순으로)')
+    def replay_elo_ratings(self, request, queryset):
+        result = replay_contest_ratings()
+        self.message_user(request, result['message'], level=messages.INFO if result['success'] else messages.ERROR)
 
     @admin.action(description='Codeforces에서 데이터 가져오기 (선택된 대회)')
     def refresh_from_codeforces(self, request, queryset):
@@ -47,10 +62,7 @@ class ContestAdmin(admin.ModelAdmin):
         fail_count = 0
         
         for contest in queryset:
-            # Codeforces API 제한(초당 5회)을 준수하기 위해 0.5초 대기
-            time.sleep(0.5)
-            
-            # utils.py에 정의된 fetch 함수 호출
+            # utils.py에 정의된 fetch 함수 호출 (API 호출 제한은 공용 클라이언트가 처리)
             if fetch_contest_data(contest.id):
                 success_count += 1
             else:
@@ -82,16 +94,43 @@ class RatingHistoryAdmin(admin.ModelAdmin):
 
     actions = ['revert_rating_change']
 
-    @admin.action(description='선택된 엘로 레이팅 변동 기록을 유저 프로필에 롤백(회귀)시키기')
+    @admin.action(description='선택된 기록의 대회 레이팅 반영 취소 후 전체 재계산')
     def revert_rating_change(self, request, queryset):
-        rolled_back_count = 0
-        for history in queryset:
-            # 연관된 사용자의 프로필 조회
-            if hasattr(history.user, 'profile'):
-                profile = history.user.profile
-                # 변동(rating_change)만큼 빼주어서 과거의 레이팅으로 회귀
-                profile.elo_rating -= history.rating_change
-                profile.save()
-                rolled_back_count += 1
-        
-        self.message_user(request, f"{rolled_back_count}명의 사용자 레이팅이 성공적으로 회귀되었습니다.")
+        # 기록별로 변동량만 빼면 이후 대회의 결과가 어긋나므로 대회 단위로 취소하고 전체를 다시 계산
+        contest_ids = sorted(set(queryset.values_list('contest_id', flat=True)))
+        result = replay_contest_ratings(contest_ids)
+        if not result['success']:
+            # 반영 중인 작업이 있으면 아무것도 취소하지 않음
+            self.message_user(request, result['message'], level=messages.ERROR)
+            return
+        self.message_user(request, f"{result['unapplied']}건의 대회 반영을 취소했습니다. {result['message']}")
+
+# 5. 제출 기록(Submission)
+@admin.register(Submission)
+class SubmissionAdmin(admin.ModelAdmin):
+    list_display = ('id', 'contest', 'handle', 'problem_index', 'verdict', 'creation_time')
+    list_filter = ('contest', 'verdict')
+    search_fields = ('handle',)
+    # Codeforces에서 수집한 원본 기록이므로 읽기 전용
+    readonly_fields = ('id', 'contest', 'handle', 'problem_index', 'verdict', 'creation_time')
+
+# 6. 문제별 풀이 상태(ParticipantProblemResult)
+@admin.register(ParticipantProblemResult)
+class ParticipantProblemResultAdmin(admin.ModelAdmin):
+    list_display = ('participant', 'problem', 'solved', 'attempts', 'accepted_at', 'last_submission_id')
+    list_filter = ('problem__contest', 'solved')
+    search_fields = ('participant__user__username',)
+    # 업데이터가 제출 기록으로 관리하는 값이므로 읽기 전용
+    readonly_fields = ('participant', 'problem', 'solved', 'attempts', 'accepted_at', 'last_submission_id')
+
+# 7. 문제별 통계(ProblemStatistics)
+@admin.register(ProblemStatistics)
+class ProblemStatisticsAdmin(admin.ModelAdmin):
+    list_display = ('problem', 'solved_count', 'tried_count', 'attempt_count', 'first_solver', 'first_solved_at')
+    list_filter = ('contest',)
+    # 업데이터가 문제별 풀이 상태로 집계하는 값이므로 읽기 전용
+    readonly_fields = (
+        'contest', 'problem', 'solved_count', 'tried_count', 'attempt_count', 'first_solver', 'first_solved_at',
+        'frozen_solved_count', 'frozen_tried_count', 'frozen_attempt_count', 'frozen_first_solver',
+        'frozen_first_solved_at',
+    )
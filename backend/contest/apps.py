@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class ContestConfig(AppConfig):
     name = 'contest'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,171 @@
+"""
+Codeforces API 공용 클라이언트
+
+- 프로세스별 keep-alive 세션 (커넥션 풀 재사용)
+- 타임아웃, 지터를 준 지수 백오프 재시도
+- Redis 토큰 버킷으로 gunicorn / Celery 워커 / 관리 명령 전체의 호출 속도 제한
+  (Redis를 쓸 수 없으면 프로세스 내부 버킷으로 대체)
+"""
+import os
+import random
+import threading
+import time
+
+import redis
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+
+from main.redis_client import get_redis, mark_redis_unavailable
+
+API_BASE_URL = "https://codeforces.com/api/"
+
+RATE_LIMIT_KEY = "codeforces:ratelimit"
+
+# 토큰을 하나 예약하고, 사용 가능해질 때까지 기다려야 할 시간(초)을 반환
+# 시간은 Redis 서버 시각을 사용하여 프로세스 간 시계 차이를 없앰
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + (now - ts) * rate) - 1
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], 60)
+if tokens >= 0 then
+    return '0'
+end
+return tostring(-tokens / rate)
+"""
+
+# 재시도할 HTTP 상태 코드
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class CodeforcesAPIError(Exception):
+    """Codeforces API가 status=FAILED를 응답한 경우"""
+
+    def __init__(self, comment):
+        super().__init__(comment)
+        self.comment = comment
+
+    @property
+    def not_found(self):
+        """요청한 핸들/대회가 없다는 응답인지 (예: "handles: User with handle xxx not found")"""
+        return 'not found' in (self.comment or '').lower()
+
+
+class LocalTokenBucket:
+    """Redis를 쓸 수 없을 때 사용하는 프로세스 내부 토큰 버킷"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tokens = None
+        self._timestamp = None
+
+    def reserve(self, rate, capacity):
+        with self._lock:
+            now = time.monotonic()
+            if self._tokens is None:
+                self._tokens, self._timestamp = capacity, now
+            self._tokens = min(capacity, self._tokens + (now - self._timestamp) * rate) - 1
+            self._timestamp = now
+            return max(0.0, -self._tokens / rate)
+
+
+_local_bucket = LocalTokenBucket()
+_session = None
+_session_pid = None
+
+
+def get_session():
+    """프로세스마다 하나의 세션 사용 (Celery prefork 이후 소켓 공유 방지)"""
+    global _session, _session_pid
+
+    if _session is None or _session_pid != os.getpid():
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=settings.CODEFORCES_API_POOL_SIZE)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _session, _session_pid = session, os.getpid()
+    return _session
+
+
+def reserve_token():
+    """호출 예산에서 토큰 하나를 예약하고 대기해야 할 시간(초)을 반환"""
+    rate = settings.CODEFORCES_API_RATE
+    capacity = settings.CODEFORCES_API_BURST
+
+    client = get_redis()
+    if client is not None:
+        try:
+            wait = client.eval(TOKEN_BUCKET_SCRIPT, 1, RATE_LIMIT_KEY, rate, capacity)
+            return float(wait)
+        except redis.RedisError:
+            mark_redis_unavailable()
+    return _local_bucket.reserve(rate, capacity)
+
+
+def acquire_token():
+    """예산이 남아 있으면 바로, 아니면 필요한 만큼만 대기"""
+    wait = reserve_token()
+    if wait > 0:
+        time.sleep(wait)
+
+
+def backoff_delay(attempt):
+    """지수 백오프 (full jitter)"""
+    base = settings.CODEFORCES_API_BACKOFF * (2 ** attempt)
+    return random.uniform(0, base)
+
+
+def call_api(method, params=None, timeout=None):
+    """
+    Codeforces API를 호출하고 result를 반환
+
+    Args:
+        method (str): API 메서드명 (예: 'contest.status')
+        params (dict): 쿼리 파라미터
+        timeout (float): 요청 타임아웃 (초, 기본값: CODEFORCES_API_TIMEOUT)
+
+    Raises:
+        CodeforcesAPIError: status=FAILED 응답 (없는 핸들 등)
+        requests.RequestException: 재시도 후에도 네트워크/HTTP 오류가 계속되는 경우
+    """
+    url = API_BASE_URL + method
+    timeout = timeout or settings.CODEFORCES_API_TIMEOUT
+    max_retries = settings.CODEFORCES_API_MAX_RETRIES
+
+    attempt = 0
+    while True:
+        acquire_token()
+        try:
+            response = get_session().get(url, params=params, timeout=timeout)
+            if response.status_code in RETRY_STATUS_CODES:
+                response.raise_for_status()
+
+            try:
+                data = response.json()
+            except ValueError:
+                response.raise_for_status()
+                raise
+
+            if data.get('status') != 'OK':
+                comment = data.get('comment', '')
+                # 호출 제한 초과는 잠시 후 재시도
+                if 'Call limit exceeded' in comment and attempt < max_retries:
+                    time.sleep(backoff_delay(attempt))
+                    attempt += 1
+                    continue
+                raise CodeforcesAPIError(comment)
+            return data['result']
+
+        except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
+            retryable = not isinstance(e, requests.HTTPError) or e.response.status_code in RETRY_STATUS_CODES
+            if not retryable or attempt >= max_retries:
+                raise
+            time.sleep(backoff_delay(attempt))
+            attempt += 1
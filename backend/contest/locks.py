@@ -0,0 +1,150 @@
+"""
+대회 갱신 작업용 분산 락
+
+Celery 태스크와 run_contest_updater 명령이 같은 대회를 동시에 갱신하지 않도록
+대회별 Redis 락(TTL 포함)을 사용하고, 실행 중에 들어온 요청은 하나로 합쳐서
+현재 실행이 끝난 뒤 한 번 더 실행한다.
+Redis를 쓸 수 없으면 Django 캐시로 대체한다.
+"""
+import uuid
+
+import redis
+from django.conf import settings
+from django.core.cache import cache
+
+from main.redis_client import get_redis, mark_redis_unavailable
+
+# 락을 가진 쪽만 삭제하도록 토큰 비교 후 삭제
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# 실행 중에 쌓인 요청을 처리하기 위한 최대 재실행 횟수
+MAX_COALESCED_RUNS = 3
+
+
+def _lock_key(contest_id):
+    return f"contest:update:lock:{contest_id}"
+
+
+def _pending_key(contest_id):
+    return f"contest:update:pending:{contest_id}"
+
+
+def _acquire(key, token, ttl):
+    client = get_redis()
+    if client is not None:
+        try:
+            return bool(client.set(key, token, nx=True, ex=ttl))
+        except redis.RedisError:
+            mark_redis_unavailable()
+    return cache.add(key, token, ttl)
+
+
+def _release(key, token):
+    client = get_redis()
+    if client is not None:
+        try:
+            client.eval(RELEASE_SCRIPT, 1, key, token)
+            return
+        except redis.RedisError:
+            mark_redis_unavailable()
+    if cache.get(key) == token:
+        cache.delete(key)
+
+
+def _mark_pending(key, ttl):
+    client = get_redis()
+    if client is not None:
+        try:
+            client.set(key, 1, ex=ttl)
+            return
+        except redis.RedisError:
+            mark_redis_unavailable()
+    cache.set(key, 1, ttl)
+
+
+def _pop_pending(key):
+    client = get_redis()
+    if client is not None:
+        try:
+            pipe = client.pipeline()
+            pipe.get(key)
+            pipe.delete(key)
+            value, _ = pipe.execute()
+            return value is not None
+        except redis.RedisError:
+            mark_redis_unavailable()
+    value = cache.get(key)
+    cache.delete(key)
+    return value is not None
+
+
+def run_exclusive(contest_id, func, coalesce=True):
+    """
+    대회별 락을 잡고 func()을 실행
+
+    이미 다른 프로세스가 실행 중이면 대기 요청만 남기고 바로 None을 반환하며,
+    락을 가진 쪽은 실행이 끝난 뒤 대기 요청이 있으면 한 번 더 실행한다.
+    coalesce=False면 대기 요청을 남기지 않음 (락을 가진 쪽이 다시 실행하는 것은 자신의 작업이므로,
+    재계산처럼 다른 작업은 호출한 쪽에서 다시 시도)
+
+    Returns:
+        func()의 마지막 반환값, 건너뛴 경우 None
+    """
+    ttl = settings.CONTEST_UPDATE_LOCK_TTL
+    lock_key = _lock_key(contest_id)
+    pending_key = _pending_key(contest_id)
+    token = uuid.uuid4().hex
+
+    if not _acquire(lock_key, token, ttl):
+        if coalesce:
+            _mark_pending(pending_key, ttl)
+        return None
+
+    try:
+        _pop_pending(pending_key)
+        result = func()
+        for _ in range(MAX_COALESCED_RUNS):
+            if not _pop_pending(pending_key):
+                break
+            result = func()
+        return result
+    finally:
+        _release(lock_key, token)
+
+
+def _get(key):
+    client = get_redis()
+    if client is not None:
+        try:
+            value = client.get(key)
+            return value.decode() if isinstance(value, bytes) else value
+        except redis.RedisError:
+            mark_redis_unavailable()
+    return cache.get(key)
+
+
+def claim_job(key, job_id, ttl):
+    """
+    멱등 키에 작업 ID를 선점 (같은 작업이 중복으로 접수되지 않도록)
+
+    Returns:
+        새로 선점했으면 job_id, 이미 접수된 작업이 있으면 그 작업의 ID
+    """
+    if _acquire(key, job_id, ttl):
+        return job_id
+    return _get(key) or job_id
+
+
+def current_job(key):
+    """멱등 키에 기록된 작업 ID (없으면 None)"""
+    return _get(key)
+
+
+def release_job(key, job_id):
+    """작업이 실패해 다시 접수할 수 있도록 멱등 키 해제 (자신의 작업일 때만)"""
+    _release(key, job_id)
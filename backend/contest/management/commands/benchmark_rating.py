@@ -0,0 +1,117 @@
+import time
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from contest.models import Contest, Participant, RatingHistory
+from contest.rating_calculator import elo_deltas, pairwise_elo_deltas, apply_contest_rating, calculate_elo_changes
+from user.models import Profile
+
+User = get_user_model()
+
+# 쓰기 벤치마크용 임시 대회 ID (트랜잭션 롤백으로 흔적을 남기지 않음)
+BENCHMARK_CONTEST_ID = 999999999
+
+
+class Rollback(Exception):
+    pass
+
+
+#ELO 계산/반영 성능 측정용 명령
+#사용 예시 : python manage.py benchmark_rating --sizes 100 1000 10000
+#          python manage.py benchmark_rating --write 1000
+class Command(BaseCommand):
+    help = 'Benchmarks the vectorized ELO engine against the pairwise implementation'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', type=int, default=[100, 1000, 10000], help='Participant counts to measure')
+        parser.add_argument(
+            '--pairwise-limit',
+            type=int,
+            default=2000,
+            help='Skip the O(n^2) Python loop above this many participants (default: 2000)'
+        )
+        parser.add_argument(
+            '--write',
+            type=int,
+            metavar='N',
+            help='Measure DB write time of rating application with N participants (rolled back afterwards)'
+        )
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(options['seed'])
+
+        if options['write']:
+            self.benchmark_write(options['write'], rng)
+            return
+
+        for n in options['sizes']:
+            # 기본 레이팅(1500)이 섞인 현실적인 분포
+            ratings = np.where(rng.random(n) < 0.3, 1500, rng.normal(1500, 300, n).round()).astype(int)
+
+            start = time.perf_counter()
+            vectorized = elo_deltas(ratings)
+            vectorized_time = time.perf_counter() - start
+
+            if n > options['pairwise_limit']:
+                self.stdout.write(f"n={n:>6}: vectorized {vectorized_time * 1000:9.2f} ms | pairwise skipped")
+                continue
+
+            start = time.perf_counter()
+            pairwise = pairwise_elo_deltas(ratings.tolist())
+            pairwise_time = time.perf_counter() - start
+
+            max_diff = float(np.max(np.abs(vectorized - np.asarray(pairwise))))
+            self.stdout.write(
+                f"n={n:>6}: vectorized {vectorized_time * 1000:9.2f} ms | "
+                f"pairwise {pairwise_time * 1000:9.2f} ms | "
+                f"speedup {pairwise_time / vectorized_time:7.1f}x | max |diff| {max_diff:.2e}"
+            )
+
+    def benchmark_write(self, n, rng):
+        """임시 참가자 n명으로 레이팅 반영 쓰기 시간을 측정 (행 단위 INSERT 방식과 비교)"""
+        for label, runner in (('bulk', self.run_bulk), ('per-row', self.run_per_row)):
+            try:
+                with transaction.atomic():
+                    contest = self.create_fixture(n, rng)
+                    start = time.perf_counter()
+                    runner(contest)
+                    elapsed = time.perf_counter() - start
+                    raise Rollback
+            except Rollback:
+                pass
+            self.stdout.write(f"n={n:>6}: {label:<8} rating write {elapsed * 1000:9.2f} ms")
+
+    def create_fixture(self, n, rng):
+        contest = Contest.objects.create(id=BENCHMARK_CONTEST_ID, name='Rating benchmark')
+        users = User.objects.bulk_create([User(username=f'__bench_rating_{i}') for i in range(n)])
+        Profile.objects.bulk_create([
+            Profile(
+                user=user, school='-', department='-', student_id=f'__bench_{i}', real_name='-',
+                codeforces_id=f'__bench_{i}', elo_rating=int(rng.normal(1500, 300)),
+            )
+            for i, user in enumerate(users)
+        ])
+        Participant.objects.bulk_create([
+            Participant(user=user, contest=contest, total_score=float(rng.integers(0, 10)) * 500, penalty=int(rng.integers(0, 300)))
+            for user in users
+        ])
+        return contest
+
+    def run_bulk(self, contest):
+        apply_contest_rating(contest.id)
+
+    def run_per_row(self, contest):
+        # 기존 방식: 참가자마다 RatingHistory INSERT
+        participants = list(Participant.objects.filter(contest=contest).select_related('user__profile').order_by('-total_score', 'penalty'))
+        changes = calculate_elo_changes(participants)
+        profiles = []
+        for p in participants:
+            profile = p.user.profile
+            profile.elo_rating = max(0, int(profile.elo_rating + changes[p.id]))
+            profiles.append(profile)
+            RatingHistory.objects.create(user=p.user, contest=contest, rating=profile.elo_rating, rating_change=changes[p.id])
+        Profile.objects.bulk_update(profiles, ['elo_rating'])
+        contest.is_rating_applied = True
+        contest.save()
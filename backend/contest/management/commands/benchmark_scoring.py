@@ -0,0 +1,81 @@
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone as datetime_timezone
+import numpy as np
+from django.core.management.base import BaseCommand
+from contest.models import Problem
+from contest.scoring import ScoringContext, score_batch, batch_summaries
+from contest.utils import calculate_participant_stats
+
+VERDICTS = np.array(['OK', 'WRONG_ANSWER', 'TIME_LIMIT_EXCEEDED', 'RUNTIME_ERROR'])
+
+
+#대회 전체 재계산 성능 측정용 명령 (참가자별 calculate_participant_stats vs score_batch)
+#사용 예시 : python manage.py benchmark_scoring --participants 500 --submissions 20000
+class Command(BaseCommand):
+    help = 'Benchmarks the batch NumPy scorer against per-participant calculate_participant_stats'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--participants', type=int, default=500)
+        parser.add_argument('--submissions', type=int, default=20000)
+        parser.add_argument('--problems', type=int, default=10)
+        parser.add_argument('--repeat', type=int, default=3, help='Best of N runs')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(options['seed'])
+        n, m, q = options['participants'], options['submissions'], options['problems']
+
+        start = datetime(2026, 1, 1, 12, 0, tzinfo=datetime_timezone.utc)
+        end = start + timedelta(hours=2)
+        problems = [Problem(id=i, index=chr(ord('A') + i), points=500 * (i + 1)) for i in range(q)]
+
+        # 열 단위 입력 (대회 시작 전/종료 후 제출 포함)
+        columns = {
+            'ids': np.arange(1, m + 1, dtype=np.int64),
+            'participant': rng.integers(0, n, m),
+            'problem': rng.integers(0, q, m),
+            'time': np.sort(rng.integers(int(start.timestamp()) - 600, int(end.timestamp()) + 600, m)).astype(np.float64),
+            'accepted': rng.random(m) < 0.3,
+        }
+
+        # 기존 방식 입력: 참가자별 제출 dict 목록
+        by_participant = defaultdict(list)
+        for sub_id, participant, problem, created, accepted in zip(
+            columns['ids'].tolist(), columns['participant'].tolist(), columns['problem'].tolist(),
+            columns['time'].astype(int).tolist(), columns['accepted'].tolist()
+        ):
+            by_participant[participant].append({
+                'id': sub_id,
+                'creationTimeSeconds': created,
+                'problem': {'index': problems[problem].index},
+                'verdict': 'OK' if accepted else str(VERDICTS[1 + sub_id % 3]),
+            })
+
+        context = ScoringContext(problems, start, end)
+
+        def per_participant():
+            return [calculate_participant_stats(by_participant[i], context) for i in range(n)]
+
+        def batch():
+            return batch_summaries(score_batch(columns, context, n))
+
+        per_participant_time, expected = self.measure(per_participant, options['repeat'])
+        batch_time, actual = self.measure(batch, options['repeat'])
+
+        self.stdout.write(
+            f"participants={n} submissions={m} problems={q}: "
+            f"per-participant {per_participant_time * 1000:9.2f} ms | "
+            f"batch {batch_time * 1000:9.2f} ms | "
+            f"speedup {per_participant_time / batch_time:6.1f}x | "
+            f"{'identical' if actual == expected else 'MISMATCH'}"
+        )
+
+    def measure(self, func, repeat):
+        best = None
+        for _ in range(max(1, repeat)):
+            start = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best, result
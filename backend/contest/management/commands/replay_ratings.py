@@ -0,0 +1,26 @@
+import time
+from django.core.management.base import BaseCommand
+from contest.tasks import replay_contest_ratings
+
+#레이팅이 반영된 모든 대회를 시간순으로 다시 계산 (과거 대회 수정 후 사용)
+#사용 예시 : python manage.py replay_ratings
+#          python manage.py replay_ratings --exclude 1800   (해당 대회 반영 취소 후 재계산)
+class Command(BaseCommand):
+    help = 'Rebuilds RatingHistory and Profile.elo_rating by replaying every rated contest in order'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--exclude', nargs='*', type=int, default=[], help='Contest IDs to un-apply before replaying')
+
+    def handle(self, *args, **options):
+        # 레이팅 반영 작업과 겹치지 않도록 작업 키를 잡고 진행 (반영 중인 작업이 있으면 중단)
+        self.stdout.write("Replaying rated contests...")
+        start = time.perf_counter()
+        result = replay_contest_ratings(options['exclude'])
+        elapsed = time.perf_counter() - start
+
+        if not result['success']:
+            self.stdout.write(self.style.ERROR(result['message']))
+            return
+        if options['exclude']:
+            self.stdout.write(f"Marked {result['unapplied']} contests as unrated")
+        self.stdout.write(self.style.SUCCESS(f"{result['message']} ({elapsed:.2f}s)"))
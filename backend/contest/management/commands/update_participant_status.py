@@ -1,7 +1,7 @@
 from django.core.management.base import BaseCommand
 from contest.models import Contest, Participant
-from contest.utils import fetch_participant_status
-import time
+from contest.utils import fetch_participant_submissions, archive_submissions
+from contest.tasks import rescore_contest, rescore_participants
 
 class Command(BaseCommand):
     help = 'Updates participant status for a specific contest by fetching data from Codeforces'
@@ -9,6 +9,11 @@ class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument('contest_id', type=int, help='Contest ID to update')
         parser.add_argument('--user_id', type=int, help='Specific user ID (DB PK) to update', required=False)
+        parser.add_argument(
+            '--from-archive',
+            action='store_true',
+            help='Re-score every participant at once from archived submissions (no Codeforces API calls)'
+        )
 
     def handle(self, *args, **options):
         contest_id = options['contest_id']
@@ -22,6 +27,17 @@ class Command(BaseCommand):
 
         self.stdout.write(f"Updating participants for contest: {contest.name} ({contest_id})")
 
+        # 보관된 제출 기록으로 전체 참가자를 한 번에 재계산
+        # (워터마크가 0이면 아직 전체 제출이 보관되지 않았으므로 다른 참가자의 결과를 지우지 않도록 중단)
+        if options['from_archive']:
+            if not contest.last_submission_id:
+                self.stdout.write(self.style.ERROR(
+                    "Submission archive is not complete yet (run the updater first)."
+                ))
+                return
+            self.stdout.write(self.style.SUCCESS(rescore_contest(contest)))
+            return
+
         if user_id:
             participants = Participant.objects.filter(contest=contest, user_id=user_id)
         else:
@@ -33,7 +49,10 @@ class Command(BaseCommand):
 
         self.stdout.write(f"Found {participants.count()} participants.")
 
-        for participant in participants:
+        # 핸들별 제출을 보관소에 저장한 뒤 수집한 참가자만 보관소로 다시 계산
+        # (다른 참가자는 보관소에 제출이 없을 수 있으므로 건드리지 않음)
+        fetched = []
+        for participant in participants.select_related('user'):
             # User 프로필에서 Codeforces ID 가져오기
             try:
                 # user.profile이 없을 수 있으므로 예외 처리
@@ -45,16 +64,16 @@ class Command(BaseCommand):
                 
             self.stdout.write(f"Fetching status for {participant.user.username} ({handle})...")
             
-            result = fetch_participant_status(contest_id, handle)
-            
-            if result:
-                participant.problem_status = result['problem_status']
-                participant.total_score = result['total_score']
-                participant.penalty = result['penalty']
-                participant.save()
-                self.stdout.write(self.style.SUCCESS(f"Updated {participant.user.username}: {result['problem_status']}, Score: {result['total_score']}, Penalty: {result['penalty']}"))
-            else:
+            records = fetch_participant_submissions(contest_id, handle)
+            if records is None:
                 self.stdout.write(self.style.ERROR(f"Failed to fetch/update for {participant.user.username}"))
-            
-            # API Rate Limit 고려 (필요시 sleep 조정, 여기선 0.2초)
-            time.sleep(0.2)
+                continue
+            archive_submissions(contest, records)
+            fetched.append(participant.id)
+
+        if not fetched:
+            return
+
+        self.stdout.write(rescore_participants(contest, fetched))
+        for participant in Participant.objects.filter(id__in=fetched).select_related('user'):
+            self.stdout.write(self.style.SUCCESS(f"Updated {participant.user.username}: {participant.problem_status}, Score: {participant.total_score}, Penalty: {participant.penalty}"))
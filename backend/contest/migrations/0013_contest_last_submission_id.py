@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-18 11:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contest', '0012_contest_editorial_pdf'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contest',
+            name='last_submission_id',
+            field=models.BigIntegerField(default=0, verbose_name='마지막 반영 제출 ID'),
+        ),
+    ]
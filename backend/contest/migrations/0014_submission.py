@@ -0,0 +1,31 @@
+# Generated by Django 5.2.9 on 2026-10-18 11:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contest', '0013_contest_last_submission_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Submission',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False, verbose_name='제출 ID (Codeforces)')),
+                ('handle', models.CharField(max_length=50, verbose_name='Codeforces 핸들')),
+                ('problem_index', models.CharField(max_length=10, verbose_name='문제 번호')),
+                ('verdict', models.CharField(blank=True, max_length=50, null=True, verbose_name='채점 결과')),
+                ('creation_time', models.DateTimeField(verbose_name='제출 시각')),
+                ('contest', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='submissions', to='contest.contest', verbose_name='관련 대회')),
+            ],
+            options={
+                'verbose_name': '제출 기록',
+                'verbose_name_plural': '제출 기록',
+                'ordering': ['-id'],
+                'indexes': [models.Index(fields=['contest', 'handle'], name='submission_contest_handle_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.9 on 2026-10-18 12:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contest', '0014_submission'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contest',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='수정일'),
+        ),
+        migrations.AddField(
+            model_name='problem',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='수정일'),
+        ),
+    ]
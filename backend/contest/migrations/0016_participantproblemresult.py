@@ -0,0 +1,38 @@
+# Generated by Django 5.2.9 on 2026-10-18 12:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def reset_submission_watermarks(apps, schema_editor):
+    # 기존 대회는 문제별 상태가 없으므로 다음 업데이트 때 제출을 처음부터 다시 반영
+    Contest = apps.get_model('contest', 'Contest')
+    Contest.objects.update(last_submission_id=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contest', '0015_contest_problem_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ParticipantProblemResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('solved', models.BooleanField(default=False, verbose_name='정답 여부')),
+                ('attempts', models.IntegerField(default=0, verbose_name='오답 횟수')),
+                ('accepted_at', models.DateTimeField(blank=True, null=True, verbose_name='정답 제출 시각')),
+                ('last_submission_id', models.BigIntegerField(default=0, verbose_name='마지막 반영 제출 ID')),
+                ('participant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='problem_results', to='contest.participant', verbose_name='참가자')),
+                ('problem', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='participant_results', to='contest.problem', verbose_name='문제')),
+            ],
+            options={
+                'verbose_name': '문제별 풀이 상태',
+                'verbose_name_plural': '문제별 풀이 상태',
+                'unique_together': {('participant', 'problem')},
+            },
+        ),
+        migrations.RunPython(reset_submission_watermarks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.9 on 2026-10-18 12:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def fill_result_contest(apps, schema_editor):
+    ParticipantProblemResult = apps.get_model('contest', 'ParticipantProblemResult')
+    Participant = apps.get_model('contest', 'Participant')
+    for participant_id, contest_id in Participant.objects.values_list('id', 'contest_id'):
+        ParticipantProblemResult.objects.filter(participant_id=participant_id).update(contest_id=contest_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contest', '0016_participantproblemresult'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='participantproblemresult',
+            name='contest',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='problem_results', to='contest.contest', verbose_name='관련 대회'),
+        ),
+        migrations.RunPython(fill_result_contest, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='participantproblemresult',
+            name='contest',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='problem_results', to='contest.contest', verbose_name='관련 대회'),
+        ),
+        migrations.AlterField(
+            model_name='participant',
+            name='problem_status',
+            field=models.TextField(blank=True, default='', verbose_name='문제 풀이 현황'),
+        ),
+        migrations.AlterField(
+            model_name='participant',
+            name='frozen_problem_status',
+            field=models.TextField(blank=True, default='', verbose_name='프리즈 시점 풀이 현황'),
+        ),
+        migrations.AddIndex(
+            model_name='participantproblemresult',
+            index=models.Index(fields=['contest', 'problem', 'solved'], name='result_contest_problem_idx'),
+        ),
+    ]
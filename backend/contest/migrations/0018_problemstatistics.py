@@ -0,0 +1,43 @@
+# Generated by Django 5.2.9 on 2026-10-18 12:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def reset_submission_watermarks(apps, schema_editor):
+    # 기존 대회는 문제별 통계가 없으므로 다음 업데이트 때 제출을 처음부터 다시 반영
+    Contest = apps.get_model('contest', 'Contest')
+    Contest.objects.update(last_submission_id=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contest', '0017_problem_result_contest'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProblemStatistics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('solved_count', models.IntegerField(default=0, verbose_name='정답자 수')),
+                ('tried_count', models.IntegerField(default=0, verbose_name='시도자 수')),
+                ('attempt_count', models.IntegerField(default=0, verbose_name='제출 수')),
+                ('first_solved_at', models.DateTimeField(blank=True, null=True, verbose_name='최초 정답 시각')),
+                ('frozen_solved_count', models.IntegerField(default=0, verbose_name='프리즈 시점 정답자 수')),
+                ('frozen_tried_count', models.IntegerField(default=0, verbose_name='프리즈 시점 시도자 수')),
+                ('frozen_attempt_count', models.IntegerField(default=0, verbose_name='프리즈 시점 제출 수')),
+                ('frozen_first_solved_at', models.DateTimeField(blank=True, null=True, verbose_name='프리즈 시점 최초 정답 시각')),
+                ('contest', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='problem_statistics', to='contest.contest', verbose_name='관련 대회')),
+                ('first_solver', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='contest.participant', verbose_name='최초 정답자')),
+                ('frozen_first_solver', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='contest.participant', verbose_name='프리즈 시점 최초 정답자')),
+                ('problem', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='statistics', to='contest.problem', verbose_name='문제')),
+            ],
+            options={
+                'verbose_name': '문제별 통계',
+                'verbose_name_plural': '문제별 통계',
+            },
+        ),
+        migrations.RunPython(reset_submission_watermarks, migrations.RunPython.noop),
+    ]
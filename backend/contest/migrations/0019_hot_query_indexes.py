@@ -0,0 +1,27 @@
+# Generated by Django 5.2.9 on 2026-10-18 12:44
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contest', '0018_problemstatistics'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='participant',
+            index=models.Index(fields=['contest', '-total_score', 'penalty', 'id'], name='participant_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='participant',
+            index=models.Index(fields=['contest', '-frozen_total_score', 'frozen_penalty', 'id'], name='participant_frozen_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ratinghistory',
+            index=models.Index(fields=['user', '-created_at'], name='ratinghistory_user_idx'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+from django.db import migrations
+
+
+def backfill_problem_results(apps, schema_editor):
+    # 업데이터가 더 이상 갱신하지 않는 종료된 대회도 스코어보드에 문제별 결과가 보이도록
+    # 기존 풀이 현황 문자열("+:+2:-1")로 문제별 상태를 채움 (정답 시각은 알 수 없으므로 비워 둠)
+    # 진행 중인 대회는 워터마크가 0이라 다음 업데이트 때 제출 기록으로 다시 만들어짐
+    Contest = apps.get_model('contest', 'Contest')
+    Participant = apps.get_model('contest', 'Participant')
+    ParticipantProblemResult = apps.get_model('contest', 'ParticipantProblemResult')
+
+    for contest in Contest.objects.all().iterator():
+        problems = list(contest.problems.order_by('index'))
+        if not problems:
+            continue
+
+        rows = []
+        participants = (
+            Participant.objects.filter(contest=contest, problem_results__isnull=True)
+            .exclude(problem_status='')
+            .only('id', 'problem_status')
+        )
+        for participant in participants.iterator():
+            parts = participant.problem_status.split(':')
+            if len(parts) != len(problems):
+                continue
+            for problem, part in zip(problems, parts):
+                solved = part.startswith('+')
+                digits = part.lstrip('+-')
+                attempts = int(digits) if digits else 0
+                if solved or attempts:
+                    rows.append(ParticipantProblemResult(
+                        participant_id=participant.id, contest_id=contest.id, problem_id=problem.id,
+                        solved=solved, attempts=attempts,
+                    ))
+        ParticipantProblemResult.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contest', '0019_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_problem_results, migrations.RunPython.noop),
+    ]
@@ -32,6 +32,11 @@ class Contest(models.Model):
     # ELO 레이팅 반영 여부 (중복 반영 방지)
     is_rating_applied = models.BooleanField(default=False, verbose_name="레이팅 반영 여부")
 
+    # 마지막으로 반영한 Codeforces 제출 ID (증분 수집 워터마크, 0이면 처음부터 다시 수집)
+    last_submission_id = models.BigIntegerField(default=0, verbose_name="마지막 반영 제출 ID")
+
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="수정일")
+
     class Meta:
         verbose_name = "대회"
         verbose_name_plural = "대회"
@@ -56,6 +61,7 @@ class Problem(models.Model):
     rating = models.IntegerField(default=0, verbose_name="난이도")
     url = models.URLField(max_length=200, blank=True, verbose_name="문제 링크")
     description_kr = models.TextField(blank=True, verbose_name="문제 설명")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="수정일")
 
     class Meta:
         # (대회 ID, 문제 번호)는 유일해야 함
@@ -88,7 +94,8 @@ class Participant(models.Model):
     # 문자열 형태로 풀이 현황 저장
     # 예시: "+:+2:-1" (A번 정답, B번 2번 시도 후 정답, C번 1번 시도 후 실패)
     # 나중에 이 문자열을 파이썬으로 쪼개서(split) 분석
-    problem_status = models.CharField(max_length=100, default="", verbose_name="문제 풀이 현황")
+    # (문제별 상세 상태는 ParticipantProblemResult, 이 값은 기존 API 호환용 요약)
+    problem_status = models.TextField(default="", blank=True, verbose_name="문제 풀이 현황")
     
     # 총점
     total_score = models.FloatField(default=0, verbose_name="총점")
@@ -98,7 +105,7 @@ class Participant(models.Model):
     penalty = models.IntegerField(default=0, verbose_name="패널티")
 
     # 스코어보드 프리즈 스냅샷 (프리즈 시점의 데이터 보존)
-    frozen_problem_status = models.CharField(max_length=100, default="", blank=True, verbose_name="프리즈 시점 풀이 현황")
+    frozen_problem_status = models.TextField(default="", blank=True, verbose_name="프리즈 시점 풀이 현황")
     frozen_total_score = models.FloatField(default=0, verbose_name="프리즈 시점 총점")
     frozen_penalty = models.IntegerField(default=0, verbose_name="프리즈 시점 패널티")
 
@@ -108,6 +115,11 @@ class Participant(models.Model):
         verbose_name = "대회 참가자"
         verbose_name_plural = "대회 참가자"
         ordering = ['-total_score', 'penalty']
+        indexes = [
+            # 스코어보드/레이팅 계산의 대회별 순위 정렬 (정렬 없이 인덱스 순서대로 읽음)
+            models.Index(fields=['contest', '-total_score', 'penalty', 'id'], name='participant_rank_idx'),
+            models.Index(fields=['contest', '-frozen_total_score', 'frozen_penalty', 'id'], name='participant_frozen_rank_idx'),
+        ]
 
     def __str__(self):
         # 예: "Codeforces Round #900 - 윤태건" 형식으로 출력
@@ -139,6 +151,135 @@ class RatingHistory(models.Model):
         verbose_name = "레이팅 변동 기록"
         verbose_name_plural = "레이팅 변동 기록"
         ordering = ['-created_at']
+        indexes = [
+            # 유저별 레이팅 변동 기록 (최신순)
+            models.Index(fields=['user', '-created_at'], name='ratinghistory_user_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user} - {self.contest.name} ({self.rating_change:+d})"
+
+class Submission(models.Model):
+    """
+    Codeforces에서 수집한 제출 기록 (추가만 하는 로컬 보관소)
+    재계산, 통계 등에서 Codeforces API를 다시 호출하지 않고 사용
+    """
+    # Codeforces 제출 ID를 그대로 기본키로 사용 (중복 저장 방지)
+    id = models.BigIntegerField(primary_key=True, verbose_name="제출 ID (Codeforces)")
+    contest = models.ForeignKey(
+        Contest,
+        on_delete=models.CASCADE,
+        related_name='submissions',
+        verbose_name="관련 대회"
+    )
+    handle = models.CharField(max_length=50, verbose_name="Codeforces 핸들")
+    problem_index = models.CharField(max_length=10, verbose_name="문제 번호")
+    verdict = models.CharField(max_length=50, null=True, blank=True, verbose_name="채점 결과")
+    creation_time = models.DateTimeField(verbose_name="제출 시각")
+
+    class Meta:
+        verbose_name = "제출 기록"
+        verbose_name_plural = "제출 기록"
+        ordering = ['-id']
+        indexes = [
+            models.Index(fields=['contest', 'handle'], name='submission_contest_handle_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.handle} - {self.problem_index} ({self.verdict})"
+
+
+class ParticipantProblemResult(models.Model):
+    """
+    참가자의 문제별 풀이 상태
+    새 제출을 이벤트로 이어서 반영하기 위해 저장 (매번 전체 제출을 다시 계산하지 않음)
+    """
+    participant = models.ForeignKey(
+        Participant,
+        on_delete=models.CASCADE,
+        related_name='problem_results',
+        verbose_name="참가자"
+    )
+    # 대회별 문제 통계(정답자 수, 최초 정답자 등)를 조인 없이 인덱스로 조회하기 위해 함께 저장
+    contest = models.ForeignKey(
+        Contest,
+        on_delete=models.CASCADE,
+        related_name='problem_results',
+        verbose_name="관련 대회"
+    )
+    problem = models.ForeignKey(
+        Problem,
+        on_delete=models.CASCADE,
+        related_name='participant_results',
+        verbose_name="문제"
+    )
+    solved = models.BooleanField(default=False, verbose_name="정답 여부")
+    # 정답 전까지의 오답 수 (정답 이후 제출은 세지 않음)
+    attempts = models.IntegerField(default=0, verbose_name="오답 횟수")
+    accepted_at = models.DateTimeField(null=True, blank=True, verbose_name="정답 제출 시각")
+    # 마지막으로 반영한 제출 ID (같은 제출을 두 번 반영하지 않도록)
+    last_submission_id = models.BigIntegerField(default=0, verbose_name="마지막 반영 제출 ID")
+
+    class Meta:
+        unique_together = ('participant', 'problem')
+        verbose_name = "문제별 풀이 상태"
+        verbose_name_plural = "문제별 풀이 상태"
+        indexes = [
+            models.Index(fields=['contest', 'problem', 'solved'], name='result_contest_problem_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.participant} - {self.problem.index} ({'+' if self.solved else '-'}{self.attempts})"
+
+
+class ProblemStatistics(models.Model):
+    """
+    대회 문제별 통계 (정답자 수, 시도자 수, 제출 수, 최초 정답자)
+    업데이터가 바뀐 문제별 상태만큼 증분으로 갱신 (스코어보드 조회 시 집계하지 않음)
+    """
+    contest = models.ForeignKey(
+        Contest,
+        on_delete=models.CASCADE,
+        related_name='problem_statistics',
+        verbose_name="관련 대회"
+    )
+    problem = models.OneToOneField(
+        Problem,
+        on_delete=models.CASCADE,
+        related_name='statistics',
+        verbose_name="문제"
+    )
+    solved_count = models.IntegerField(default=0, verbose_name="정답자 수")
+    tried_count = models.IntegerField(default=0, verbose_name="시도자 수")
+    # 정답 전까지의 오답 + 정답 제출 수 (정답 이후 제출은 세지 않음)
+    attempt_count = models.IntegerField(default=0, verbose_name="제출 수")
+    first_solver = models.ForeignKey(
+        Participant,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name="최초 정답자"
+    )
+    first_solved_at = models.DateTimeField(null=True, blank=True, verbose_name="최초 정답 시각")
+
+    # 스코어보드 프리즈 스냅샷 (프리즈 시점의 데이터 보존)
+    frozen_solved_count = models.IntegerField(default=0, verbose_name="프리즈 시점 정답자 수")
+    frozen_tried_count = models.IntegerField(default=0, verbose_name="프리즈 시점 시도자 수")
+    frozen_attempt_count = models.IntegerField(default=0, verbose_name="프리즈 시점 제출 수")
+    frozen_first_solver = models.ForeignKey(
+        Participant,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name="프리즈 시점 최초 정답자"
+    )
+    frozen_first_solved_at = models.DateTimeField(null=True, blank=True, verbose_name="프리즈 시점 최초 정답 시각")
+
+    class Meta:
+        verbose_name = "문제별 통계"
+        verbose_name_plural = "문제별 통계"
 
     def __str__(self):
-        return f"{self.user} - {self.contest.name} ({self.rating_change:+d})"
\ No newline at end of file
+        return f"{self.problem} ({self.solved_count}/{self.tried_count})"
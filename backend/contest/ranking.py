@@ -0,0 +1,236 @@
+"""
+대회 순위 인덱스 (Redis sorted set)
+
+업데이터가 참가자 점수를 바꿀 때마다 대회별 sorted set(실시간)을 함께 갱신하고,
+프리즈 시점에는 스냅샷 점수로 프리즈용 sorted set을 만든다.
+점수는 (총점 내림차순, 패널티 오름차순)을 하나의 값으로 합친 것이라
+"내 순위", "상위 N명", "내 주변 순위"를 참가자 테이블 정렬 없이 O(log n)으로 조회한다.
+Redis를 쓸 수 없으면 같은 결과를 DB 쿼리로 계산한다.
+"""
+import redis
+from django.conf import settings
+from django.db.models import Q
+
+from main.redis_client import get_redis, mark_redis_unavailable
+from .models import Participant
+
+# 총점에 곱하는 값 (패널티가 이 값보다 작으면 총점이 같을 때만 패널티로 순서가 갈림)
+SCORE_SCALE = 10 ** 7
+
+
+def _key(contest_id, frozen=False):
+    return f"ranking:{contest_id}:{'frozen' if frozen else 'live'}"
+
+
+def _member(participant_id):
+    # 점수가 같으면 멤버 문자열 순으로 정렬되므로 자릿수를 맞춰 참가자 ID 순서와 같게 함
+    return f"{participant_id:012d}"
+
+
+def _fields(frozen):
+    return ('frozen_total_score', 'frozen_penalty') if frozen else ('total_score', 'penalty')
+
+
+def composite_score(total_score, penalty):
+    """정렬 값 (작을수록 높은 순위)"""
+    return penalty - total_score * SCORE_SCALE
+
+
+def _db_scores(contest_id, frozen):
+    score_field, penalty_field = _fields(frozen)
+    return {
+        _member(pid): composite_score(score, penalty)
+        for pid, score, penalty in Participant.objects.filter(contest_id=contest_id).values_list(
+            'id', score_field, penalty_field
+        )
+    }
+
+
+def _rebuild(client, contest_id, frozen):
+    key = _key(contest_id, frozen)
+    scores = _db_scores(contest_id, frozen)
+    pipe = client.pipeline()
+    pipe.delete(key)
+    if scores:
+        pipe.zadd(key, scores)
+        pipe.expire(key, settings.SCOREBOARD_CACHE_TIMEOUT)
+    pipe.execute()
+
+
+def _ready_client(contest_id, frozen):
+    """순위 집합이 준비된 Redis 연결 (만료/유실된 경우 DB에서 다시 만듦, Redis를 못 쓰면 None)"""
+    client = get_redis()
+    if client is None:
+        return None
+    try:
+        if not client.exists(_key(contest_id, frozen)):
+            _rebuild(client, contest_id, frozen)
+        return client
+    except redis.RedisError:
+        mark_redis_unavailable()
+        return None
+
+
+def rebuild(contest_id, frozen=False):
+    """DB 값으로 순위 집합을 새로 만듦 (프리즈 시점의 스냅샷 집합 생성 등)"""
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        _rebuild(client, contest_id, frozen)
+    except redis.RedisError:
+        mark_redis_unavailable()
+
+
+def update(contest_id, participants):
+    """
+    점수가 바뀐 참가자만 실시간 순위 집합에 반영 (집합이 없으면 전체를 다시 만듦)
+    프리즈 집합이 있으면 아직 없는 참가자(프리즈 중 등록)만 프리즈 시점 점수로 추가
+    """
+    client = get_redis()
+    if client is None:
+        return
+    key = _key(contest_id)
+    frozen_key = _key(contest_id, True)
+    try:
+        if not client.exists(key):
+            _rebuild(client, contest_id, False)
+        else:
+            pipe = client.pipeline()
+            pipe.zadd(key, {_member(p.id): composite_score(p.total_score, p.penalty) for p in participants})
+            pipe.expire(key, settings.SCOREBOARD_CACHE_TIMEOUT)
+            pipe.execute()
+        if client.exists(frozen_key):
+            # 이미 있는 참가자의 스냅샷 점수는 바꾸지 않음 (nx)
+            client.zadd(
+                frozen_key,
+                {_member(p.id): composite_score(p.frozen_total_score, p.frozen_penalty) for p in participants},
+                nx=True,
+            )
+    except redis.RedisError:
+        mark_redis_unavailable()
+
+
+def remove(contest_id, participant_id):
+    """참가 취소 등으로 삭제된 참가자를 두 순위 집합에서 제거"""
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        client.zrem(_key(contest_id), _member(participant_id))
+        client.zrem(_key(contest_id, True), _member(participant_id))
+    except redis.RedisError:
+        mark_redis_unavailable()
+
+
+def rank(contest_id, participant_id, frozen=False):
+    """
+    참가자의 순위 (총점, 패널티가 같으면 같은 순위)
+
+    Returns:
+        {'rank': 순위, 'position': 정렬 순서상 위치(0부터)}, 참가자가 없으면 None
+    """
+    client = _ready_client(contest_id, frozen)
+    if client is not None:
+        key = _key(contest_id, frozen)
+        try:
+            pipe = client.pipeline()
+            pipe.zscore(key, _member(participant_id))
+            pipe.zrank(key, _member(participant_id))
+            score, position = pipe.execute()
+            if score is None:
+                return None
+            better = client.zcount(key, '-inf', f'({score}')
+            return {'rank': better + 1, 'position': position}
+        except redis.RedisError:
+            mark_redis_unavailable()
+
+    score_field, penalty_field = _fields(frozen)
+    participants = Participant.objects.filter(contest_id=contest_id)
+    row = participants.filter(id=participant_id).values(score_field, penalty_field).first()
+    if row is None:
+        return None
+    score, penalty = row[score_field], row[penalty_field]
+    better = participants.filter(
+        Q(**{f'{score_field}__gt': score}) | Q(**{score_field: score, f'{penalty_field}__lt': penalty})
+    ).count()
+    ties_before = participants.filter(**{score_field: score, penalty_field: penalty, 'id__lt': participant_id}).count()
+    return {'rank': better + 1, 'position': better + ties_before}
+
+
+def window(contest_id, start, stop, frozen=False):
+    """
+    정렬 순서상 [start, stop) 구간의 참가자 ID와 순위
+
+    Returns:
+        [{'id': 참가자 ID, 'rank': 순위}, ...]
+    """
+    start = max(0, start)
+    if stop <= start:
+        return []
+
+    client = _ready_client(contest_id, frozen)
+    if client is not None:
+        key = _key(contest_id, frozen)
+        try:
+            members = client.zrange(key, start, stop - 1, withscores=True)
+            if not members:
+                return []
+            first_rank = client.zcount(key, '-inf', f'({members[0][1]}') + 1
+            entries = [(int(member), score) for member, score in members]
+            return _with_ranks(entries, start, first_rank)
+        except redis.RedisError:
+            mark_redis_unavailable()
+
+    score_field, penalty_field = _fields(frozen)
+    participants = Participant.objects.filter(contest_id=contest_id)
+    rows = list(
+        participants.order_by(f'-{score_field}', penalty_field, 'id')
+        .values_list('id', score_field, penalty_field)[start:stop]
+    )
+    if not rows:
+        return []
+    _, score, penalty = rows[0]
+    better = participants.filter(
+        Q(**{f'{score_field}__gt': score}) | Q(**{score_field: score, f'{penalty_field}__lt': penalty})
+    ).count()
+    entries = [(pid, composite_score(score, penalty)) for pid, score, penalty in rows]
+    return _with_ranks(entries, start, better + 1)
+
+
+def _with_ranks(entries, start, first_rank):
+    """연속 구간의 순위 계산 (첫 행의 순위만 알면 나머지는 같은 점수끼리 같은 순위)"""
+    result = []
+    previous = None
+    current = first_rank
+    for offset, (participant_id, score) in enumerate(entries):
+        if previous is not None and score != previous:
+            current = start + offset + 1
+        previous = score
+        result.append({'id': participant_id, 'rank': current})
+    return result
+
+
+def top(contest_id, n, frozen=False):
+    """상위 n명"""
+    return window(contest_id, 0, n, frozen)
+
+
+def around(contest_id, participant_id, radius, frozen=False):
+    """참가자 앞뒤로 radius명씩 (참가자가 없으면 빈 목록)"""
+    found = rank(contest_id, participant_id, frozen)
+    if found is None:
+        return []
+    position = found['position']
+    return window(contest_id, position - radius, position + radius + 1, frozen)
+
+
+def count(contest_id, frozen=False):
+    """순위 집합의 참가자 수"""
+    client = _ready_client(contest_id, frozen)
+    if client is not None:
+        try:
+            return client.zcard(_key(contest_id, frozen))
+        except redis.RedisError:
+            mark_redis_unavailable()
+    return Participant.objects.filter(contest_id=contest_id).count()
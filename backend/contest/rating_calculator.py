@@ -1,51 +1,155 @@
+from collections import defaultdict
+from types import SimpleNamespace
+import numpy as np
 from django.db import transaction
+from django.db.models import F
 from .models import Contest, Participant, RatingHistory
 from user.models import Profile
 
-def calculate_elo_changes(participants):
+# K-factor: 점수 변동 폭 계수 (일반적으로 32 사용)
+K_FACTOR = 32
+
+# 기대 승률 행렬을 한 번에 계산할 행 수 (메모리 사용량 제한)
+EXPECTED_CHUNK_SIZE = 1024
+
+# 레이팅 반영 시 한 번에 저장할 참가자 수 (배치마다 진행 상황 보고)
+WRITE_BATCH_SIZE = 500
+
+
+def expected_score_sums(ratings):
     """
-    참가자 리스트(랭킹순 정렬됨)를 받아 각 참가자의 Rating 변화량을 계산
-    
-    """
-    changes = {p.id: 0 for p in participants}
-    
-    # K-factor: 점수 변동 폭 계수 (일반적으로 32 사용)
-    K = 32
-    
-    n = len(participants)
+    각 참가자가 나머지 모든 참가자와 대결했을 때의 기대 승점 합
+
+    기대 승률은 레이팅에만 의존하므로 서로 다른 레이팅 값끼리만 행렬로 계산한 뒤
+    인원수를 곱해 합산 (기본 레이팅 1500인 참가자가 많을수록 계산량이 줄어듦)
+    수식: E(a, b) = 1 / (1 + 10^((Rb - Ra) / 400))
+    """
+    ratings = np.asarray(ratings, dtype=np.float64)
+    unique, inverse, counts = np.unique(ratings, return_inverse=True, return_counts=True)
+
+    sums = np.empty(len(unique), dtype=np.float64)
+    for start in range(0, len(unique), EXPECTED_CHUNK_SIZE):
+        block = unique[start:start + EXPECTED_CHUNK_SIZE]
+        expected = 1 / (1 + 10 ** ((unique[None, :] - block[:, None]) / 400))
+        sums[start:start + EXPECTED_CHUNK_SIZE] = expected @ counts
+
+    # 자기 자신과의 대결(기대 승률 0.5)은 제외
+    return sums[inverse] - 0.5
+
+
+def rank_wins(ranks):
+    """
+    순위 그룹별 실제 승점 합 (이기면 1, 동점이면 0.5)
+    같은 순위(총점, 패널티가 같은) 참가자끼리는 무승부로 처리하며,
+    그룹마다 한 번만 계산해 그룹 인원에게 그대로 적용
+    """
+    _, inverse, counts = np.unique(np.asarray(ranks), return_inverse=True, return_counts=True)
+    below = len(inverse) - np.cumsum(counts)
+    group_wins = below + 0.5 * (counts - 1)
+    return group_wins[inverse].astype(np.float64)
+
+
+def elo_deltas(ratings, ranks=None):
+    """
+    랭킹순으로 정렬된 레이팅 배열을 받아 Rating 변화량 배열을 반환 (실제 승점 - 기대 승점)
+    ranks: 참가자별 순위 (작을수록 상위, 같으면 동점). 없으면 목록 순서대로 모두 다른 순위
+    """
+    n = len(ratings)
+    if ranks is None:
+        ranks = np.arange(n)
+    return K_FACTOR * (rank_wins(ranks) - expected_score_sums(ratings))
+
+
+def pairwise_elo_deltas(ratings, ranks=None):
+    """
+    모든 쌍을 직접 비교하는 기존 O(n^2) 계산 (검증/벤치마크용 기준 구현)
+    """
+    n = len(ratings)
+    if ranks is None:
+        ranks = list(range(n))
+    changes = [0.0] * n
     for i in range(n):
         for j in range(i + 1, n):
-            winner = participants[i]
-            loser = participants[j]
-            
-            # Winner의 현재 레이팅
-            rating_a = winner.user.profile.elo_rating
-            # Loser의 현재 레이팅
-            rating_b = loser.user.profile.elo_rating
-            
-            # 기대 승률 계산 (A가 이길 확률)
-            # 수식: 1 / (1 + 10^((Rb - Ra) / 400))
+            rating_a = ratings[i]
+            rating_b = ratings[j]
             expected_a = 1 / (1 + 10 ** ((rating_b - rating_a) / 400))
             expected_b = 1 / (1 + 10 ** ((rating_a - rating_b) / 400))
-            
-            # 점수 변동량 계산
-            # A는 이겼으므로 실제 결과(S) = 1
-            delta_a = K * (1 - expected_a)
-            
-            # B는 졌으므로 실제 결과(S) = 0
-            delta_b = K * (0 - expected_b)
-            
-            # Dictionary에 누적 (소수점 유지, 나중에 반올림)
-            changes[winner.id] += delta_a
-            changes[loser.id] += delta_b
-            
+            # 동점이면 무승부(0.5)
+            score_a = 0.5 if ranks[i] == ranks[j] else 1
+            changes[i] += K_FACTOR * (score_a - expected_a)
+            changes[j] += K_FACTOR * ((1 - score_a) - expected_b)
     return changes
 
-def apply_contest_rating(contest_id):
+
+def standing_ranks(participants):
+    """
+    성적순으로 정렬된 참가자 목록의 순위 (총점, 패널티가 같으면 같은 순위)
+    """
+    ranks = []
+    previous = None
+    for position, p in enumerate(participants):
+        key = (p.total_score, p.penalty)
+        if key != previous:
+            rank = position
+            previous = key
+        ranks.append(rank)
+    return ranks
+
+
+def calculate_elo_changes(participants):
+    """
+    참가자 리스트(랭킹순 정렬됨)를 받아 각 참가자의 Rating 변화량을 계산
+    레이팅은 한 번만 배열로 읽어와 벡터 연산으로 처리하고, 동점자는 무승부로 계산
+    """
+    ratings = np.fromiter(
+        (p.user.profile.elo_rating for p in participants), dtype=np.float64, count=len(participants)
+    )
+    deltas = elo_deltas(ratings, standing_ranks(participants))
+    return {p.id: float(delta) for p, delta in zip(participants, deltas)}
+
+
+def build_rating_updates(contest, participants, changes):
+    """
+    변화량을 프로필에 반영하고 저장할 레이팅 히스토리 객체 목록을 만듦 (DB 쓰기는 하지 않음)
+    """
+    updated_profiles = []
+    history_rows = []
+
+    for p in participants:
+        delta = changes[p.id]
+        profile = p.user.profile
+
+        new_rating = int(profile.elo_rating + delta)
+
+        # 레이팅이 음수가 되지 않도록 보정
+        if new_rating < 0:
+            new_rating = 0
+
+        profile.elo_rating = new_rating
+        updated_profiles.append(profile)
+        history_rows.append(RatingHistory(
+            user_id=p.user_id,
+            contest=contest,
+            rating=new_rating,
+            rating_change=int(delta)
+        ))
+
+    return updated_profiles, history_rows
+
+
+def apply_contest_rating(contest_id, progress=None):
     """
     특정 대회의 결과를 바탕으로 참가자들의 ELO Rating을 반영.
     (이미 반영된 경우 실행하지 않음)
+
+    Args:
+        progress: 진행 상황을 받을 콜백 progress(phase, done, total) (선택)
+                  phase는 'loading', 'computing', 'writing' 순서로 전달됨
     """
+    def report(phase, done=0, total=0):
+        if progress is not None:
+            progress(phase, done, total)
+
     try:
         contest = Contest.objects.get(id=contest_id)
     except Contest.DoesNotExist:
@@ -53,50 +157,118 @@ def apply_contest_rating(contest_id):
 
     if contest.is_rating_applied:
         return {"success": False, "message": f"Rating already applied for contest {contest_id}"}
-    
-    # 참가자 가져오기 (성적순 정렬: 총점 내림차순, 패널티 오름차순)
-    participants = list(Participant.objects.filter(contest=contest).select_related('user__profile').order_by('-total_score', 'penalty'))
-    
-    if len(participants) < 2:
-        return {"success": False, "message": "Not enough participants to calculate rating"}
-
-    # ELO 변화량 계산
-    changes = calculate_elo_changes(participants)
-    
-    # DB 반영 (Atomic Transaction)
+
+    # DB 반영 (Atomic Transaction) - 쓰기는 일괄 처리로 몇 번의 쿼리만 실행
     with transaction.atomic():
-        updated_profiles = []
-        
-        for p in participants:
-            delta = changes[p.id]
-            profile = p.user.profile
-            
-            old_rating = profile.elo_rating
-            new_rating = int(old_rating + delta)
-            
-            # 레이팅이 음수가 되지 않도록 보정
-            if new_rating < 0:
-                new_rating = 0
-                
-            profile.elo_rating = new_rating
-            updated_profiles.append(profile)
-            
-            # 레이팅 히스토리 생성
-            RatingHistory.objects.create(
-                user=profile.user,
-                contest=contest,
-                rating=new_rating,
-                rating_change=delta
-            )
-            
-            # (옵션) 로그 남기기
-            # print(f"User {profile.user.username}: {old_rating} -> {new_rating} ({delta:+.2f})")
-            
-        # 일괄 업데이트
-        Profile.objects.bulk_update(updated_profiles, ['elo_rating'])
-        
-        # 대회 상태 업데이트
-        contest.is_rating_applied = True
-        contest.save()
-        
+        # 조건부 업데이트로 반영 여부를 먼저 선점 (동시에 두 번 요청되어도 한 번만 반영)
+        claimed = Contest.objects.filter(id=contest_id, is_rating_applied=False).update(is_rating_applied=True)
+        if not claimed:
+            return {"success": False, "message": f"Rating already applied for contest {contest_id}"}
+
+        # 참가자 가져오기 (성적순 정렬: 총점 내림차순, 패널티 오름차순)
+        # 선점 이후에 읽어야 다른 대회 반영과 겹쳐도 최신 레이팅으로 계산됨
+        report('loading')
+        participants = list(Participant.objects.filter(contest=contest).select_related('user__profile').order_by('-total_score', 'penalty'))
+
+        if len(participants) < 2:
+            transaction.set_rollback(True)
+            return {"success": False, "message": "Not enough participants to calculate rating"}
+
+        # ELO 변화량 계산
+        total = len(participants)
+        report('computing', 0, total)
+        changes = calculate_elo_changes(participants)
+        updated_profiles, history_rows = build_rating_updates(contest, participants, changes)
+
+        # 일괄 업데이트 (배치마다 진행 상황 보고)
+        for start in range(0, total, WRITE_BATCH_SIZE):
+            end = start + WRITE_BATCH_SIZE
+            Profile.objects.bulk_update(updated_profiles[start:end], ['elo_rating'])
+            RatingHistory.objects.bulk_create(history_rows[start:end])
+            report('writing', min(end, total), total)
+
+    contest.is_rating_applied = True
     return {"success": True, "message": f"Successfully applied ratings for {len(participants)} participants"}
+
+
+def replay_ratings(initial_rating=None):
+    """
+    레이팅이 반영된 모든 대회를 시간순으로 메모리에서 다시 계산해
+    RatingHistory와 Profile.elo_rating을 일괄로 다시 씀 (과거 대회 수정/반영 취소 후 재계산용)
+
+    모든 사용자는 기본 레이팅(Profile 기본값 1500)에서 출발하며,
+    각 대회의 최종 순위(총점, 패널티)로 벡터 연산을 수행.
+    대회 기록이 없는 사용자 중 기존 히스토리가 있던 사용자는 기본 레이팅으로 돌아감.
+    """
+    if initial_rating is None:
+        initial_rating = Profile._meta.get_field('elo_rating').default
+
+    contests = list(
+        Contest.objects.filter(is_rating_applied=True).order_by(F('end_time').asc(nulls_last=True), 'start_time', 'id')
+    )
+    contest_ids = [c.id for c in contests]
+
+    # 대회별 최종 순위 (한 번의 쿼리로 읽어와 대회별로 분리)
+    standings = defaultdict(list)
+    rows = (
+        Participant.objects.filter(contest_id__in=contest_ids, user__profile__isnull=False)
+        .order_by('contest_id', '-total_score', 'penalty', 'id')
+        .values_list('contest_id', 'user_id', 'total_score', 'penalty')
+    )
+    for contest_id, user_id, total_score, penalty in rows:
+        standings[contest_id].append((user_id, total_score, penalty))
+
+    ratings = {}
+    replayed = {}
+    for contest in contests:
+        standing = standings.get(contest.id, [])
+        if len(standing) < 2:
+            continue
+
+        user_ids = [user_id for user_id, _, _ in standing]
+        current = np.array([ratings.get(user_id, initial_rating) for user_id in user_ids], dtype=np.float64)
+        ranks = standing_ranks(SimpleNamespace(total_score=score, penalty=penalty) for _, score, penalty in standing)
+        deltas = elo_deltas(current, ranks)
+
+        for user_id, old, delta in zip(user_ids, current, deltas):
+            new_rating = max(0, int(old + delta))
+            ratings[user_id] = new_rating
+            replayed[(user_id, contest.id)] = (new_rating, int(delta))
+
+    with transaction.atomic():
+        # 기존 히스토리는 값만 갱신(생성일 유지), 없던 기록은 생성, 더 이상 해당하지 않는 기록은 삭제
+        existing = list(RatingHistory.objects.select_for_update().only('id', 'user_id', 'contest_id'))
+        to_update = []
+        stale_ids = []
+        touched_users = set(ratings)
+        for history in existing:
+            key = (history.user_id, history.contest_id)
+            touched_users.add(history.user_id)
+            if key in replayed:
+                history.rating, history.rating_change = replayed.pop(key)
+                to_update.append(history)
+            else:
+                stale_ids.append(history.id)
+
+        to_create = [
+            RatingHistory(user_id=user_id, contest_id=contest_id, rating=rating, rating_change=change)
+            for (user_id, contest_id), (rating, change) in replayed.items()
+        ]
+
+        RatingHistory.objects.bulk_update(to_update, ['rating', 'rating_change'], batch_size=WRITE_BATCH_SIZE)
+        RatingHistory.objects.bulk_create(to_create, batch_size=WRITE_BATCH_SIZE)
+        if stale_ids:
+            RatingHistory.objects.filter(id__in=stale_ids).delete()
+
+        profiles = list(Profile.objects.filter(user_id__in=touched_users).only('user_id', 'elo_rating'))
+        for profile in profiles:
+            profile.elo_rating = ratings.get(profile.user_id, initial_rating)
+        Profile.objects.bulk_update(profiles, ['elo_rating'], batch_size=WRITE_BATCH_SIZE)
+
+    return {
+        "success": True,
+        "message": (
+            f"Replayed {len(contests)} contests: {len(profiles)} profiles, "
+            f"{len(to_update)} history updated, {len(to_create)} created, {len(stale_ids)} removed"
+        ),
+    }
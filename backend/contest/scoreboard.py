@@ -0,0 +1,215 @@
+"""
+스코어보드 캐시
+
+대회마다 버전 키를 두고, 참가자 점수가 바뀌면(업데이터, 프리즈, 관리자 수정 등) 버전을 올린다.
+스코어보드 행은 (대회, 버전, 종류) 키로 한 번만 직렬화해 캐시에 저장하며,
+종류는 실시간('live', 관리자/프리즈 아님)과 프리즈 스냅샷('frozen', 프리즈 중 일반 사용자) 두 가지.
+캐시가 비어 있을 때는 한 요청만 DB에서 다시 만들고 나머지는 잠시 기다렸다가 결과를 사용한다.
+"""
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Participant
+from . import ranking
+from .serializers import ScoreboardParticipantSerializer, ScoreboardProblemStatsSerializer
+
+LIVE = 'live'
+FROZEN = 'frozen'
+
+# 구간 조회(?offset=&limit=, ?around=)의 기본/최대 행 수
+WINDOW_DEFAULT_LIMIT = 50
+WINDOW_MAX_LIMIT = 500
+
+# 다른 요청이 스코어보드를 만드는 동안 기다리는 최대 시간과 확인 간격 (초)
+BUILD_WAIT_TIMEOUT = 2.0
+BUILD_POLL_INTERVAL = 0.05
+
+
+def _version_key(contest_id):
+    return f"scoreboard:version:{contest_id}"
+
+
+def _rows_key(contest_id, version, variant):
+    return f"scoreboard:rows:{contest_id}:{version}:{variant}"
+
+
+def _stats_key(contest_id, version, variant):
+    return f"scoreboard:stats:{contest_id}:{version}:{variant}"
+
+
+def _build_lock_key(contest_id, version, variant):
+    return f"scoreboard:build:{contest_id}:{version}:{variant}"
+
+
+def get_version(contest_id):
+    """현재 스코어보드 버전 (없으면 새로 발급)"""
+    version = cache.get(_version_key(contest_id))
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(_version_key(contest_id), version, None):
+            version = cache.get(_version_key(contest_id)) or version
+    return version
+
+
+def bump_version(contest_id):
+    """
+    점수가 바뀌었을 때 호출 (이전 버전의 캐시는 더 이상 조회되지 않고 만료됨)
+    버전은 매번 새로 발급하는 값이라 캐시가 비워져도 예전 스코어보드로 되돌아가지 않음
+    """
+    version = uuid.uuid4().hex
+    cache.set(_version_key(contest_id), version, None)
+    return version
+
+
+def _serialize(contest, participants, variant):
+    """참가자 쿼리셋을 스코어보드 행으로 직렬화"""
+    show_frozen = variant == FROZEN
+    participants = participants.select_related('contest', 'user')
+    if not show_frozen:
+        # 문제별 결과는 한 번에 가져옴 (프리즈 스냅샷은 스냅샷 문자열을 사용)
+        participants = participants.prefetch_related('problem_results')
+    problems = list(contest.problems.order_by('index'))
+
+    serializer = ScoreboardParticipantSerializer(
+        participants, many=True, context={'show_frozen': show_frozen, 'problems': problems}
+    )
+    return list(serializer.data)
+
+
+def build_rows(contest, variant):
+    """스코어보드 행 직렬화 (프리즈 스냅샷은 스냅샷 점수 기준으로 정렬)"""
+    ordering = ('-frozen_total_score', 'frozen_penalty') if variant == FROZEN else ('-total_score', 'penalty')
+    return _serialize(contest, Participant.objects.filter(contest=contest).order_by(*ordering, 'id'), variant)
+
+
+def rows_by_id(contest, participant_ids, variant):
+    """지정한 참가자들의 스코어보드 행만 직렬화 ({참가자 ID: 행}, 순위 인덱스로 고른 일부 행 조회용)"""
+    rows = _serialize(contest, Participant.objects.filter(contest=contest, id__in=participant_ids), variant)
+    return {row['id']: row for row in rows}
+
+
+def build_problem_stats(contest, variant):
+    """스코어보드 헤더의 문제별 통계 직렬화 (업데이터가 집계해 둔 값, 프리즈 스냅샷은 스냅샷 통계)"""
+    problems = contest.problems.select_related(
+        'statistics__first_solver__user', 'statistics__frozen_first_solver__user'
+    ).order_by('index')
+    serializer = ScoreboardProblemStatsSerializer(problems, many=True, context={'show_frozen': variant == FROZEN})
+    return list(serializer.data)
+
+
+def window(contest, variant, offset, limit):
+    """
+    순위 인덱스로 [offset, offset + limit) 구간의 행만 직렬화 (가상 스크롤용)
+    전체 참가자 수도 순위 인덱스의 카운터에서 가져옴
+    """
+    frozen = variant == FROZEN
+    entries = ranking.window(contest.id, offset, offset + limit, frozen)
+    rows = rows_by_id(contest, [entry['id'] for entry in entries], variant)
+    return {
+        'offset': offset,
+        'limit': limit,
+        'total': ranking.count(contest.id, frozen),
+        'participants': [{**rows[entry['id']], 'rank': entry['rank']} for entry in entries if entry['id'] in rows],
+    }
+
+
+def render(contest, variant, version=None):
+    """현재 버전의 스코어보드(행, 문제별 통계)를 만들어 캐시에 저장 (업데이터가 갱신 직후 미리 호출)"""
+    version = version or get_version(contest.id)
+    rows = build_rows(contest, variant)
+    cache.set(_rows_key(contest.id, version, variant), rows, settings.SCOREBOARD_CACHE_TIMEOUT)
+    cache.set(_stats_key(contest.id, version, variant), build_problem_stats(contest, variant),
+              settings.SCOREBOARD_CACHE_TIMEOUT)
+    return rows
+
+
+def get_rows(contest, variant, version=None):
+    """
+    캐시된 스코어보드 행 반환
+    캐시가 없으면 한 요청만 새로 만들고(single-flight), 나머지는 완성될 때까지 잠시 기다림
+    """
+    version = version or get_version(contest.id)
+    rows_key = _rows_key(contest.id, version, variant)
+
+    rows = cache.get(rows_key)
+    if rows is not None:
+        return rows
+
+    lock_key = _build_lock_key(contest.id, version, variant)
+    if cache.add(lock_key, 1, int(BUILD_WAIT_TIMEOUT) + 1):
+        try:
+            return render(contest, variant, version)
+        finally:
+            cache.delete(lock_key)
+
+    deadline = time.monotonic() + BUILD_WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(BUILD_POLL_INTERVAL)
+        rows = cache.get(rows_key)
+        if rows is not None:
+            return rows
+
+    # 만드는 쪽이 실패했거나 너무 오래 걸리면 직접 만듦
+    return render(contest, variant, version)
+
+
+def get_problem_stats(contest, variant, version=None):
+    """캐시된 문제별 통계 반환 (없으면 문제 수만큼의 한 번의 조회로 만들어 캐시)"""
+    version = version or get_version(contest.id)
+    stats_key = _stats_key(contest.id, version, variant)
+    stats = cache.get(stats_key)
+    if stats is None:
+        stats = build_problem_stats(contest, variant)
+        cache.set(stats_key, stats, settings.SCOREBOARD_CACHE_TIMEOUT)
+    return stats
+
+
+def cached_rows(contest_id, variant, version=None):
+    """현재(또는 지정한) 버전의 캐시된 행 (없으면 None, DB는 조회하지 않음)"""
+    version = version or cache.get(_version_key(contest_id))
+    if version is None:
+        return None
+    return cache.get(_rows_key(contest_id, version, variant))
+
+
+def ranked(rows):
+    """정렬된 행에 순위를 붙임 (총점, 패널티가 같으면 같은 순위)"""
+    result = []
+    previous = None
+    rank = 0
+    for position, row in enumerate(rows, start=1):
+        key = (row['total_score'], row['penalty'])
+        if key != previous:
+            rank = position
+            previous = key
+        result.append({**row, 'rank': rank})
+    return result
+
+
+def diff_rows(old_rows, new_rows):
+    """
+    두 스코어보드 사이에서 바뀐 행(순위 포함)과 사라진 참가자 ID
+    Returns:
+        {'changed': [...], 'removed': [...]}
+    """
+    old = {row['id']: row for row in ranked(old_rows)}
+    new = ranked(new_rows)
+    new_ids = {row['id'] for row in new}
+    return {
+        'changed': [row for row in new if old.get(row['id']) != row],
+        'removed': [participant_id for participant_id in old if participant_id not in new_ids],
+    }
+
+
+def rows_since(contest_id, variant, since, rows):
+    """
+    클라이언트가 마지막으로 본 버전(since) 이후 바뀐 행
+    해당 버전의 행이 캐시에 남아 있지 않으면(너무 오래됨, 다른 종류) None → 전체 스코어보드를 보내야 함
+    """
+    previous = cached_rows(contest_id, variant, since)
+    if previous is None:
+        return None
+    return diff_rows(previous, rows)
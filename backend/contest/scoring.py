@@ -0,0 +1,283 @@
+"""
+참가자 점수 계산 (문제별 상태 + 제출 이벤트)
+
+참가자의 문제별 상태(ParticipantProblemResult)를 저장해 두고, 새 제출만 이벤트로 적용한다.
+한 번의 갱신 비용은 새 제출 수에 비례하며, 결과는 calculate_participant_stats와 같다.
+
+대회 전체를 다시 계산할 때(시작/종료 시각 변경, 최종 순위 확정)는 보관된 제출 기록을
+열 단위 배열로 만들어 score_batch로 모든 참가자를 한 번에 계산한다.
+"""
+from datetime import datetime, timezone as datetime_timezone
+
+import numpy as np
+
+from .models import ParticipantProblemResult, ProblemStatistics, Submission
+
+# 오답 1회당 패널티 (분)
+WRONG_ANSWER_PENALTY = 20
+
+
+class ScoringContext:
+    """
+    대회 채점에 필요한 값을 대회마다 한 번만 계산해 두는 객체
+    (문제 목록, 문제 번호 → 칸 위치, 배점, 대회 시작/종료 timestamp)
+    참가자마다 다시 만들지 않고 재사용하므로 참가자별 비용은 제출 순회뿐
+    """
+    __slots__ = ('problems', 'slots', 'points', 'start', 'end')
+
+    def __init__(self, problems, contest_start_time, contest_end_time=None):
+        self.problems = list(problems)
+        self.slots = {p.index: slot for slot, p in enumerate(self.problems)}
+        self.points = [p.points for p in self.problems]
+        self.start = contest_start_time.timestamp()
+        self.end = contest_end_time.timestamp() if contest_end_time else None
+
+    @classmethod
+    def for_contest(cls, contest, problems=None):
+        """대회의 문제(번호순)로 컨텍스트 생성 (이미 가져온 문제 목록이 있으면 그대로 사용)"""
+        if problems is None:
+            problems = contest.problems.all().order_by('index')
+        return cls(problems, contest.start_time, contest.end_time)
+
+
+def new_state(participant, problem):
+    """아직 저장되지 않은 빈 상태"""
+    return ParticipantProblemResult(participant=participant, contest_id=participant.contest_id, problem=problem)
+
+
+def apply_submission(state, record, context):
+    """
+    제출 하나(SubmissionRecord)를 문제 상태에 반영
+
+    Returns:
+        상태가 바뀌었으면 True
+    """
+    if record.id <= state.last_submission_id:
+        return False  # 이미 반영한 제출
+    state.last_submission_id = record.id
+
+    if state.solved:
+        return True
+
+    submission_time = record.creation_time
+    # 대회 시작 전/종료 후 제출은 무시
+    if submission_time < context.start:
+        return True
+    if context.end is not None and submission_time > context.end:
+        return True
+
+    if record.verdict == 'OK':
+        state.solved = True
+        state.accepted_at = datetime.fromtimestamp(submission_time, tz=datetime_timezone.utc)
+    else:
+        state.attempts += 1
+    return True
+
+
+def apply_submissions(states, records, context):
+    """
+    새 제출들을 문제 상태에 반영
+    states: {문제 번호: ParticipantProblemResult}
+    records: 시간순으로 정렬된 SubmissionRecord 목록 (fetch_contest_new_submissions가 한 번에 정렬해 반환)
+
+    Returns:
+        바뀐 상태 목록
+    """
+    changed = {}
+    for record in records:
+        state = states.get(record.problem_index)
+        if state is None:
+            continue
+        if apply_submission(state, record, context):
+            changed[id(state)] = state
+    return list(changed.values())
+
+
+def snapshot(state):
+    """문제별 통계 갱신에 필요한 상태 값 (제출 반영 전에 저장해 두고 update_statistics에 전달)"""
+    return state.solved, state.attempts
+
+
+def new_statistics(contest, problem):
+    """아직 저장되지 않은 빈 문제 통계"""
+    return ProblemStatistics(contest=contest, problem=problem)
+
+
+def update_statistics(stats, state, before):
+    """
+    한 참가자의 문제 상태 변화(before → state)를 문제 통계에 증분으로 반영
+
+    Returns:
+        통계가 바뀌었으면 True
+    """
+    was_solved, was_attempts = before
+    was_tried = was_solved or was_attempts > 0
+    is_tried = state.solved or state.attempts > 0
+
+    solved_delta = int(state.solved) - int(was_solved)
+    tried_delta = int(is_tried) - int(was_tried)
+    attempt_delta = (state.attempts + int(state.solved)) - (was_attempts + int(was_solved))
+
+    stats.solved_count += solved_delta
+    stats.tried_count += tried_delta
+    stats.attempt_count += attempt_delta
+    changed = bool(solved_delta or tried_delta or attempt_delta)
+
+    if state.solved and not was_solved and (stats.first_solved_at is None or state.accepted_at < stats.first_solved_at):
+        stats.first_solver_id = state.participant_id
+        stats.first_solved_at = state.accepted_at
+        changed = True
+    return changed
+
+
+def summarize(states, context):
+    """
+    문제별 상태로 풀이 현황 문자열, 총점, 패널티 계산 (문제 수만큼만 순회)
+    패널티 = 정답 시각(대회 시작 기준, 분) + 오답 횟수 * 20
+    """
+    status_parts = []
+    total_score = 0.0
+    total_penalty = 0
+
+    for p in context.problems:
+        state = states.get(p.index)
+        if state is not None and state.solved:
+            status_parts.append("+" if state.attempts == 0 else f"+{state.attempts}")
+            total_score += p.points
+            solved_minutes = int(max(0, state.accepted_at.timestamp() - context.start) / 60)
+            total_penalty += solved_minutes + state.attempts * WRONG_ANSWER_PENALTY
+        elif state is not None and state.attempts > 0:
+            status_parts.append(f"-{state.attempts}")
+        else:
+            status_parts.append("0")
+
+    return {
+        "problem_status": ":".join(status_parts),
+        "total_score": total_score,
+        "penalty": total_penalty
+    }
+
+
+def load_submission_columns(contest, participants, context):
+    """
+    보관된 제출 기록(Submission)을 score_batch 입력용 열 배열로 변환
+    participants는 user__profile을 select_related한 목록, 참가자/문제가 아닌 제출은 -1로 표시
+
+    Returns:
+        {'ids', 'participant', 'problem', 'time', 'accepted'} 배열 dict
+    """
+    rows = list(
+        Submission.objects.filter(contest=contest)
+        .values_list('id', 'handle', 'problem_index', 'verdict', 'creation_time')
+    )
+    if not rows:
+        empty = np.zeros(0, dtype=np.int64)
+        return {'ids': empty, 'participant': empty, 'problem': empty,
+                'time': np.zeros(0), 'accepted': np.zeros(0, dtype=bool)}
+
+    ids, handles, indexes, verdicts, times = zip(*rows)
+    handle_position = {p.user.profile.codeforces_id: i for i, p in enumerate(participants)}
+
+    return {
+        'ids': np.asarray(ids, dtype=np.int64),
+        'participant': _encode(handles, handle_position),
+        'problem': _encode(indexes, context.slots),
+        'time': np.asarray([created.timestamp() for created in times], dtype=np.float64),
+        'accepted': np.asarray(verdicts, dtype=object) == 'OK',
+    }
+
+
+def _encode(values, positions):
+    """문자열 열을 위치 번호 배열로 변환 (서로 다른 값마다 한 번만 조회, 없으면 -1)"""
+    unique, inverse = np.unique(np.asarray(values, dtype=object), return_inverse=True)
+    lookup = np.asarray([positions.get(value, -1) for value in unique], dtype=np.int64)
+    return lookup[inverse.reshape(-1)]
+
+
+def score_batch(columns, context, num_participants):
+    """
+    대회 전체 제출로 모든 참가자의 문제별 상태와 총점/패널티를 한 번에 계산 (group-by 벡터 연산)
+    (참가자, 문제) 칸마다 시간순(같으면 제출 ID순) 첫 정답 이전의 오답 수를 세며,
+    결과는 참가자마다 calculate_participant_stats를 호출한 것과 같다.
+
+    Args:
+        columns: load_submission_columns 형식의 열 배열
+        context: 문제 순서/배점/대회 시간을 담은 ScoringContext
+
+    Returns:
+        solved / attempts / accepted_time / last_submission_id: (참가자, 문제) 배열
+        total_score / penalty: 참가자별 배열
+    """
+    points = np.asarray(context.points, dtype=np.float64)
+    num_problems = len(points)
+    cells = num_participants * num_problems
+    start = context.start
+
+    participant = columns['participant']
+    problem = columns['problem']
+    known = (participant >= 0) & (problem >= 0)
+
+    # 반영한 마지막 제출 ID는 대회 시간 밖의 제출도 포함 (증분 갱신의 apply_submission과 같은 기준)
+    last_submission_id = np.zeros(cells, dtype=np.int64)
+    np.maximum.at(last_submission_id, participant[known] * num_problems + problem[known], columns['ids'][known])
+
+    # 대회 시작 전/종료 후 제출은 무시
+    window = known & (columns['time'] >= start)
+    if context.end is not None:
+        window &= columns['time'] <= context.end
+
+    cell = participant[window] * num_problems + problem[window]
+    time = columns['time'][window]
+    accepted = columns['accepted'][window]
+    order = np.lexsort((columns['ids'][window], time, cell))
+    cell, time, accepted = cell[order], time[order], accepted[order]
+
+    # 칸별 제출 수와 칸 안에서의 순번
+    counts = np.bincount(cell, minlength=cells)
+    rank = np.arange(len(cell)) - (np.cumsum(counts) - counts)[cell]
+
+    # 칸마다 첫 정답 위치 (정렬되어 있으므로 정답 제출 중 칸별 첫 번째)
+    accepted_positions = np.flatnonzero(accepted)
+    solved_cells, first = np.unique(cell[accepted_positions], return_index=True)
+    first_accepted = accepted_positions[first]
+
+    solved = np.zeros(cells, dtype=bool)
+    solved[solved_cells] = True
+    attempts = counts.astype(np.int64)
+    attempts[solved_cells] = rank[first_accepted]
+    accepted_time = np.full(cells, np.nan)
+    accepted_time[solved_cells] = time[first_accepted]
+
+    solved = solved.reshape(num_participants, num_problems)
+    attempts = attempts.reshape(num_participants, num_problems)
+    accepted_time = accepted_time.reshape(num_participants, num_problems)
+
+    solved_minutes = np.floor((np.where(solved, accepted_time, start) - start) / 60).astype(np.int64)
+    penalty = np.where(solved, solved_minutes + attempts * WRONG_ANSWER_PENALTY, 0).sum(axis=1)
+
+    return {
+        'solved': solved,
+        'attempts': attempts,
+        'accepted_time': accepted_time,
+        'last_submission_id': last_submission_id.reshape(num_participants, num_problems),
+        'total_score': (solved * points).sum(axis=1),
+        'penalty': penalty,
+    }
+
+
+def batch_summaries(result):
+    """score_batch 결과를 참가자별 calculate_participant_stats 형식으로 변환"""
+    summaries = []
+    for solved_row, attempts_row, total_score, penalty in zip(
+        result['solved'].tolist(), result['attempts'].tolist(), result['total_score'].tolist(), result['penalty'].tolist()
+    ):
+        status_parts = []
+        for solved, attempts in zip(solved_row, attempts_row):
+            if solved:
+                status_parts.append("+" if attempts == 0 else f"+{attempts}")
+            elif attempts > 0:
+                status_parts.append(f"-{attempts}")
+            else:
+                status_parts.append("0")
+        summaries.append({"problem_status": ":".join(status_parts), "total_score": total_score, "penalty": penalty})
+    return summaries
@@ -1,5 +1,6 @@
 from rest_framework import serializers
-from .models import Contest, Problem, Participant, RatingHistory
+from .models import Contest, Problem, Participant, ProblemStatistics, RatingHistory
+from .utils import parse_problem_status
 
 from django.utils import timezone
 
@@ -104,16 +105,42 @@ class ScoreboardParticipantSerializer(serializers.ModelSerializer):
     """
     user_username = serializers.ReadOnlyField(source='user.username')
     contest = serializers.SlugRelatedField(read_only=True, slug_field='virtual_id')
+    problem_results = serializers.SerializerMethodField()
 
     class Meta:
         model = Participant
-        fields = ['id', 'user', 'user_username', 'contest', 'problem_status', 'total_score', 'penalty']
+        fields = ['id', 'user', 'user_username', 'contest', 'problem_status', 'problem_results', 'total_score', 'penalty']
         read_only_fields = ['user', 'total_score', 'penalty', 'problem_status']
 
+    def get_problem_results(self, instance):
+        """
+        문제별 풀이 결과 (context['problems'] 순서, 풀이 기록이 없는 문제는 0으로 채움)
+        problem_results를 prefetch한 쿼리셋을 사용해야 참가자마다 쿼리가 발생하지 않음
+        """
+        problems = self.context.get('problems', [])
+        if self.context.get('show_frozen', False):
+            # 프리즈 중에는 스냅샷 문자열 기준 (정답 시각은 공개하지 않음)
+            parsed = parse_problem_status(instance.frozen_problem_status, problems)
+            return [
+                {'index': p.index, 'solved': parsed.get(p.index, {}).get('solved', False),
+                 'attempts': parsed.get(p.index, {}).get('attempts', 0), 'accepted_at': None}
+                for p in problems
+            ]
+
+        results = {result.problem_id: result for result in instance.problem_results.all()}
+        rows = []
+        for p in problems:
+            result = results.get(p.id)
+            rows.append({
+                'index': p.index,
+                'solved': bool(result and result.solved),
+                'attempts': result.attempts if result else 0,
+                'accepted_at': result.accepted_at if result else None,
+            })
+        return rows
+
     def to_representation(self, instance):
         data = super().to_representation(instance)
-        request = self.context.get('request')
-        is_admin = request and request.user and (request.user.is_staff or request.user.is_superuser)
         show_frozen = self.context.get('show_frozen', False)
 
         # 프리즈 상태이고 관리자가 아닌 경우 → frozen 데이터로 교체
@@ -125,6 +152,36 @@ class ScoreboardParticipantSerializer(serializers.ModelSerializer):
         return data
 
 
+class ScoreboardProblemStatsSerializer(serializers.ModelSerializer):
+    """
+    스코어보드 헤더용 문제별 통계 (업데이터가 미리 집계한 ProblemStatistics 사용)
+    - 프리즈 상태 & 일반 유저 → frozen_* 통계 반환
+    statistics__first_solver__user를 select_related한 쿼리셋을 사용해야 문제마다 쿼리가 발생하지 않음
+    """
+    class Meta:
+        model = Problem
+        fields = ['id', 'index']
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        prefix = 'frozen_' if self.context.get('show_frozen', False) else ''
+
+        try:
+            stats = instance.statistics
+        except ProblemStatistics.DoesNotExist:
+            stats = None  # 아직 제출이 반영되지 않은 문제
+
+        first_solver = getattr(stats, f'{prefix}first_solver', None)
+        data.update({
+            'solved_count': getattr(stats, f'{prefix}solved_count', 0),
+            'tried_count': getattr(stats, f'{prefix}tried_count', 0),
+            'attempt_count': getattr(stats, f'{prefix}attempt_count', 0),
+            'first_solver': first_solver.user.username if first_solver else None,
+            'first_solved_at': getattr(stats, f'{prefix}first_solved_at', None),
+        })
+        return data
+
+
 class EditorialUploadSerializer(serializers.Serializer):
     """해설 PDF 업로드용 시리얼라이저"""
     editorial_pdf = serializers.FileField()
@@ -0,0 +1,63 @@
+from django.db import transaction
+from django.db.models.signals import post_save, pre_delete, post_delete
+from django.dispatch import receiver
+from .models import Contest, Participant, ProblemStatistics
+from .scoreboard import bump_version
+from .tasks import rescore_contest_task, remove_participant_statistics
+from . import ranking
+
+
+# 관리자 수정, 참가 신청/취소 등 개별 저장 시 스코어보드 캐시 무효화
+# (bulk_update를 쓰는 업데이터/프리즈는 직접 버전을 올림)
+@receiver([post_save, post_delete], sender=Participant)
+def invalidate_scoreboard_on_participant_change(sender, instance, **kwargs):
+    bump_version(instance.contest_id)
+
+
+# 순위 인덱스도 같은 시점에 반영 (업데이터는 bulk_update 뒤 직접 반영)
+@receiver(post_save, sender=Participant)
+def update_ranking_on_participant_save(sender, instance, **kwargs):
+    ranking.update(instance.contest_id, [instance])
+
+
+# 참가 신청, 관리자 추가(API/Django admin) 등 새 참가자의 이전 제출을 보관소에서 반영
+# (워터마크를 초기화해 Codeforces에서 전체 제출을 다시 받지 않음)
+@receiver(post_save, sender=Participant)
+def rescore_on_participant_create(sender, instance, created, raw=False, **kwargs):
+    if not created or raw:
+        return
+    if Contest.objects.filter(id=instance.contest_id, last_submission_id__gt=0).exists():
+        contest_id = instance.contest_id
+        transaction.on_commit(lambda: rescore_contest_task.delay(contest_id))
+
+
+# 참가 취소 시 문제 통계에서 해당 참가자의 풀이를 제외
+# 문제별 상태는 함께 삭제되고 최초 정답자 FK는 NULL이 되므로 삭제 전에 미리 조회해 둠
+@receiver(pre_delete, sender=Participant)
+def collect_statistics_on_participant_delete(sender, instance, **kwargs):
+    # 프리즈 스냅샷은 bulk_update로 저장되므로 메모리의 값이 오래됐을 수 있음
+    instance.refresh_from_db(fields=['frozen_problem_status'])
+    instance._deleted_results = list(instance.problem_results.all())
+    instance._first_solved = set(ProblemStatistics.objects.filter(first_solver=instance).values_list('problem_id', flat=True))
+    instance._frozen_first_solved = set(
+        ProblemStatistics.objects.filter(frozen_first_solver=instance).values_list('problem_id', flat=True)
+    )
+
+
+@receiver(post_delete, sender=Participant)
+def update_statistics_on_participant_delete(sender, instance, **kwargs):
+    if not hasattr(instance, '_deleted_results'):
+        return
+    remove_participant_statistics(
+        instance, instance._deleted_results, instance._first_solved, instance._frozen_first_solved
+    )
+
+
+@receiver(post_delete, sender=Participant)
+def remove_ranking_on_participant_delete(sender, instance, **kwargs):
+    ranking.remove(instance.contest_id, instance.id)
+
+
+@receiver(post_save, sender=Contest)
+def invalidate_scoreboard_on_contest_change(sender, instance, **kwargs):
+    bump_version(instance.id)
@@ -0,0 +1,149 @@
+"""
+스코어보드 실시간 스트림 (Server-Sent Events)
+
+업데이터가 스코어보드를 갱신할 때마다 바뀐 행만 Redis pub/sub 채널로 한 번 발행하고,
+각 SSE 연결은 채널을 구독해 사용자에게 맞는 쪽(관리자: 실시간, 일반: 프리즈 규칙 적용)만 전달한다.
+Redis를 쓸 수 없으면 각 연결이 스코어보드 캐시 버전을 주기적으로 확인하는 방식으로 대체한다.
+"""
+import asyncio
+import json
+
+import redis
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from main.redis_client import get_redis, mark_redis_unavailable
+from . import scoreboard
+from .utils import is_contest_in_freeze
+
+# 연결 유지용 주석 전송 간격과 Redis 없이 버전을 확인하는 간격 (초)
+HEARTBEAT_INTERVAL = 15
+FALLBACK_POLL_INTERVAL = 2
+# 연결이 끊겼을 때 브라우저가 다시 접속하기까지 대기 시간 (밀리초)
+RETRY_MS = 3000
+
+
+def _channel(contest_id):
+    return f"scoreboard:events:{contest_id}"
+
+
+def _delta(old_rows, new_rows):
+    """이전 행이 없으면 전체 행을 reset으로 전달"""
+    if old_rows is None:
+        return {'reset': True, 'changed': scoreboard.ranked(new_rows), 'removed': []}
+    return {'reset': False, **scoreboard.diff_rows(old_rows, new_rows)}
+
+
+def build_message(version, show_frozen, previous, current):
+    """
+    발행할 메시지 생성
+    previous/current: {'live': 행 목록, 'public': 행 목록} (public은 프리즈 중이면 스냅샷)
+    """
+    return {
+        'version': version,
+        'is_frozen': show_frozen,
+        'live': _delta(previous.get('live'), current['live']),
+        'public': _delta(previous.get('public'), current['public']),
+    }
+
+
+def publish_scoreboard_delta(contest_id, message):
+    """바뀐 행이 있으면 대회 채널로 한 번 발행 (Redis가 없으면 생략, 연결 쪽에서 캐시 버전으로 감지)"""
+    if not (message['live']['changed'] or message['live']['removed']
+            or message['public']['changed'] or message['public']['removed']):
+        return False
+
+    client = get_redis()
+    if client is None:
+        return False
+    try:
+        client.publish(_channel(contest_id), json.dumps(message, cls=DjangoJSONEncoder))
+        return True
+    except redis.RedisError:
+        mark_redis_unavailable()
+        return False
+
+
+def format_event(event, data):
+    """SSE 형식 문자열"""
+    return f"event: {event}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n"
+
+
+def select_delta(message, is_admin):
+    """관리자는 실시간, 일반 사용자는 프리즈 규칙이 적용된 변경분"""
+    delta = message['live'] if is_admin else message['public']
+    return {'version': message['version'], 'is_frozen': message['is_frozen'], **delta}
+
+
+async def _redis_messages(contest_id):
+    """Redis 채널 구독 (HEARTBEAT_INTERVAL 동안 메시지가 없으면 None)"""
+    from redis import asyncio as aioredis
+
+    client = aioredis.Redis.from_url(settings.REDIS_URL)
+    pubsub = client.pubsub()
+    try:
+        await pubsub.subscribe(_channel(contest_id))
+        while True:
+            raw = await pubsub.get_message(ignore_subscribe_messages=True, timeout=HEARTBEAT_INTERVAL)
+            yield json.loads(raw['data']) if raw else None
+    finally:
+        await pubsub.aclose()
+        await client.aclose()
+
+
+async def _polled_messages(contest):
+    """Redis가 없을 때: 캐시 버전이 바뀌면 이 연결이 가진 이전 행과 비교해 메시지를 만듦"""
+    get_version = sync_to_async(scoreboard.get_version)
+    get_rows = sync_to_async(scoreboard.get_rows)
+    refresh = sync_to_async(lambda: contest.refresh_from_db(fields=['is_frozen', 'end_time', 'allow_freeze']))
+
+    async def snapshot():
+        await refresh()
+        show_frozen = contest.is_frozen and is_contest_in_freeze(contest)
+        live = await get_rows(contest, scoreboard.LIVE)
+        public = await get_rows(contest, scoreboard.FROZEN) if show_frozen else live
+        return show_frozen, {'live': live, 'public': public}
+
+    version = await get_version(contest.id)
+    _, previous = await snapshot()
+    idle = 0
+    while True:
+        await asyncio.sleep(FALLBACK_POLL_INTERVAL)
+        current_version = await get_version(contest.id)
+        if current_version == version:
+            idle += FALLBACK_POLL_INTERVAL
+            if idle >= HEARTBEAT_INTERVAL:
+                idle = 0
+                yield None
+            continue
+
+        version = current_version
+        idle = 0
+        show_frozen, current = await snapshot()
+        yield build_message(version, show_frozen, previous, current)
+        previous = current
+
+
+async def subscribe(contest):
+    """대회 스코어보드 메시지 구독 (Redis pub/sub, 없으면 캐시 버전 확인)"""
+    if await sync_to_async(get_redis)() is not None:
+        return _redis_messages(contest.id)
+    return _polled_messages(contest)
+
+
+async def event_stream(contest, is_admin, messages=None):
+    """
+    SSE 응답 본문 (연결이 끊길 때까지 계속)
+    바뀐 행이 없는 메시지는 보내지 않으며, 주기적으로 주석을 보내 프록시 연결을 유지
+    """
+    if messages is None:
+        messages = await subscribe(contest)
+    yield f"retry: {RETRY_MS}\n\n"
+    async for message in messages:
+        if message is None:
+            yield ": keep-alive\n\n"
+            continue
+        delta = select_delta(message, is_admin)
+        if delta['reset'] or delta['changed'] or delta['removed']:
+            yield format_event('delta', delta)
@@ -1,83 +1,644 @@
-from celery import shared_task
+import logging
+import uuid
+from celery import chord, shared_task
+from celery.result import AsyncResult
+from django.db import transaction
 from django.utils import timezone
-from .models import Contest, Participant
-from .utils import fetch_contest_latest_submissions, calculate_participant_stats, API_COOLDOWN, is_contest_in_freeze, freeze_scoreboard
-import time
+from .models import Contest, Participant, ParticipantProblemResult, Problem, ProblemStatistics
+from .locks import run_exclusive, claim_job, current_job, release_job
+from .rating_calculator import apply_contest_rating, replay_ratings
+from . import ranking, scoreboard, streams
+from .utils import (
+    fetch_contest_new_submissions, archive_submissions, is_contest_in_freeze, freeze_scoreboard, parse_problem_status,
+)
+from .scoring import (
+    ScoringContext, apply_submissions, new_state, new_statistics, snapshot, summarize, update_statistics,
+    load_submission_columns, score_batch, batch_summaries,
+)
 from collections import defaultdict
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone as datetime_timezone
+
+logger = logging.getLogger(__name__)
 
 @shared_task
 def update_active_contests_task():
     """
     진행 중인 대회를 찾아 업데이트하는 주기적 태스크
+    대회마다 서브태스크를 병렬로 보내고(chord), 결과 요약은 콜백에서 합침
     """
     now = timezone.now()
-    active_contests = Contest.objects.filter(start_time__lte=now, end_time__gte=now - timedelta(minutes=5))
+    active_ids = list(
+        Contest.objects.filter(start_time__lte=now, end_time__gte=now - timedelta(minutes=5)).values_list('id', flat=True)
+    )
     
-    if not active_contests.exists():
+    if not active_ids:
         return "No active contests"
-        
-    results = []
-    for contest in active_contests:
+
+    # 각 대회의 갱신은 서로 기다리지 않음 (API 호출 속도는 공용 클라이언트의 토큰 버킷이 조절)
+    job = chord(update_contest_task.s(contest_id) for contest_id in active_ids)(summarize_contest_updates.s())
+    return f"Dispatched {len(active_ids)} contest updates (job: {job.id})"
+
+
+@shared_task
+def update_contest_task(contest_id):
+    """
+    단일 대회 업데이트 서브태스크 (update_active_contests_task에서 대회별로 실행)
+    예외가 나면 chord 전체가 실패해 요약이 만들어지지 않으므로 실패 기록으로 바꿔 반환
+
+    Returns:
+        {'contest': 대회명(또는 ID), 'result': 결과 문자열, 'failed': 실패 여부}
+    """
+    try:
+        contest = Contest.objects.get(id=contest_id)
+    except Contest.DoesNotExist:
+        return {'contest': f"Contest {contest_id}", 'result': "not found", 'failed': True}
+
+    try:
         res = update_single_contest_task(contest)
-        results.append(f"{contest.name}: {res}")
-        
-    return "\n".join(results)
+    except Exception as e:
+        logger.exception("Update of contest %s failed", contest_id)
+        return {'contest': contest.name, 'result': f"Failed ({type(e).__name__}: {e})", 'failed': True}
+    return {'contest': contest.name, 'result': res, 'failed': False}
+
+
+@shared_task
+def summarize_contest_updates(results):
+    """대회별 결과를 하나의 요약 문자열로 합침 (chord 콜백, 실패한 대회는 마지막 줄에 모아서 표시)"""
+    lines = [f"{record['contest']}: {record['result']}" for record in results]
+    failed = [record['contest'] for record in results if record['failed']]
+    if failed:
+        lines.append(f"Failed {len(failed)} contests: {', '.join(failed)}")
+    return "\n".join(lines)
+
 
 def update_single_contest_task(contest):
     """
     단일 대회 업데이트 로직 (내부 호출용)
+    대회별 락으로 Celery 태스크/관리 명령의 중복 실행을 막고, 실행 중 들어온 요청은 합쳐서 한 번 더 실행
+    """
+    result = run_exclusive(contest.id, lambda: _update_contest(contest))
+    if result is None:
+        return "Skipped (update already running)"
+    return result
+
+
+def _update_contest(contest):
+    """
+    워터마크 이후의 새 제출만 가져와 기존 풀이 현황에 이어서 반영
     """
+    # 대기 중에 다른 실행이 워터마크/프리즈 상태를 바꿨을 수 있으므로 최신 값 사용
+    contest.refresh_from_db(fields=['last_submission_id', 'is_frozen'])
+
     participants = Participant.objects.filter(contest=contest).select_related('user__profile')
     
     if not participants.exists():
         return "No participants"
 
-    # 1. 최근 100개의 제출 내역을 가져옴
-    time.sleep(API_COOLDOWN)
-    all_submissions = fetch_contest_latest_submissions(contest.id)
+    # 0이면 처음부터 다시 계산 (최초 수집, 참가자 추가 등)
+    since_id = contest.last_submission_id
+    is_rebuild = since_id == 0
+
+    # 1. 워터마크 이후의 새 제출 내역을 가져옴 (호출 간격은 공용 클라이언트의 속도 제한이 조절)
+    # 응답은 시간순으로 한 번 정렬된 SubmissionRecord 목록 (팀 제출은 참가자 핸들로 기록)
+    participant_handles = set(p.user.profile.codeforces_id for p in participants)
+    start_timestamp = contest.start_time.timestamp() if contest.start_time else None
+    new_submissions, watermark = fetch_contest_new_submissions(contest.id, since_id, start_timestamp, participant_handles)
     
-    if not all_submissions:
-         return "No submissions fetched"
+    if not new_submissions:
+        # 새 제출이 없어도 프리즈 시점은 지나갈 수 있으므로 프리즈 체크는 매번 실행
+        if _freeze_if_due(contest):
+            refresh_scoreboard_cache(contest)
+            return "No new submissions (Scoreboard frozen)"
+        return "No new submissions"
          
-    # 2. 핸들별로 필터링 및 그룹화
-    participant_handles = set(p.user.profile.codeforces_id for p in participants)
+    # 2. 핸들별로 그룹화 (전체가 정렬되어 있으므로 핸들별 목록도 시간순)
     submissions_by_handle = defaultdict(list)
-    
-    for sub in all_submissions:
-         if 'author' in sub and 'members' in sub['author']:
-             for member in sub['author']['members']:
-                 handle = member.get('handle')
-                 if handle in participant_handles:
-                     submissions_by_handle[handle].append(sub)
-    
+    for record in new_submissions:
+        if record.handle in participant_handles:
+            submissions_by_handle[record.handle].append(record)
+
     # 3. 문제 가져오기
-    problems = contest.problems.all().order_by('index')
+    problems = list(contest.problems.all().order_by('index'))
     if not problems:
          return "No problems found"
+
+    # 문제 위치/배점/대회 시간은 이번 갱신 동안 한 번만 계산
+    context = ScoringContext.for_contest(contest, problems)
          
+    # 4. 문제별 상태에 새 제출만 이벤트로 적용 (재계산이면 빈 상태에서 시작)
+    active_participants = [p for p in participants if p.user.profile.codeforces_id in submissions_by_handle]
+    states = _load_problem_states(active_participants, problems, fresh=is_rebuild)
+    statistics = _load_problem_statistics(contest, problems, fresh=is_rebuild)
+
     updated_participants = []
-    
-    for participant in participants:
-        handle = participant.user.profile.codeforces_id
-        
-        if handle in submissions_by_handle:
-            user_subs = submissions_by_handle[handle]
-            result = calculate_participant_stats(user_subs, problems, contest.start_time, contest.end_time)
-            
-            if result:
-                participant.problem_status = result['problem_status']
-                participant.total_score = result['total_score']
-                participant.penalty = result['penalty']
-                updated_participants.append(participant)
-
-    # DB 저장
+    changed_states = []
+    changed_statistics = {}
+
+    for participant in active_participants:
+        participant_states = states[participant.id]
+        before = {id(state): snapshot(state) for state in participant_states.values()}
+        participant_changed = apply_submissions(
+            participant_states, submissions_by_handle[participant.user.profile.codeforces_id], context
+        )
+        changed_states += participant_changed
+
+        # 문제 통계는 바뀐 상태의 차이만큼만 갱신
+        for state in participant_changed:
+            stats = statistics[state.problem_id]
+            if update_statistics(stats, state, before[id(state)]):
+                changed_statistics[state.problem_id] = stats
+
+        result = summarize(participant_states, context)
+
+        # 저장된 값과 같으면 쓰지 않음 (SQLite 쓰기 잠금 시간 단축)
+        if not _stats_unchanged(participant, result):
+            participant.problem_status = result['problem_status']
+            participant.total_score = result['total_score']
+            participant.penalty = result['penalty']
+            updated_participants.append(participant)
+
+    # DB 저장 (워터마크는 그 사이 초기화되지 않았을 때만 전진)
+    with transaction.atomic():
+        archive_submissions(contest, new_submissions)
+        _save_problem_states(contest, changed_states, fresh=is_rebuild)
+        # 재계산이면 초기화한 통계 전체, 아니면 바뀐 통계만 저장
+        _save_problem_statistics(statistics.values() if is_rebuild else changed_statistics.values())
+        if updated_participants:
+            Participant.objects.bulk_update(updated_participants, ['problem_status', 'total_score', 'penalty'])
+        Contest.objects.filter(id=contest.id, last_submission_id=since_id).update(last_submission_id=watermark)
+    contest.last_submission_id = watermark
+
+    # 순위 인덱스에는 바뀐 참가자만 반영 (프리즈 스냅샷 집합은 아래 프리즈 시점에 이 값으로 만듦)
     if updated_participants:
-        Participant.objects.bulk_update(updated_participants, ['problem_status', 'total_score', 'penalty'])
+        ranking.update(contest.id, updated_participants)
 
-    # 프리즈 체크: 프리즈 시점이면 스냅샷 저장
-    if not contest.is_frozen and is_contest_in_freeze(contest):
-        freeze_scoreboard(contest)
-        return f"Updated {len(updated_participants)} participants (Scoreboard frozen)"
+    # 프리즈 체크: 프리즈 시점이면 스냅샷 저장 (이번에 반영한 제출까지 포함)
+    frozen_now = _freeze_if_due(contest)
 
+    # 스코어보드 캐시 갱신: 바뀐 참가자가 있거나 프리즈된 경우에만 버전을 올리고 미리 만들어 둠
+    # (바뀐 것이 없으면 기존 캐시/ETag를 그대로 사용)
+    if updated_participants or frozen_now:
+        refresh_scoreboard_cache(contest)
+
+    if frozen_now:
+        return f"Updated {len(updated_participants)} participants (Scoreboard frozen)"
     return f"Updated {len(updated_participants)} participants"
+
+
+def _freeze_if_due(contest):
+    """프리즈 시점이 지났고 아직 스냅샷이 없으면 저장 (저장했으면 True)"""
+    if contest.is_frozen or not is_contest_in_freeze(contest):
+        return False
+    freeze_scoreboard(contest)
+    return True
+
+
+# 다른 갱신이 실행 중일 때 재계산 태스크를 다시 시도하기까지 대기 시간 (초)
+RESCORE_RETRY_DELAY = 10
+
+
+@shared_task(bind=True, max_retries=6)
+def rescore_contest_task(self, contest_id):
+    """
+    보관된 제출로 대회를 다시 계산하는 태스크 (참가자 추가 등)
+    업데이터가 실행 중이면 업데이터의 재실행 요청을 남기지 않고 잠시 뒤 이 태스크를 다시 시도
+    """
+    try:
+        contest = Contest.objects.get(id=contest_id)
+    except Contest.DoesNotExist:
+        return f"Contest {contest_id}: not found"
+
+    result = run_exclusive(contest.id, lambda: _rescore_contest(contest), coalesce=False)
+    if result is None:
+        if self.request.retries >= self.max_retries:
+            logger.error("Rescore of contest %s gave up: contest lock busy after %d retries", contest_id, self.max_retries)
+            return f"{contest.name}: Rescore failed (update lock busy)"
+        raise self.retry(countdown=RESCORE_RETRY_DELAY)
+    return f"{contest.name}: {result}"
+
+
+def rescore_contest(contest):
+    """
+    보관된 제출 기록으로 대회 전체를 다시 계산 (시작/종료 시각 변경, 최종 순위 확정 등)
+    Codeforces API를 다시 호출하지 않으며, 업데이터와 같은 대회별 락을 사용
+    """
+    result = run_exclusive(contest.id, lambda: _rescore_contest(contest), coalesce=False)
+    if result is None:
+        return "Skipped (update already running)"
+    return result
+
+
+def _rescore_contest(contest):
+    """
+    score_batch로 모든 참가자를 한 번에 계산해 풀이 현황, 문제별 상태, 문제 통계를 다시 씀
+    (보관소에는 워터마크까지의 제출이 모두 있으므로 워터마크는 그대로 둠)
+    """
+    contest.refresh_from_db(fields=['start_time', 'end_time', 'is_frozen'])
+    participants = list(Participant.objects.filter(contest=contest).select_related('user__profile').order_by('id'))
+    problems = list(contest.problems.all().order_by('index'))
+    if not participants:
+        return "No participants"
+    if not problems:
+        return "No problems found"
+
+    context = ScoringContext.for_contest(contest, problems)
+    columns = load_submission_columns(contest, participants, context)
+    result = score_batch(columns, context, len(participants))
+
+    updated_participants = _apply_batch_summaries(participants, result)
+
+    states = _batch_problem_states(contest, participants, problems, result)
+    statistics = _load_problem_statistics(contest, problems, fresh=True)
+    for state in states:
+        update_statistics(statistics[state.problem_id], state, (False, 0))
+
+    with transaction.atomic():
+        _save_problem_states(contest, states, fresh=True)
+        _save_problem_statistics(statistics.values())
+        if updated_participants:
+            Participant.objects.bulk_update(updated_participants, ['problem_status', 'total_score', 'penalty'], batch_size=500)
+
+    if updated_participants:
+        ranking.update(contest.id, updated_participants)
+        refresh_scoreboard_cache(contest)
+    return f"Rescored {len(participants)} participants ({len(updated_participants)} changed)"
+
+
+def rescore_participants(contest, participant_ids):
+    """
+    보관된 제출 기록으로 일부 참가자만 다시 계산 (update_participant_status의 핸들별 수집 등)
+    다른 참가자의 풀이 현황은 건드리지 않으므로 보관소가 대회 전체를 담고 있지 않아도 안전함
+    """
+    result = run_exclusive(contest.id, lambda: _rescore_participants(contest, participant_ids), coalesce=False)
+    if result is None:
+        return "Skipped (update already running)"
+    return result
+
+
+def _rescore_participants(contest, participant_ids):
+    """
+    선택한 참가자의 풀이 현황과 문제별 상태를 다시 쓰고, 문제 통계는 기존 상태와의 차이만큼만 반영
+    """
+    contest.refresh_from_db(fields=['start_time', 'end_time'])
+    participants = list(
+        Participant.objects.filter(contest=contest, id__in=participant_ids).select_related('user__profile').order_by('id')
+    )
+    problems = list(contest.problems.all().order_by('index'))
+    if not participants:
+        return "No participants"
+    if not problems:
+        return "No problems found"
+
+    context = ScoringContext.for_contest(contest, problems)
+    columns = load_submission_columns(contest, participants, context)
+    result = score_batch(columns, context, len(participants))
+    updated_participants = _apply_batch_summaries(participants, result)
+
+    new_states = {
+        (state.participant_id, state.problem_id): state
+        for state in _batch_problem_states(contest, participants, problems, result)
+    }
+    old_states = {
+        (state.participant_id, state.problem_id): state
+        for state in ParticipantProblemResult.objects.filter(participant__in=participants)
+    }
+    statistics = _load_problem_statistics(contest, problems)
+    for key in old_states.keys() | new_states.keys():
+        old = old_states.get(key)
+        update_statistics(
+            statistics[key[1]],
+            new_states.get(key) or ParticipantProblemResult(),
+            snapshot(old) if old else (False, 0),
+        )
+
+    with transaction.atomic():
+        ParticipantProblemResult.objects.filter(participant__in=participants).delete()
+        ParticipantProblemResult.objects.bulk_create(new_states.values(), batch_size=500)
+        # 다시 계산한 참가자의 정답 시각이 바뀌었을 수 있으므로 최초 정답자는 저장된 상태로 다시 찾음
+        for problem_id in {key[1] for key in old_states.keys() | new_states.keys()}:
+            _set_first_solver(statistics[problem_id])
+        _save_problem_statistics(statistics.values())
+        if updated_participants:
+            Participant.objects.bulk_update(updated_participants, ['problem_status', 'total_score', 'penalty'])
+
+    if updated_participants:
+        ranking.update(contest.id, updated_participants)
+        refresh_scoreboard_cache(contest)
+    return f"Rescored {len(participants)} participants ({len(updated_participants)} changed)"
+
+
+def _apply_batch_summaries(participants, result):
+    """score_batch 결과를 참가자에 반영하고 값이 바뀐 참가자 목록을 반환"""
+    updated_participants = []
+    for participant, summary in zip(participants, batch_summaries(result)):
+        if not _stats_unchanged(participant, summary):
+            participant.problem_status = summary['problem_status']
+            participant.total_score = summary['total_score']
+            participant.penalty = summary['penalty']
+            updated_participants.append(participant)
+    return updated_participants
+
+
+def _set_first_solver(stats):
+    """저장된 문제별 상태 중 가장 먼저 맞힌 참가자를 최초 정답자로 설정"""
+    first = (
+        ParticipantProblemResult.objects.filter(problem_id=stats.problem_id, solved=True)
+        .order_by('accepted_at', 'participant_id').first()
+    )
+    stats.first_solver_id = first.participant_id if first else None
+    stats.first_solved_at = first.accepted_at if first else None
+
+
+def _batch_problem_states(contest, participants, problems, result):
+    """score_batch 결과를 저장할 문제별 상태 목록으로 변환 (제출이 하나라도 반영된 칸만)"""
+    states = []
+    rows, cols = result['last_submission_id'].nonzero()
+    for row, col in zip(rows.tolist(), cols.tolist()):
+        state = new_state(participants[row], problems[col])
+        state.solved = bool(result['solved'][row, col])
+        state.attempts = int(result['attempts'][row, col])
+        if state.solved:
+            state.accepted_at = datetime.fromtimestamp(result['accepted_time'][row, col], tz=datetime_timezone.utc)
+        state.last_submission_id = int(result['last_submission_id'][row, col])
+        states.append(state)
+    return states
+
+
+def _load_problem_states(participants, problems, fresh=False):
+    """
+    참가자별 문제 상태 {participant_id: {문제 번호: ParticipantProblemResult}}
+    저장된 상태가 없는 문제(또는 fresh=True)는 빈 상태로 채움
+    """
+    index_by_problem = {p.id: p.index for p in problems}
+    states = {participant.id: {} for participant in participants}
+
+    if not fresh:
+        saved = ParticipantProblemResult.objects.filter(
+            participant__in=[p.id for p in participants], problem__in=list(index_by_problem)
+        )
+        for state in saved:
+            states[state.participant_id][index_by_problem[state.problem_id]] = state
+
+    for participant in participants:
+        participant_states = states[participant.id]
+        for problem in problems:
+            if problem.index not in participant_states:
+                participant_states[problem.index] = new_state(participant, problem)
+    return states
+
+
+def _save_problem_states(contest, changed_states, fresh=False):
+    """바뀐 문제 상태 저장 (재계산이면 대회의 기존 상태를 지우고 다시 만듦)"""
+    if fresh:
+        ParticipantProblemResult.objects.filter(contest=contest).delete()
+
+    created = [state for state in changed_states if state.pk is None]
+    updated = [state for state in changed_states if state.pk is not None]
+    if created:
+        ParticipantProblemResult.objects.bulk_create(created, batch_size=500)
+    if updated:
+        ParticipantProblemResult.objects.bulk_update(
+            updated, ['solved', 'attempts', 'accepted_at', 'last_submission_id'], batch_size=500
+        )
+
+
+def _load_problem_statistics(contest, problems, fresh=False):
+    """
+    문제별 통계 {problem_id: ProblemStatistics}
+    저장된 통계가 없는 문제는 빈 통계로 채우고, fresh=True면 실시간 값만 초기화 (프리즈 스냅샷은 유지)
+    """
+    statistics = {stats.problem_id: stats for stats in ProblemStatistics.objects.filter(contest=contest)}
+    if fresh:
+        for stats in statistics.values():
+            stats.solved_count = stats.tried_count = stats.attempt_count = 0
+            stats.first_solver = None
+            stats.first_solved_at = None
+
+    for problem in problems:
+        if problem.id not in statistics:
+            statistics[problem.id] = new_statistics(contest, problem)
+    return statistics
+
+
+def _save_problem_statistics(statistics):
+    """바뀐 문제 통계 저장"""
+    created = [stats for stats in statistics if stats.pk is None]
+    updated = [stats for stats in statistics if stats.pk is not None]
+    if created:
+        ProblemStatistics.objects.bulk_create(created)
+    if updated:
+        ProblemStatistics.objects.bulk_update(
+            updated, ['solved_count', 'tried_count', 'attempt_count', 'first_solver', 'first_solved_at']
+        )
+
+
+def remove_participant_statistics(participant, results, first_solved, frozen_first_solved):
+    """
+    삭제된 참가자(참가 취소 등)의 풀이를 문제 통계에서 제외
+    results: 삭제 전에 조회한 참가자의 문제별 상태 (참가자와 함께 지워지므로 미리 조회)
+    first_solved / frozen_first_solved: 참가자가 (프리즈 시점) 최초 정답자였던 문제 ID
+    (최초 정답자 FK는 삭제 시 NULL이 되므로 남은 참가자 중 다음 정답자로 교체)
+    """
+    statistics = {stats.problem_id: stats for stats in ProblemStatistics.objects.filter(contest_id=participant.contest_id)}
+    if not statistics:
+        return
+
+    # 실시간 통계: 참가자의 상태를 빈 상태로 되돌린 만큼 차감
+    for result in results:
+        stats = statistics.get(result.problem_id)
+        if stats is not None:
+            update_statistics(stats, ParticipantProblemResult(), snapshot(result))
+
+    for problem_id in first_solved & statistics.keys():
+        _set_first_solver(statistics[problem_id])
+
+    # 프리즈 통계: 프리즈 시점 풀이 현황 문자열 기준으로 차감 (프리즈 이후 등록한 참가자는 빈 문자열)
+    problems = list(Problem.objects.filter(contest_id=participant.contest_id).order_by('index'))
+    frozen = parse_problem_status(participant.frozen_problem_status, problems)
+    for problem in problems:
+        state = frozen.get(problem.index)
+        stats = statistics.get(problem.id)
+        if state is None or stats is None:
+            continue
+        stats.frozen_solved_count -= int(state['solved'])
+        stats.frozen_tried_count -= int(state['solved'] or state['attempts'] > 0)
+        stats.frozen_attempt_count -= state['attempts'] + int(state['solved'])
+
+    for problem in problems:
+        if problem.id not in frozen_first_solved or problem.id not in statistics:
+            continue
+        stats = statistics[problem.id]
+        stats.frozen_first_solver_id = stats.frozen_first_solved_at = None
+        # 프리즈 시점에 이미 풀었던 참가자 중 가장 먼저 푼 참가자
+        candidates = (
+            ParticipantProblemResult.objects.filter(problem=problem, solved=True)
+            .select_related('participant')
+            .order_by('accepted_at', 'participant_id')
+        )
+        for result in candidates.iterator():
+            if parse_problem_status(result.participant.frozen_problem_status, problems).get(problem.index, {}).get('solved'):
+                stats.frozen_first_solver_id = result.participant_id
+                stats.frozen_first_solved_at = result.accepted_at
+                break
+
+    ProblemStatistics.objects.bulk_update(statistics.values(), [
+        'solved_count', 'tried_count', 'attempt_count', 'first_solver', 'first_solved_at',
+        'frozen_solved_count', 'frozen_tried_count', 'frozen_attempt_count', 'frozen_first_solver',
+        'frozen_first_solved_at',
+    ])
+
+
+def _stats_unchanged(participant, result):
+    """새로 계산한 풀이 현황이 저장된 값과 같은지"""
+    return (
+        participant.problem_status == result['problem_status']
+        and participant.total_score == result['total_score']
+        and participant.penalty == result['penalty']
+    )
+
+
+def refresh_scoreboard_cache(contest):
+    """
+    스코어보드 버전을 올리고 실시간/프리즈 스코어보드를 미리 캐시한 뒤,
+    이전 버전과 달라진 행만 SSE 구독자에게 발행
+    """
+    show_frozen = contest.is_frozen and is_contest_in_freeze(contest)
+
+    # 직전에 일반 사용자가 보던 행: 프리즈 스냅샷이 캐시되어 있었다면 그것, 아니면 실시간 행
+    previous_live = scoreboard.cached_rows(contest.id, scoreboard.LIVE)
+    previous_frozen = scoreboard.cached_rows(contest.id, scoreboard.FROZEN)
+    previous = {'live': previous_live, 'public': previous_frozen if previous_frozen is not None else previous_live}
+
+    version = scoreboard.bump_version(contest.id)
+    live = scoreboard.render(contest, scoreboard.LIVE, version)
+    public = scoreboard.render(contest, scoreboard.FROZEN, version) if show_frozen else live
+
+    streams.publish_scoreboard_delta(
+        contest.id, streams.build_message(version, show_frozen, previous, {'live': live, 'public': public})
+    )
+
+
+# 레이팅 반영 작업의 멱등 키 유지 시간 (초, 이 시간 동안 같은 대회의 재요청은 기존 작업 ID를 돌려줌)
+RATING_JOB_TTL = 60 * 60
+
+
+def _rating_job_key(contest_id):
+    return f"contest:rating:job:{contest_id}"
+
+
+def start_rating_job(contest_id):
+    """
+    대회 레이팅 반영 작업을 접수 (대회별 멱등 키로 중복 접수 방지)
+
+    Returns:
+        (job_id, created): 이미 접수된 작업이 있으면 created=False와 기존 작업 ID
+    """
+    job_id = uuid.uuid4().hex
+    claimed_id = claim_job(_rating_job_key(contest_id), job_id, RATING_JOB_TTL)
+    if claimed_id != job_id:
+        return claimed_id, False
+
+    try:
+        apply_contest_rating_task.apply_async(args=[contest_id], task_id=job_id)
+    except Exception:
+        # 접수에 실패하면(브로커 연결 실패 등) 키를 풀어 바로 다시 요청할 수 있게 함
+        release_job(_rating_job_key(contest_id), job_id)
+        raise
+    return job_id, True
+
+
+def unapply_contest_ratings(contest_ids):
+    """
+    대회들의 레이팅 반영 표시와 멱등 키를 해제 (반영 취소 후 바로 다시 접수할 수 있도록)
+    프로필/기록 재계산(replay_ratings)은 호출한 쪽에서 진행
+
+    Returns:
+        반영 표시를 해제한 대회 수
+    """
+    count = Contest.objects.filter(id__in=contest_ids, is_rating_applied=True).update(is_rating_applied=False)
+    for contest_id in contest_ids:
+        key = _rating_job_key(contest_id)
+        job_id = current_job(key)
+        if job_id:
+            release_job(key, job_id)
+    return count
+
+
+def replay_contest_ratings(exclude_ids=()):
+    """
+    대회 반영 취소(exclude_ids) 후 레이팅 전체 재계산을 모든 대회의 레이팅 작업 키를 잡은 채로 진행
+    반영 중인 작업이 있으면 재계산하지 않음 (재계산 중에는 새 반영 작업도 접수되지 않음)
+
+    Returns:
+        replay_ratings의 결과에 반영 취소한 대회 수(unapplied)를 더한 dict
+    """
+    job_id = uuid.uuid4().hex
+    held, busy = [], []
+    for contest_id, applied in Contest.objects.values_list('id', 'is_rating_applied'):
+        if claim_job(_rating_job_key(contest_id), job_id, RATING_JOB_TTL) == job_id:
+            held.append(contest_id)
+        elif not applied:
+            # 키를 가진 작업이 아직 끝나지 않음 (성공하면 반영 표시, 실패하면 키를 해제함)
+            busy.append(contest_id)
+
+    try:
+        if busy:
+            return {
+                "success": False, "unapplied": 0,
+                "message": f"Rating job in progress for contests {busy}, try again later",
+            }
+        unapplied = unapply_contest_ratings(exclude_ids) if exclude_ids else 0
+        # 반영 취소로 풀린 키를 다시 잡아 재계산이 끝날 때까지 새 작업이 접수되지 않게 함
+        for contest_id in exclude_ids:
+            if claim_job(_rating_job_key(contest_id), job_id, RATING_JOB_TTL) == job_id:
+                held.append(contest_id)
+        return {**replay_ratings(), "unapplied": unapplied}
+    finally:
+        for contest_id in held:
+            release_job(_rating_job_key(contest_id), job_id)
+
+
+@shared_task(bind=True)
+def apply_contest_rating_task(self, contest_id):
+    """
+    레이팅 반영 태스크 (진행 상황은 PROGRESS 상태의 meta로 기록)
+    실패하면 멱등 키를 해제해 다시 접수할 수 있게 함
+    """
+    def report(phase, done, total):
+        # eager 실행(테스트, 브로커 없는 환경)에서는 결과 백엔드가 없으므로 생략
+        if not self.request.is_eager:
+            self.update_state(state='PROGRESS', meta={'phase': phase, 'done': done, 'total': total})
+
+    try:
+        result = apply_contest_rating(contest_id, progress=report)
+    except Exception:
+        release_job(_rating_job_key(contest_id), self.request.id)
+        raise
+
+    if not result['success']:
+        release_job(_rating_job_key(contest_id), self.request.id)
+    return result
+
+
+def get_rating_job_status(contest_id, job_id=None):
+    """
+    레이팅 반영 작업의 상태 조회 (job_id가 없으면 대회에 접수된 최근 작업)
+
+    Returns:
+        상태 dict, 조회할 작업이 없으면 None
+    """
+    job_id = job_id or current_job(_rating_job_key(contest_id))
+    if not job_id:
+        return None
+
+    result = AsyncResult(job_id, app=apply_contest_rating_task.app)
+    status = {'job_id': job_id, 'state': result.state, 'phase': None, 'done': 0, 'total': 0}
+
+    if result.state == 'PROGRESS' and isinstance(result.info, dict):
+        status.update({key: result.info.get(key) for key in ('phase', 'done', 'total')})
+    elif result.state == 'SUCCESS':
+        status['phase'] = 'done'
+        status['result'] = result.result
+    elif result.state == 'FAILURE':
+        status['error'] = str(result.info)
+    return status
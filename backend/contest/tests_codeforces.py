@@ -0,0 +1,117 @@
+from django.test import SimpleTestCase, override_settings
+from unittest.mock import patch, MagicMock
+import requests
+from rest_framework.test import APITestCase
+from . import codeforces
+from .codeforces import call_api, CodeforcesAPIError, LocalTokenBucket
+
+
+def make_response(status_code, payload):
+    response = MagicMock()
+    response.status_code = status_code
+    response.json.return_value = payload
+    if status_code >= 400:
+        error = requests.HTTPError(response=response)
+        response.raise_for_status.side_effect = error
+    return response
+
+
+@override_settings(CODEFORCES_API_MAX_RETRIES=2)
+@patch('contest.codeforces.time.sleep')
+@patch('contest.codeforces.reserve_token', return_value=0.0)
+class CodeforcesClientTests(SimpleTestCase):
+
+    def test_returns_result(self, _reserve, _sleep):
+        """정상 응답이면 result만 반환한다."""
+        session = MagicMock()
+        session.get.return_value = make_response(200, {"status": "OK", "result": [1, 2]})
+        with patch('contest.codeforces.get_session', return_value=session):
+            self.assertEqual(call_api('contest.status', {'contestId': 1}), [1, 2])
+
+        session.get.assert_called_once()
+        self.assertEqual(session.get.call_args.kwargs['params'], {'contestId': 1})
+
+    def test_retries_server_errors(self, _reserve, sleep):
+        """5xx 응답은 백오프 후 재시도한다."""
+        session = MagicMock()
+        session.get.side_effect = [
+            make_response(503, {}),
+            make_response(200, {"status": "OK", "result": "ok"}),
+        ]
+        with patch('contest.codeforces.get_session', return_value=session):
+            self.assertEqual(call_api('user.info'), "ok")
+
+        self.assertEqual(session.get.call_count, 2)
+        sleep.assert_called_once()
+
+    def test_gives_up_after_max_retries(self, _reserve, _sleep):
+        """재시도 횟수를 넘기면 마지막 예외를 그대로 올린다."""
+        session = MagicMock()
+        session.get.side_effect = requests.ConnectionError("down")
+        with patch('contest.codeforces.get_session', return_value=session):
+            with self.assertRaises(requests.ConnectionError):
+                call_api('user.info')
+
+        self.assertEqual(session.get.call_count, 3)
+
+    def test_failed_status_raises_without_retry(self, _reserve, _sleep):
+        """status=FAILED는 재시도하지 않고 CodeforcesAPIError를 올린다."""
+        session = MagicMock()
+        session.get.return_value = make_response(400, {"status": "FAILED", "comment": "handles: not found"})
+        with patch('contest.codeforces.get_session', return_value=session):
+            with self.assertRaises(CodeforcesAPIError) as ctx:
+                call_api('user.info', {'handles': 'nobody'})
+
+        self.assertEqual(ctx.exception.comment, "handles: not found")
+        self.assertEqual(session.get.call_count, 1)
+
+    def test_call_limit_exceeded_is_retried(self, _reserve, _sleep):
+        """호출 제한 초과 응답은 잠시 후 재시도한다."""
+        session = MagicMock()
+        session.get.side_effect = [
+            make_response(400, {"status": "FAILED", "comment": "Call limit exceeded"}),
+            make_response(200, {"status": "OK", "result": []}),
+        ]
+        with patch('contest.codeforces.get_session', return_value=session):
+            self.assertEqual(call_api('contest.status'), [])
+
+
+class TokenBucketTests(SimpleTestCase):
+
+    @patch('contest.codeforces.time.monotonic')
+    def test_local_bucket_waits_only_when_budget_is_spent(self, monotonic):
+        """예산이 남아 있으면 대기 없이, 다 쓰면 필요한 만큼만 대기한다."""
+        monotonic.return_value = 100.0
+        bucket = LocalTokenBucket()
+
+        self.assertEqual(bucket.reserve(rate=2, capacity=2), 0.0)
+        self.assertEqual(bucket.reserve(rate=2, capacity=2), 0.0)
+        self.assertAlmostEqual(bucket.reserve(rate=2, capacity=2), 0.5)
+
+        # 충분히 시간이 지나면 다시 바로 호출 가능
+        monotonic.return_value = 110.0
+        self.assertEqual(bucket.reserve(rate=2, capacity=2), 0.0)
+
+    @patch('contest.codeforces.get_redis', return_value=None)
+    def test_falls_back_to_local_bucket_without_redis(self, _get_redis):
+        """Redis에 연결할 수 없으면 프로세스 내부 버킷을 사용한다."""
+        with patch.object(codeforces, '_local_bucket') as bucket:
+            bucket.reserve.return_value = 0.25
+            self.assertEqual(codeforces.reserve_token(), 0.25)
+
+
+@patch('user.views.call_api')
+class VerifyCodeforcesViewTests(APITestCase):
+    url = '/api/users/verify-codeforces/'
+
+    def test_unknown_handle_is_404(self, call):
+        call.side_effect = CodeforcesAPIError("handles: User with handle nobody not found")
+        response = self.client.get(self.url, {'handle': 'nobody'})
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(response.data['exists'])
+
+    def test_other_api_failure_is_503(self, call):
+        """호출 제한 초과 등 핸들과 무관한 실패는 404가 아니라 503"""
+        call.side_effect = CodeforcesAPIError("Call limit exceeded")
+        response = self.client.get(self.url, {'handle': 'tourist'})
+        self.assertEqual(response.status_code, 503)
@@ -0,0 +1,83 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils import timezone
+from datetime import timedelta
+from unittest.mock import patch
+from rest_framework.test import APITestCase
+from .models import Contest, Problem, Participant
+
+User = get_user_model()
+
+
+class ConditionalRequestTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.contest = Contest.objects.create(
+            id=8201,
+            name='Conditional Round',
+            start_time=timezone.now() - timedelta(hours=1),
+            end_time=timezone.now() + timedelta(hours=2),
+        )
+        self.problem = Problem.objects.create(contest=self.contest, index='A', name='Problem A', points=500)
+        user = User.objects.create_user(username='etag', password='pw')
+        self.participant = Participant.objects.create(contest=self.contest, user=user, total_score=500)
+
+        self.scoreboard_url = f'/api/contests/contests/{self.contest.virtual_id}/scoreboard/'
+        self.problems_url = f'/api/contests/problems/{self.contest.virtual_id}/'
+        self.contest_url = f'/api/contests/contests/{self.contest.virtual_id}/'
+
+    def test_scoreboard_not_modified(self):
+        """버전이 같으면 참가자 조회 없이 304를 반환한다."""
+        response = self.client.get(self.scoreboard_url)
+        etag = response['ETag']
+
+        # 대회 조회 1회만 실행
+        with self.assertNumQueries(1):
+            cached = self.client.get(self.scoreboard_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(cached.status_code, 304)
+
+    def test_scoreboard_etag_changes_with_scores(self):
+        etag = self.client.get(self.scoreboard_url)['ETag']
+        self.participant.total_score = 1000
+        self.participant.save()
+
+        response = self.client.get(self.scoreboard_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.data['participants'][0]['total_score'], 1000)
+
+    def test_problem_list_not_modified(self):
+        response = self.client.get(self.problems_url)
+        self.assertEqual(response.status_code, 200)
+
+        cached = self.client.get(self.problems_url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, 304)
+        since = self.client.get(self.problems_url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(since.status_code, 304)
+
+        self.problem.name = 'Renamed'
+        self.problem.save()
+        changed = self.client.get(self.problems_url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(changed.data[0]['name'], 'Renamed')
+
+    def test_contest_detail_not_modified(self):
+        response = self.client.get(self.contest_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('no-cache', response['Cache-Control'])
+
+        # 남은 시간이 바뀌어도 대회/문제가 그대로면 304
+        with patch('contest.serializers.timezone.now', return_value=timezone.now() + timedelta(seconds=5)):
+            cached = self.client.get(self.contest_url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, 304)
+        self.assertFalse(cached.content)
+
+    def test_contest_detail_etag_changes_with_problems(self):
+        etag = self.client.get(self.contest_url)['ETag']
+        self.problem.name = 'Renamed'
+        self.problem.save()
+
+        response = self.client.get(self.contest_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
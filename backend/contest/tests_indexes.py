@@ -0,0 +1,56 @@
+import unittest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+from datetime import timedelta
+from .models import Contest, Participant, Problem, RatingHistory
+
+User = get_user_model()
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN 형식은 SQLite 기준')
+class HotQueryIndexTests(TestCase):
+    """자주 실행되는 조회가 테이블 전체 스캔이나 임시 정렬 없이 인덱스만으로 처리되는지 확인"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.contest = Contest.objects.create(
+            id=8601, name='Index Round',
+            start_time=timezone.now() - timedelta(hours=2), end_time=timezone.now() - timedelta(hours=1),
+        )
+        cls.user = User.objects.create(username='indexed')
+        Participant.objects.create(contest=cls.contest, user=cls.user, total_score=500, penalty=10)
+        Problem.objects.create(contest=cls.contest, index='A', points=500)
+        RatingHistory.objects.create(user=cls.user, contest=cls.contest, rating=1500, rating_change=0)
+
+    def query_plan(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            return [row[-1] for row in cursor.fetchall()]
+
+    def assert_indexed(self, queryset):
+        table = queryset.model._meta.db_table
+        plan = self.query_plan(queryset)
+        for detail in plan:
+            self.assertFalse(detail.startswith(f'SCAN {table}'), plan)
+            self.assertNotIn('USE TEMP B-TREE', detail, plan)
+        self.assertTrue(any(detail.startswith(f'SEARCH {table} USING') for detail in plan), plan)
+
+    def test_live_ranking(self):
+        # 레이팅 계산 / 스코어보드 / 순위 인덱스 DB 대체 경로
+        participants = Participant.objects.filter(contest=self.contest)
+        self.assert_indexed(participants.order_by('-total_score', 'penalty'))
+        self.assert_indexed(participants.order_by('-total_score', 'penalty', 'id'))
+        self.assert_indexed(participants.order_by('-total_score', 'penalty', 'id').values_list('id', 'total_score', 'penalty')[10:60])
+
+    def test_frozen_ranking(self):
+        participants = Participant.objects.filter(contest=self.contest)
+        self.assert_indexed(participants.order_by('-frozen_total_score', 'frozen_penalty', 'id'))
+
+    def test_rating_history_by_user(self):
+        self.assert_indexed(RatingHistory.objects.filter(user_id=self.user.id).order_by('-created_at'))
+
+    def test_problems_by_contest(self):
+        self.assert_indexed(Problem.objects.filter(contest=self.contest).order_by('index'))
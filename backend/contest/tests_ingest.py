@@ -0,0 +1,383 @@
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from datetime import timedelta
+from unittest.mock import patch
+from .models import Contest, Problem, Participant, ParticipantProblemResult, ProblemStatistics, Submission
+from .tasks import update_single_contest_task, rescore_contest
+from .utils import (
+    fetch_contest_new_submissions, archive_submissions, freeze_scoreboard,
+    to_submission_record,
+)
+from user.models import Profile
+from main.celery import app
+
+User = get_user_model()
+
+
+def make_submission(sub_id, handle, index, verdict, created):
+    return {
+        "id": sub_id,
+        "creationTimeSeconds": created,
+        "problem": {"index": index},
+        "author": {"members": [{"handle": handle}]},
+        "verdict": verdict,
+    }
+
+
+class FakeContestStatus:
+    """contest.status API 흉내 (최신순, from/count 페이지 처리)"""
+
+    def __init__(self, submissions):
+        self.submissions = submissions
+        self.calls = 0
+
+    def __call__(self, method, params=None, timeout=None):
+        self.calls += 1
+        offset, count = params['from'], params['count']
+        newest_first = sorted(self.submissions, key=lambda s: s['id'], reverse=True)
+        return newest_first[offset - 1:offset - 1 + count]
+
+
+class SubmissionIngestTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='alice', password='pw')
+        Profile.objects.create(
+            user=self.user, school='S', department='D', student_id='1', real_name='Alice', codeforces_id='alice'
+        )
+        now = timezone.now().replace(microsecond=0)
+        self.contest = Contest.objects.create(
+            id=3001,
+            name='Ingest Contest',
+            start_time=now - timedelta(hours=1),
+            end_time=now + timedelta(hours=1),
+            allow_freeze=False,
+        )
+        Problem.objects.create(contest=self.contest, index='A', name='A', points=500)
+        Problem.objects.create(contest=self.contest, index='B', name='B', points=1000)
+        self.participant = Participant.objects.create(contest=self.contest, user=self.user)
+        self.start = int(self.contest.start_time.timestamp())
+
+    @patch('contest.utils.SUBMISSION_PAGE_SIZE', 2)
+    def test_pages_back_until_watermark(self):
+        """워터마크에 닿을 때까지만 페이지를 넘긴다."""
+        fake = FakeContestStatus([
+            make_submission(i, 'alice', 'A', 'WRONG_ANSWER', self.start + i) for i in range(1, 8)
+        ])
+        with patch('contest.utils.call_api', side_effect=fake):
+            submissions, watermark = fetch_contest_new_submissions(self.contest.id, since_id=4)
+
+        self.assertEqual([s.id for s in submissions], [5, 6, 7])
+        self.assertEqual(watermark, 7)
+        self.assertEqual(fake.calls, 2)
+
+    def test_stops_at_contest_start(self):
+        """대회 시작 전 제출을 만나면 더 이상 가져오지 않는다."""
+        fake = FakeContestStatus([
+            make_submission(1, 'alice', 'A', 'OK', self.start - 600),
+            make_submission(2, 'alice', 'A', 'OK', self.start + 60),
+        ])
+        with patch('contest.utils.call_api', side_effect=fake):
+            submissions, watermark = fetch_contest_new_submissions(self.contest.id, 0, self.start)
+
+        self.assertEqual([s.id for s in submissions], [2])
+        self.assertEqual(watermark, 2)
+
+    def test_pending_submission_holds_watermark(self):
+        """채점 중인 제출 이후는 다음 수집으로 미룬다."""
+        fake = FakeContestStatus([
+            make_submission(1, 'alice', 'A', 'OK', self.start + 60),
+            make_submission(2, 'alice', 'B', 'TESTING', self.start + 120),
+            make_submission(3, 'alice', 'A', 'OK', self.start + 180),
+        ])
+        with patch('contest.utils.call_api', side_effect=fake):
+            submissions, watermark = fetch_contest_new_submissions(self.contest.id)
+
+        self.assertEqual([s.id for s in submissions], [1])
+        self.assertEqual(watermark, 1)
+
+    def test_update_applies_only_new_submissions(self):
+        """두 번째 업데이트는 새 제출만 기존 현황에 이어서 반영한다."""
+        history = [
+            make_submission(1, 'alice', 'B', 'WRONG_ANSWER', self.start + 300),
+            make_submission(2, 'alice', 'A', 'OK', self.start + 600),
+        ]
+        fake = FakeContestStatus(history)
+        with patch('contest.utils.call_api', side_effect=fake):
+            update_single_contest_task(self.contest)
+
+        self.participant.refresh_from_db()
+        self.contest.refresh_from_db()
+        self.assertEqual(self.participant.problem_status, '+:-1')
+        self.assertEqual(self.participant.penalty, 10)
+        self.assertEqual(self.contest.last_submission_id, 2)
+
+        history.append(make_submission(3, 'alice', 'B', 'OK', self.start + 1800))
+        with patch('contest.utils.call_api', side_effect=fake):
+            update_single_contest_task(self.contest)
+
+        self.participant.refresh_from_db()
+        self.assertEqual(self.participant.problem_status, '+:+1')
+        self.assertEqual(self.participant.total_score, 1500)
+        # A: 10분, B: 30분 + 오답 1회(20분)
+        self.assertEqual(self.participant.penalty, 60)
+        self.assertEqual(self.contest.last_submission_id, 3)
+
+    def test_registration_rescores_from_archive(self):
+        """참가자가 새로 등록되면 Codeforces에서 다시 받지 않고 보관된 제출로 다시 계산한다."""
+        history = [
+            make_submission(1, 'alice', 'A', 'OK', self.start + 300),
+            make_submission(2, 'bob', 'B', 'OK', self.start + 600),
+        ]
+        with patch('contest.utils.call_api', side_effect=FakeContestStatus(history)):
+            update_single_contest_task(self.contest)
+
+        other = User.objects.create_user(username='bob', password='pw')
+        Profile.objects.create(
+            user=other, school='S', department='D', student_id='2', real_name='Bob', codeforces_id='bob'
+        )
+        self.client.force_login(other)
+
+        app.conf.task_always_eager = True
+        self.addCleanup(setattr, app.conf, 'task_always_eager', False)
+        with patch('contest.utils.call_api') as call_api, self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f'/api/contests/contests/{self.contest.virtual_id}/register/')
+
+        self.assertEqual(response.status_code, 201)
+        call_api.assert_not_called()
+        self.contest.refresh_from_db()
+        self.assertEqual(self.contest.last_submission_id, 2)
+        bob = Participant.objects.get(contest=self.contest, user=other)
+        self.assertEqual((bob.problem_status, bob.total_score), ('0:+', 1000))
+        self.assertTrue(ParticipantProblemResult.objects.get(participant=bob).solved)
+
+    def test_admin_added_participant_is_rescored(self):
+        """관리 화면 등에서 직접 추가한 참가자도 보관된 제출로 반영된다."""
+        Contest.objects.filter(id=self.contest.id).update(last_submission_id=10)
+        other = User.objects.create_user(username='carol', password='pw')
+
+        with patch('contest.tasks.rescore_contest_task.delay') as delay, self.captureOnCommitCallbacks(execute=True):
+            Participant.objects.create(contest=self.contest, user=other)
+        delay.assert_called_once_with(self.contest.id)
+
+    def test_freeze_without_new_submissions(self):
+        """새 제출이 없어도 프리즈 시점이 지나면 스냅샷을 저장한다."""
+        Contest.objects.filter(id=self.contest.id).update(allow_freeze=True, freeze_minutes=60)
+        self.contest.refresh_from_db()
+
+        with patch('contest.utils.call_api', side_effect=FakeContestStatus([])):
+            result = update_single_contest_task(self.contest)
+
+        self.assertEqual(result, "No new submissions (Scoreboard frozen)")
+        self.contest.refresh_from_db()
+        self.assertTrue(self.contest.is_frozen)
+
+    def test_update_archives_new_submissions(self):
+        """업데이트 시 새 제출이 Submission 테이블에 저장된다."""
+        fake = FakeContestStatus([
+            make_submission(1, 'alice', 'A', 'OK', self.start + 60),
+            make_submission(2, 'stranger', 'B', 'WRONG_ANSWER', self.start + 120),
+        ])
+        with patch('contest.utils.call_api', side_effect=fake):
+            update_single_contest_task(self.contest)
+
+        archived = Submission.objects.get(id=1)
+        self.assertEqual(archived.contest, self.contest)
+        self.assertEqual(archived.handle, 'alice')
+        self.assertEqual(archived.problem_index, 'A')
+        self.assertEqual(archived.verdict, 'OK')
+        self.assertEqual(int(archived.creation_time.timestamp()), self.start + 60)
+        self.assertTrue(Submission.objects.filter(id=2, handle='stranger').exists())
+
+    def test_archive_ignores_duplicates(self):
+        """이미 저장된 제출 ID는 다시 저장해도 무시된다."""
+        submissions = [to_submission_record(make_submission(1, 'alice', 'A', 'OK', self.start + 60))]
+        archive_submissions(self.contest, submissions)
+        archive_submissions(self.contest, submissions)
+
+        self.assertEqual(Submission.objects.filter(contest=self.contest).count(), 1)
+
+    def test_unchanged_stats_are_not_written(self):
+        """다시 계산한 값이 저장된 값과 같으면 쓰지 않고 스코어보드 버전도 유지한다."""
+        history = [make_submission(1, 'alice', 'A', 'OK', self.start + 600)]
+        fake = FakeContestStatus(history)
+        with patch('contest.utils.call_api', side_effect=fake):
+            self.assertEqual(update_single_contest_task(self.contest), "Updated 1 participants")
+
+        # 이미 푼 문제에 대한 추가 제출은 풀이 현황을 바꾸지 않음
+        history.append(make_submission(2, 'alice', 'A', 'OK', self.start + 900))
+        with patch('contest.utils.call_api', side_effect=fake), \
+                patch('contest.tasks.refresh_scoreboard_cache') as refresh, \
+                patch('contest.tasks.Participant.objects.bulk_update') as bulk_update:
+            self.assertEqual(update_single_contest_task(self.contest), "Updated 0 participants")
+
+        bulk_update.assert_not_called()
+        refresh.assert_not_called()
+        self.contest.refresh_from_db()
+        self.assertEqual(self.contest.last_submission_id, 2)
+
+    def test_problem_states_are_persisted_and_rebuilt(self):
+        """문제별 상태가 저장되고, 워터마크 초기화 시 처음부터 다시 만들어진다."""
+        history = [
+            make_submission(1, 'alice', 'B', 'WRONG_ANSWER', self.start + 300),
+            make_submission(2, 'alice', 'A', 'OK', self.start + 600),
+        ]
+        fake = FakeContestStatus(history)
+        with patch('contest.utils.call_api', side_effect=fake):
+            update_single_contest_task(self.contest)
+
+        states = {s.problem.index: s for s in ParticipantProblemResult.objects.filter(participant=self.participant)}
+        self.assertTrue(states['A'].solved)
+        self.assertEqual(states['A'].last_submission_id, 2)
+        self.assertEqual((states['B'].solved, states['B'].attempts), (False, 1))
+
+        # 워터마크 0 = 다음 업데이트에서 처음부터 다시 반영 (마이그레이션 후 첫 수집 등)
+        Contest.objects.filter(id=self.contest.id).update(last_submission_id=0)
+        with patch('contest.utils.call_api', side_effect=fake):
+            update_single_contest_task(self.contest)
+
+        self.assertEqual(ParticipantProblemResult.objects.filter(participant=self.participant).count(), 2)
+        self.participant.refresh_from_db()
+        self.assertEqual(self.participant.problem_status, '+:-1')
+
+    def test_problem_statistics_are_maintained(self):
+        """문제별 통계가 업데이트마다 증분으로 갱신되고, 재계산 시에도 프리즈 스냅샷은 유지된다."""
+        history = [
+            make_submission(1, 'alice', 'A', 'WRONG_ANSWER', self.start + 300),
+            make_submission(2, 'alice', 'B', 'WRONG_ANSWER', self.start + 400),
+        ]
+        fake = FakeContestStatus(history)
+        with patch('contest.utils.call_api', side_effect=fake):
+            update_single_contest_task(self.contest)
+
+        history.append(make_submission(3, 'alice', 'A', 'OK', self.start + 600))
+        with patch('contest.utils.call_api', side_effect=fake):
+            update_single_contest_task(self.contest)
+
+        stats = {s.problem.index: s for s in ProblemStatistics.objects.filter(contest=self.contest)}
+        self.assertEqual((stats['A'].solved_count, stats['A'].tried_count, stats['A'].attempt_count), (1, 1, 2))
+        self.assertEqual(stats['A'].first_solver_id, self.participant.id)
+        self.assertEqual(stats['A'].first_solved_at.timestamp(), self.start + 600)
+        self.assertEqual((stats['B'].solved_count, stats['B'].tried_count, stats['B'].attempt_count), (0, 1, 1))
+
+        freeze_scoreboard(self.contest)
+        # 워터마크 0 = 다음 업데이트에서 처음부터 다시 반영 (마이그레이션 후 첫 수집 등)
+        Contest.objects.filter(id=self.contest.id).update(last_submission_id=0)
+        with patch('contest.utils.call_api', side_effect=fake):
+            update_single_contest_task(self.contest)
+
+        stats_a = ProblemStatistics.objects.get(problem__index='A', contest=self.contest)
+        self.assertEqual((stats_a.solved_count, stats_a.attempt_count), (1, 2))
+        self.assertEqual((stats_a.frozen_solved_count, stats_a.frozen_first_solver_id), (1, self.participant.id))
+
+    def test_update_participant_status_command_keeps_problem_results(self):
+        """핸들별 수집 명령도 문제별 상태와 통계를 풀이 현황과 함께 갱신한다."""
+        history = [
+            make_submission(1, 'alice', 'A', 'WRONG_ANSWER', self.start + 300),
+            make_submission(2, 'alice', 'A', 'OK', self.start + 600),
+            make_submission(3, 'alice', 'B', 'TESTING', self.start + 900),
+            make_submission(4, 'alice', 'B', 'OK', self.start + 1200),
+        ]
+        with patch('contest.utils.call_api', return_value=list(reversed(history))):
+            call_command('update_participant_status', str(self.contest.id), stdout=StringIO())
+
+        self.participant.refresh_from_db()
+        self.assertEqual(self.participant.problem_status, '+1:0')
+        # 채점 중인 제출부터는 보관하지 않음 (업데이터가 다음 수집 때 반영)
+        self.assertEqual(sorted(Submission.objects.values_list('id', flat=True)), [1, 2])
+        result = ParticipantProblemResult.objects.get(participant=self.participant, problem__index='A')
+        self.assertEqual((result.solved, result.attempts), (True, 1))
+        stats = ProblemStatistics.objects.get(contest=self.contest, problem__index='A')
+        self.assertEqual((stats.solved_count, stats.first_solver_id), (1, self.participant.id))
+
+    def test_update_participant_status_leaves_other_participants(self):
+        """한 참가자만 수집해도 보관소에 제출이 없는 다른 참가자의 결과는 그대로 남는다."""
+        other = User.objects.create(username='legacy')
+        untouched = Participant.objects.create(
+            contest=self.contest, user=other, problem_status='+:0', total_score=500, penalty=10
+        )
+        history = [make_submission(1, 'alice', 'B', 'OK', self.start + 600)]
+        with patch('contest.utils.call_api', return_value=history):
+            call_command('update_participant_status', str(self.contest.id), '--user_id', str(self.user.id), stdout=StringIO())
+
+        untouched.refresh_from_db()
+        self.assertEqual((untouched.problem_status, untouched.total_score, untouched.penalty), ('+:0', 500, 10))
+        self.participant.refresh_from_db()
+        self.assertEqual((self.participant.problem_status, self.participant.total_score), ('0:+', 1000))
+
+    def test_full_rescore_requires_complete_archive(self):
+        """워터마크가 0이면(보관소 미완성) --from-archive 전체 재계산을 하지 않는다."""
+        Participant.objects.filter(pk=self.participant.pk).update(problem_status='+:0', total_score=500)
+        out = StringIO()
+        call_command('update_participant_status', str(self.contest.id), '--from-archive', stdout=out)
+
+        self.assertIn('not complete', out.getvalue())
+        self.participant.refresh_from_db()
+        self.assertEqual(self.participant.total_score, 500)
+
+    def test_unregistered_participant_leaves_statistics(self):
+        """참가 취소 시 문제 통계에서 빠지고, 최초 정답자였다면 다음 정답자로 바뀐다."""
+        bob = User.objects.create_user(username='bob', password='pw')
+        Profile.objects.create(user=bob, school='S', department='D', student_id='2', real_name='Bob', codeforces_id='bob')
+        bob_participant = Participant.objects.create(contest=self.contest, user=bob)
+        history = [
+            make_submission(1, 'alice', 'A', 'WRONG_ANSWER', self.start + 100),
+            make_submission(2, 'alice', 'A', 'OK', self.start + 300),
+            make_submission(3, 'bob', 'A', 'OK', self.start + 600),
+            make_submission(4, 'alice', 'B', 'WRONG_ANSWER', self.start + 700),
+        ]
+        with patch('contest.utils.call_api', side_effect=FakeContestStatus(history)):
+            update_single_contest_task(self.contest)
+        freeze_scoreboard(self.contest)
+
+        self.participant.delete()
+
+        stats = {s.problem.index: s for s in ProblemStatistics.objects.filter(contest=self.contest)}
+        self.assertEqual((stats['A'].solved_count, stats['A'].tried_count, stats['A'].attempt_count), (1, 1, 1))
+        self.assertEqual((stats['A'].first_solver_id, stats['A'].first_solved_at.timestamp()),
+                         (bob_participant.id, self.start + 600))
+        self.assertEqual((stats['B'].solved_count, stats['B'].tried_count, stats['B'].attempt_count), (0, 0, 0))
+        self.assertEqual((stats['A'].frozen_solved_count, stats['A'].frozen_attempt_count), (1, 1))
+        self.assertEqual(stats['A'].frozen_first_solver_id, bob_participant.id)
+        self.assertEqual(stats['B'].frozen_tried_count, 0)
+
+    def test_rescore_from_archive_after_end_time_change(self):
+        """종료 시각을 바꾼 뒤 보관된 제출로 다시 계산하면 API 호출 없이 결과가 바뀐다."""
+        history = [
+            make_submission(1, 'alice', 'A', 'WRONG_ANSWER', self.start + 300),
+            make_submission(2, 'alice', 'A', 'OK', self.start + 600),
+            make_submission(3, 'alice', 'B', 'OK', self.start + 1800),
+        ]
+        with patch('contest.utils.call_api', side_effect=FakeContestStatus(history)):
+            update_single_contest_task(self.contest)
+        self.participant.refresh_from_db()
+        self.assertEqual(self.participant.problem_status, '+1:+')
+
+        Contest.objects.filter(pk=self.contest.pk).update(end_time=self.contest.start_time + timedelta(minutes=20))
+        with patch('contest.utils.call_api') as call_api:
+            self.assertEqual(rescore_contest(self.contest), "Rescored 1 participants (1 changed)")
+        call_api.assert_not_called()
+
+        self.participant.refresh_from_db()
+        self.assertEqual((self.participant.problem_status, self.participant.total_score, self.participant.penalty),
+                         ('+1:0', 500, 10 + 20))
+        states = {s.problem.index: s for s in ParticipantProblemResult.objects.filter(participant=self.participant)}
+        self.assertEqual((states['B'].solved, states['B'].last_submission_id), (False, 3))
+        stats = {s.problem.index: s for s in ProblemStatistics.objects.filter(contest=self.contest)}
+        self.assertEqual((stats['A'].solved_count, stats['A'].attempt_count, stats['B'].solved_count), (1, 2, 0))
+
+    def test_team_submission_uses_participant_handle(self):
+        """팀 제출은 참가자인 팀원의 핸들로 기록되어 그 참가자에게 반영된다."""
+        team = make_submission(1, 'teammate', 'A', 'OK', self.start + 60)
+        team['author']['members'].append({'handle': 'alice'})
+        with patch('contest.utils.call_api', side_effect=FakeContestStatus([team])):
+            submissions, _ = fetch_contest_new_submissions(self.contest.id, 0, self.start, {'alice'})
+            self.assertEqual(submissions, [(self.start + 60, 1, 'alice', 'A', 'OK')])
+            update_single_contest_task(self.contest)
+
+        self.participant.refresh_from_db()
+        self.assertEqual(self.participant.problem_status, '+:0')
+        self.assertEqual(Submission.objects.get(id=1).handle, 'alice')
@@ -0,0 +1,83 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from datetime import timedelta
+from unittest.mock import patch
+from .locks import run_exclusive
+from .models import Contest
+from .tasks import update_single_contest_task, rescore_contest_task
+
+
+@patch('contest.locks.get_redis', return_value=None)
+class ContestUpdateLockTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_runs_when_lock_is_free(self, _get_redis):
+        self.assertEqual(run_exclusive(1, lambda: "done"), "done")
+
+    def test_overlapping_run_is_skipped_and_coalesced(self, _get_redis):
+        """실행 중에 들어온 요청은 건너뛰고, 끝난 뒤 한 번만 다시 실행한다."""
+        calls = []
+
+        def update():
+            calls.append(len(calls))
+            if len(calls) == 1:
+                # 첫 실행 도중 두 번의 중복 요청
+                self.assertIsNone(run_exclusive(1, update))
+                self.assertIsNone(run_exclusive(1, update))
+            return f"run {len(calls)}"
+
+        self.assertEqual(run_exclusive(1, update), "run 2")
+        self.assertEqual(len(calls), 2)
+
+    def test_non_coalescing_run_leaves_no_pending_request(self, _get_redis):
+        """coalesce=False로 건너뛴 요청(재계산 등)은 락을 가진 쪽의 재실행을 만들지 않는다."""
+        calls = []
+
+        def update():
+            calls.append(len(calls))
+            self.assertIsNone(run_exclusive(1, lambda: "rescore", coalesce=False))
+            return "update"
+
+        self.assertEqual(run_exclusive(1, update), "update")
+        self.assertEqual(len(calls), 1)
+
+    def test_lock_is_per_contest(self, _get_redis):
+        """다른 대회의 갱신은 막지 않는다."""
+        results = []
+
+        def update():
+            results.append(run_exclusive(2, lambda: "other"))
+            return "mine"
+
+        self.assertEqual(run_exclusive(1, update), "mine")
+        self.assertEqual(results, ["other"])
+
+    def test_lock_released_after_error(self, _get_redis):
+        def broken():
+            raise RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            run_exclusive(1, broken)
+        self.assertEqual(run_exclusive(1, lambda: "ok"), "ok")
+
+    def test_update_task_honors_lock(self, _get_redis):
+        """관리 명령과 Celery가 함께 쓰는 update_single_contest_task도 락을 따른다."""
+        now = timezone.now()
+        contest = Contest.objects.create(id=8001, name='Locked', start_time=now, end_time=now + timedelta(hours=1))
+
+        with patch('contest.locks._acquire', return_value=False):
+            self.assertEqual(update_single_contest_task(contest), "Skipped (update already running)")
+
+    def test_rescore_task_reports_failure_when_lock_stays_busy(self, _get_redis):
+        """락이 계속 잡혀 있으면 재시도 후 실패 결과를 돌려준다 (업데이터 재실행 요청은 남기지 않음)."""
+        now = timezone.now()
+        contest = Contest.objects.create(id=8002, name='Busy', start_time=now, end_time=now + timedelta(hours=1))
+
+        with patch('contest.locks._acquire', return_value=False), patch('contest.locks._mark_pending') as mark:
+            result = rescore_contest_task.apply(args=[contest.id]).get()
+
+        self.assertEqual(result, "Busy: Rescore failed (update lock busy)")
+        mark.assert_not_called()
@@ -0,0 +1,268 @@
+import random
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from datetime import timedelta
+from unittest.mock import patch
+from rest_framework.test import APITestCase
+from .models import Contest, Participant
+from .scoreboard import ranked
+from .utils import freeze_scoreboard
+from . import ranking, scoreboard
+
+User = get_user_model()
+
+
+class FakeRedis:
+    """테스트용 sorted set 흉내 (ranking 모듈이 쓰는 명령만)"""
+
+    def __init__(self):
+        self.sets = {}
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+    def exists(self, key):
+        return int(key in self.sets)
+
+    def delete(self, key):
+        self.sets.pop(key, None)
+
+    def expire(self, key, ttl):
+        return key in self.sets
+
+    def zadd(self, key, mapping, nx=False):
+        members = self.sets.setdefault(key, {})
+        for member, score in mapping.items():
+            if not (nx and member in members):
+                members[member] = score
+
+    def zrem(self, key, member):
+        self.sets.get(key, {}).pop(member, None)
+
+    def _sorted(self, key):
+        return sorted(self.sets.get(key, {}).items(), key=lambda item: (item[1], item[0]))
+
+    def zscore(self, key, member):
+        return self.sets.get(key, {}).get(member)
+
+    def zrank(self, key, member):
+        members = [m for m, _ in self._sorted(key)]
+        return members.index(member) if member in members else None
+
+    def zcount(self, key, low, high):
+        assert low == '-inf' and high.startswith('(')
+        return sum(1 for score in self.sets.get(key, {}).values() if score < float(high[1:]))
+
+    def zrange(self, key, start, stop, withscores=False):
+        return [(m.encode(), s) for m, s in self._sorted(key)[start:stop + 1]]
+
+    def zcard(self, key):
+        return len(self.sets.get(key, {}))
+
+
+class FakePipeline:
+
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+        return queue
+
+    def execute(self):
+        return [getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+class RankingTests(TestCase):
+
+    def setUp(self):
+        self.contest = Contest.objects.create(
+            id=8501, name='Ranking Round',
+            start_time=timezone.now() - timedelta(hours=1), end_time=timezone.now() + timedelta(minutes=10),
+        )
+        rng = random.Random(5)
+        self.participants = []
+        for i in range(30):
+            user = User.objects.create(username=f'rank{i}')
+            # 총점/패널티가 같은 참가자가 생기도록 좁은 범위에서 뽑음
+            self.participants.append(Participant.objects.create(
+                contest=self.contest, user=user,
+                total_score=rng.choice([0, 500, 1000]), penalty=rng.choice([0, 10, 20]),
+            ))
+
+    def expected(self):
+        rows = Participant.objects.filter(contest=self.contest).order_by('-total_score', 'penalty', 'id')
+        return ranked([{'id': p.id, 'total_score': p.total_score, 'penalty': p.penalty} for p in rows])
+
+    def assert_matches_table(self):
+        expected = self.expected()
+        self.assertEqual(ranking.window(self.contest.id, 0, len(expected)),
+                         [{'id': row['id'], 'rank': row['rank']} for row in expected])
+        self.assertEqual(ranking.window(self.contest.id, 7, 12),
+                         [{'id': row['id'], 'rank': row['rank']} for row in expected[7:12]])
+        for position, row in enumerate(expected):
+            self.assertEqual(ranking.rank(self.contest.id, row['id']), {'rank': row['rank'], 'position': position})
+        self.assertEqual(ranking.count(self.contest.id), len(expected))
+
+    def test_database_fallback_matches_sorted_table(self):
+        with patch('contest.ranking.get_redis', return_value=None):
+            self.assert_matches_table()
+            self.assertEqual([row['id'] for row in ranking.around(self.contest.id, self.expected()[0]['id'], 2)],
+                             [row['id'] for row in self.expected()[:3]])
+
+    def test_sorted_set_matches_sorted_table(self):
+        fake = FakeRedis()
+        with patch('contest.ranking.get_redis', return_value=fake):
+            self.assert_matches_table()
+
+            # 참가자 테이블을 바꾸지 않고 집합만으로 조회 (SQLite 쿼리 없음)
+            with self.assertNumQueries(0):
+                ranking.top(self.contest.id, 5)
+                ranking.around(self.contest.id, self.participants[3].id, 2)
+
+            # 업데이터가 바꾼 참가자만 반영해도 순위가 맞음
+            changed = self.participants[:4]
+            for p in changed:
+                p.total_score += 1500
+            Participant.objects.bulk_update(changed, ['total_score'])
+            ranking.update(self.contest.id, changed)
+            self.assert_matches_table()
+
+    def test_frozen_twin_keeps_snapshot_order(self):
+        fake = FakeRedis()
+        with patch('contest.ranking.get_redis', return_value=fake):
+            ranking.rank(self.contest.id, self.participants[0].id)
+            freeze_scoreboard(self.contest)
+
+            last = self.expected()[-1]['id']
+            participant = Participant.objects.get(pk=last)
+            participant.total_score = 10000
+            participant.save()
+
+            self.assertEqual(ranking.rank(self.contest.id, last)['rank'], 1)
+            self.assertNotEqual(ranking.rank(self.contest.id, last, frozen=True)['rank'], 1)
+
+    def test_participant_registered_during_freeze_joins_frozen_set(self):
+        fake = FakeRedis()
+        with patch('contest.ranking.get_redis', return_value=fake):
+            freeze_scoreboard(self.contest)
+            late = Participant.objects.create(contest=self.contest, user=User.objects.create(username='late'))
+            late.total_score = 5000
+            late.save()
+
+            self.assertEqual(ranking.count(self.contest.id, frozen=True), 31)
+            frozen_rank = ranking.rank(self.contest.id, late.id, frozen=True)
+            self.assertEqual(ranking.rank(self.contest.id, late.id)['rank'], 1)
+
+        # 프리즈 집합의 순위가 DB의 frozen_* 값으로 계산한 순위와 같음
+        with patch('contest.ranking.get_redis', return_value=None):
+            self.assertEqual(frozen_rank, ranking.rank(self.contest.id, late.id, frozen=True))
+
+    def test_deleted_participant_is_removed(self):
+        fake = FakeRedis()
+        with patch('contest.ranking.get_redis', return_value=fake):
+            ranking.count(self.contest.id)
+            participant_id = self.participants[0].id
+            self.participants[0].delete()
+            self.assertIsNone(ranking.rank(self.contest.id, participant_id))
+            self.assertEqual(ranking.count(self.contest.id), 29)
+
+    def test_deleted_participant_is_removed_from_frozen_set(self):
+        fake = FakeRedis()
+        with patch('contest.ranking.get_redis', return_value=fake):
+            freeze_scoreboard(self.contest)
+            participant_id = self.participants[0].id
+            self.participants[0].delete()
+            self.assertIsNone(ranking.rank(self.contest.id, participant_id, frozen=True))
+            self.assertEqual(ranking.count(self.contest.id, frozen=True), 29)
+
+
+class MyStandingTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.contest = Contest.objects.create(
+            id=8502, name='Standing Round',
+            start_time=timezone.now() - timedelta(hours=2), end_time=timezone.now() + timedelta(minutes=10),
+            freeze_minutes=30,
+        )
+        self.users = [User.objects.create(username=f'standing{i}') for i in range(4)]
+        self.participants = [
+            Participant.objects.create(contest=self.contest, user=user, total_score=score, penalty=10, problem_status='+')
+            for user, score in zip(self.users, [1500, 1000, 1000, 500])
+        ]
+        self.url = f'/api/contests/contests/{self.contest.virtual_id}/me/'
+
+    def test_returns_rank_and_neighbours(self):
+        self.client.force_authenticate(self.users[2])
+        with patch('contest.ranking.get_redis', return_value=None):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['rank'], 2)
+        self.assertEqual(response.data['participant_count'], 4)
+        self.assertEqual(response.data['participant']['user_username'], 'standing2')
+        self.assertEqual((response.data['above']['user_username'], response.data['above']['rank']), ('standing1', 2))
+        self.assertEqual((response.data['below']['user_username'], response.data['below']['rank']), ('standing3', 4))
+
+    def test_top_participant_has_no_above(self):
+        self.client.force_authenticate(self.users[0])
+        with patch('contest.ranking.get_redis', return_value=FakeRedis()):
+            response = self.client.get(self.url)
+        self.assertIsNone(response.data['above'])
+        self.assertEqual(response.data['below']['rank'], 2)
+
+    def test_served_from_rank_index(self):
+        """순위 집합이 있으면 참가자 테이블은 주변 행만 조회한다 (참가자 수와 무관)."""
+        fake = FakeRedis()
+        self.client.force_authenticate(self.users[3])
+        with patch('contest.ranking.get_redis', return_value=fake):
+            self.client.get(self.url)
+            scoreboard.bump_version(self.contest.id)
+            # 대회, 내 참가 ID, 주변 행, 문제, 문제별 결과
+            with self.assertNumQueries(5):
+                response = self.client.get(self.url)
+        self.assertEqual(response.data['rank'], 4)
+
+    def test_unchanged_version_returns_304(self):
+        self.client.force_authenticate(self.users[1])
+        with patch('contest.ranking.get_redis', return_value=None):
+            first = self.client.get(self.url)
+            second = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, 304)
+
+    def test_frozen_standing_hides_live_changes(self):
+        freeze_scoreboard(self.contest)
+        Participant.objects.filter(pk=self.participants[3].pk).update(total_score=3000)
+        scoreboard.bump_version(self.contest.id)
+
+        self.client.force_authenticate(self.users[3])
+        with patch('contest.ranking.get_redis', return_value=None):
+            response = self.client.get(self.url)
+        self.assertTrue(response.data['is_frozen'])
+        self.assertEqual((response.data['rank'], response.data['participant']['total_score']), (4, 500))
+
+    def test_registered_during_freeze(self):
+        """프리즈 중에 등록한 참가자도 프리즈 순위(0점, 맨 아래)로 조회된다."""
+        freeze_scoreboard(self.contest)
+        late = User.objects.create(username='late')
+        fake = FakeRedis()
+        self.client.force_authenticate(late)
+        with patch('contest.ranking.get_redis', return_value=fake):
+            ranking.count(self.contest.id, frozen=True)
+            Participant.objects.create(contest=self.contest, user=late, total_score=2000)
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['is_frozen'])
+        self.assertEqual((response.data['rank'], response.data['participant_count']), (5, 5))
+        self.assertEqual(response.data['above']['user_username'], 'standing3')
+
+    def test_requires_registration(self):
+        outsider = User.objects.create(username='outsider')
+        self.client.force_authenticate(outsider)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
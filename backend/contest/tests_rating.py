@@ -0,0 +1,187 @@
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.test import TestCase, SimpleTestCase
+from django.utils import timezone
+from datetime import timedelta
+from .models import Contest, Participant, RatingHistory
+from .rating_calculator import elo_deltas, pairwise_elo_deltas, rank_wins, apply_contest_rating, replay_ratings
+from user.models import Profile
+
+User = get_user_model()
+
+
+class EloEngineTests(SimpleTestCase):
+
+    def test_matches_pairwise_implementation(self):
+        """벡터 연산 결과가 기존 쌍별 계산과 같다."""
+        rng = np.random.default_rng(42)
+        for n in (2, 3, 50, 300):
+            ratings = np.where(rng.random(n) < 0.3, 1500, rng.normal(1500, 300, n).round()).astype(int)
+
+            vectorized = elo_deltas(ratings)
+            pairwise = pairwise_elo_deltas(ratings.tolist())
+
+            np.testing.assert_allclose(vectorized, pairwise, rtol=0, atol=1e-8)
+            # 실제 저장되는 정수 레이팅도 동일
+            self.assertEqual(
+                [int(r + d) for r, d in zip(ratings, vectorized)],
+                [int(r + d) for r, d in zip(ratings, pairwise)],
+            )
+
+    def test_ties_match_pairwise_draws(self):
+        """같은 순위 그룹은 0.5 승점(무승부)으로 계산한다."""
+        rng = np.random.default_rng(7)
+        ratings = rng.normal(1500, 200, 120).round()
+        # 하위권 다수가 0솔브로 같은 순위
+        ranks = sorted(rng.integers(0, 15, 120))
+
+        np.testing.assert_allclose(
+            elo_deltas(ratings, ranks), pairwise_elo_deltas(ratings.tolist(), ranks), rtol=0, atol=1e-8
+        )
+
+    def test_rank_wins_per_group(self):
+        # 순위: 1등 1명, 2등 공동 2명, 4등 공동 3명
+        self.assertEqual(rank_wins([0, 1, 1, 3, 3, 3]).tolist(), [5, 3.5, 3.5, 1, 1, 1])
+
+    def test_tied_participants_with_equal_ratings_get_equal_change(self):
+        deltas = elo_deltas([1500, 1500, 1500], ranks=[0, 0, 0])
+        self.assertEqual(deltas.tolist(), [0.0, 0.0, 0.0])
+
+    def test_equal_ratings(self):
+        """레이팅이 모두 같으면 1등은 +K/2*(n-1), 꼴등은 -K/2*(n-1)"""
+        deltas = elo_deltas([1500] * 5)
+        self.assertAlmostEqual(deltas[0], 64)
+        self.assertAlmostEqual(deltas[-1], -64)
+        self.assertAlmostEqual(float(deltas.sum()), 0)
+
+
+class ApplyContestRatingTests(TestCase):
+
+    def setUp(self):
+        now = timezone.now()
+        self.contest = Contest.objects.create(
+            id=9001, name='Rated Round', start_time=now - timedelta(hours=3), end_time=now - timedelta(hours=1)
+        )
+        self.participants = []
+        for i, (score, rating) in enumerate([(3000, 1500), (2000, 1600), (1000, 1400)]):
+            user = User.objects.create_user(username=f'rated{i}', password='pw')
+            Profile.objects.create(
+                user=user, school='S', department='D', student_id=f'9{i}', real_name=f'R{i}',
+                codeforces_id=f'rated{i}', elo_rating=rating,
+            )
+            self.participants.append(
+                Participant.objects.create(contest=self.contest, user=user, total_score=score)
+            )
+
+    def test_apply_contest_rating(self):
+        result = apply_contest_rating(self.contest.id)
+        self.assertTrue(result['success'])
+
+        expected = pairwise_elo_deltas([1500, 1600, 1400])
+        for participant, delta, old in zip(self.participants, expected, [1500, 1600, 1400]):
+            participant.user.profile.refresh_from_db()
+            self.assertEqual(participant.user.profile.elo_rating, int(old + delta))
+            history = RatingHistory.objects.get(user=participant.user, contest=self.contest)
+            self.assertEqual(history.rating, int(old + delta))
+
+        self.contest.refresh_from_db()
+        self.assertTrue(self.contest.is_rating_applied)
+
+    def test_tied_standings_are_draws(self):
+        """총점/패널티가 같은 참가자는 서로 무승부로 계산된다."""
+        Participant.objects.filter(pk=self.participants[2].pk).update(total_score=2000)
+        apply_contest_rating(self.contest.id)
+
+        expected = pairwise_elo_deltas([1500, 1600, 1400], [0, 1, 1])
+        for participant, delta, old in zip(self.participants, expected, [1500, 1600, 1400]):
+            participant.user.profile.refresh_from_db()
+            self.assertEqual(participant.user.profile.elo_rating, int(old + delta))
+
+    def test_apply_twice_is_rejected(self):
+        apply_contest_rating(self.contest.id)
+        result = apply_contest_rating(self.contest.id)
+        self.assertFalse(result['success'])
+        self.assertEqual(RatingHistory.objects.filter(contest=self.contest).count(), 3)
+
+    def test_not_enough_participants_keeps_contest_unrated(self):
+        """참가자가 부족하면 선점했던 반영 플래그도 롤백된다."""
+        Participant.objects.filter(pk__in=[p.pk for p in self.participants[1:]]).delete()
+        result = apply_contest_rating(self.contest.id)
+        self.assertFalse(result['success'])
+
+        self.contest.refresh_from_db()
+        self.assertFalse(self.contest.is_rating_applied)
+        self.assertFalse(RatingHistory.objects.filter(contest=self.contest).exists())
+
+    def test_uses_few_queries(self):
+        """참가자 수와 무관하게 일괄 쓰기로 처리된다."""
+        # 대회 조회, 선점 UPDATE, 참가자 조회, bulk_update, bulk_create (+ SAVEPOINT 2)
+        with self.assertNumQueries(7):
+            apply_contest_rating(self.contest.id)
+
+    def test_reports_progress_by_phase(self):
+        events = []
+        apply_contest_rating(self.contest.id, progress=lambda phase, done, total: events.append((phase, done, total)))
+        self.assertEqual(events, [('loading', 0, 0), ('computing', 0, 3), ('writing', 3, 3)])
+
+
+class ReplayRatingsTests(TestCase):
+
+    def setUp(self):
+        now = timezone.now()
+        self.first = Contest.objects.create(
+            id=9101, name='Round 1', start_time=now - timedelta(days=2, hours=2), end_time=now - timedelta(days=2)
+        )
+        self.second = Contest.objects.create(
+            id=9102, name='Round 2', start_time=now - timedelta(days=1, hours=2), end_time=now - timedelta(days=1)
+        )
+        self.users = []
+        for i in range(4):
+            user = User.objects.create_user(username=f'replay{i}', password='pw')
+            Profile.objects.create(
+                user=user, school='S', department='D', student_id=f'91{i}', real_name=f'P{i}', codeforces_id=f'replay{i}'
+            )
+            self.users.append(user)
+
+        for user, score in zip(self.users[:3], [3000, 2000, 1000]):
+            Participant.objects.create(contest=self.first, user=user, total_score=score)
+        for user, score in zip(self.users[1:], [1000, 2000, 3000]):
+            Participant.objects.create(contest=self.second, user=user, total_score=score)
+
+    def snapshot(self):
+        ratings = dict(Profile.objects.values_list('user_id', 'elo_rating'))
+        history = sorted(RatingHistory.objects.values_list('user_id', 'contest_id', 'rating', 'rating_change'))
+        return ratings, history
+
+    def test_replay_matches_sequential_application(self):
+        """순서대로 반영한 결과와 전체 재계산 결과가 같다."""
+        apply_contest_rating(self.first.id)
+        apply_contest_rating(self.second.id)
+        applied = self.snapshot()
+        created_at = dict(RatingHistory.objects.values_list('id', 'created_at'))
+
+        replay_ratings()
+
+        self.assertEqual(self.snapshot(), applied)
+        # 기존 기록은 갱신만 되고 생성일은 유지
+        self.assertEqual(dict(RatingHistory.objects.values_list('id', 'created_at')), created_at)
+
+    def test_replay_after_unapplying_old_contest(self):
+        """과거 대회 반영을 취소하면 이후 대회가 그 대회 없이 다시 계산된다."""
+        apply_contest_rating(self.first.id)
+        apply_contest_rating(self.second.id)
+
+        Contest.objects.filter(id=self.first.id).update(is_rating_applied=False)
+        with self.assertNumQueries(9):
+            replay_ratings()
+        replayed = self.snapshot()
+
+        # 두 번째 대회만 처음부터 반영한 것과 같아야 함
+        RatingHistory.objects.all().delete()
+        Profile.objects.update(elo_rating=1500)
+        Contest.objects.filter(id=self.second.id).update(is_rating_applied=False)
+        apply_contest_rating(self.second.id)
+
+        self.assertEqual(replayed, self.snapshot())
+        self.assertFalse(RatingHistory.objects.filter(contest=self.first).exists())
+        self.assertEqual(Profile.objects.get(user=self.users[0]).elo_rating, 1500)
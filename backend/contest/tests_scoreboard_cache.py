@@ -0,0 +1,245 @@
+from importlib import import_module
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils import timezone
+from datetime import timedelta
+from unittest.mock import patch
+from rest_framework.test import APITestCase
+from .models import Contest, Participant, ParticipantProblemResult, Problem, ProblemStatistics
+from .tasks import refresh_scoreboard_cache
+from .utils import freeze_scoreboard
+from . import scoreboard
+
+User = get_user_model()
+
+
+class ScoreboardCacheTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.contest = Contest.objects.create(
+            id=8101,
+            name='Cached Round',
+            start_time=timezone.now() - timedelta(hours=2),
+            end_time=timezone.now() + timedelta(minutes=10),
+            freeze_minutes=30,
+        )
+        self.participants = []
+        for i, score in enumerate([500, 1000]):
+            user = User.objects.create_user(username=f'cached{i}', password='pw')
+            self.participants.append(
+                Participant.objects.create(contest=self.contest, user=user, total_score=score, problem_status='+')
+            )
+        self.url = f'/api/contests/contests/{self.contest.virtual_id}/scoreboard/'
+
+    def test_repeated_requests_skip_participant_query(self):
+        """두 번째 요청부터는 참가자를 다시 조회하지 않는다."""
+        first = self.client.get(self.url)
+        # 대회 조회 1회만 실행
+        with self.assertNumQueries(1):
+            second = self.client.get(self.url)
+        self.assertEqual(first.data, second.data)
+
+    def test_participant_change_invalidates_cache(self):
+        self.client.get(self.url)
+        self.participants[0].total_score = 2000
+        self.participants[0].save()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['participants'][0]['total_score'], 2000)
+
+    def test_frozen_variant_uses_snapshot_order(self):
+        """프리즈 중 일반 사용자에게는 스냅샷 점수 기준 순위를 보여준다."""
+        freeze_scoreboard(self.contest)
+        Participant.objects.filter(pk=self.participants[0].pk).update(total_score=3000)
+        scoreboard.bump_version(self.contest.id)
+
+        public = self.client.get(self.url)
+        self.assertTrue(public.data['is_frozen'])
+        self.assertEqual([row['total_score'] for row in public.data['participants']], [1000, 500])
+
+        admin = User.objects.create_superuser(username='admin', password='pw')
+        self.client.force_authenticate(admin)
+        live = self.client.get(self.url)
+        self.assertEqual([row['total_score'] for row in live.data['participants']], [3000, 1000])
+
+    def test_concurrent_miss_waits_for_builder(self):
+        """다른 요청이 만드는 중이면 DB를 조회하지 않고 완성된 결과를 기다린다."""
+        version = scoreboard.get_version(self.contest.id)
+        cache.add(scoreboard._build_lock_key(self.contest.id, version, scoreboard.LIVE), 1)
+        built = [{'id': 1}]
+
+        def finish_build(_seconds):
+            cache.set(scoreboard._rows_key(self.contest.id, version, scoreboard.LIVE), built)
+
+        with patch('contest.scoreboard.time.sleep', side_effect=finish_build), \
+                patch('contest.scoreboard.build_rows') as build_rows:
+            rows = scoreboard.get_rows(self.contest, scoreboard.LIVE)
+
+        self.assertEqual(rows, built)
+        build_rows.assert_not_called()
+
+    def test_since_returns_only_changed_rows(self):
+        """?since=로 이전 버전을 주면 바뀐 행과 순위 변화만 돌려준다."""
+        first = self.client.get(self.url)
+        self.assertTrue(first.data['full'])
+
+        Participant.objects.filter(pk=self.participants[0].pk).update(total_score=1500)
+        refresh_scoreboard_cache(self.contest)
+
+        response = self.client.get(self.url, {'since': first.data['version']})
+        self.assertFalse(response.data['full'])
+        self.assertNotIn('participants', response.data)
+        self.assertEqual(
+            [(row['id'], row['rank']) for row in response.data['changed']],
+            [(self.participants[0].id, 1), (self.participants[1].id, 2)],
+        )
+        self.assertEqual(response.data['removed'], [])
+
+        unchanged = self.client.get(self.url, {'since': response.data['version']})
+        self.assertEqual(unchanged.data['changed'], [])
+
+    def test_unknown_since_falls_back_to_full_board(self):
+        response = self.client.get(self.url, {'since': 'expired-version'})
+        self.assertTrue(response.data['full'])
+        self.assertEqual(len(response.data['participants']), 2)
+
+
+class ScoreboardProblemResultsTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.contest = Contest.objects.create(
+            id=8102,
+            name='Normalized Round',
+            start_time=timezone.now() - timedelta(hours=2),
+            end_time=timezone.now() + timedelta(minutes=10),
+            freeze_minutes=30,
+        )
+        self.problems = [
+            Problem.objects.create(contest=self.contest, index=index, name=index, points=500)
+            for index in ['A', 'B']
+        ]
+        self.url = f'/api/contests/contests/{self.contest.virtual_id}/scoreboard/'
+
+    def add_participant(self, name, attempts):
+        user = User.objects.create_user(username=name, password='pw')
+        participant = Participant.objects.create(
+            contest=self.contest, user=user, total_score=500, problem_status=f'+{attempts}:0'
+        )
+        ParticipantProblemResult.objects.create(
+            participant=participant, contest=self.contest, problem=self.problems[0],
+            solved=True, attempts=attempts, accepted_at=self.contest.start_time + timedelta(minutes=5),
+        )
+        return participant
+
+    def test_rows_include_problem_results(self):
+        self.add_participant('normal0', 2)
+
+        row = self.client.get(self.url).data['participants'][0]
+        self.assertEqual([(r['index'], r['solved'], r['attempts']) for r in row['problem_results']],
+                         [('A', True, 2), ('B', False, 0)])
+
+    def test_query_count_does_not_grow_with_participants(self):
+        """문제별 결과는 참가자 수와 관계없이 한 번에 조회한다."""
+        self.add_participant('normal0', 0)
+        # 문제, 참가자(사용자/대회 조인), 문제별 결과 각 1회
+        with self.assertNumQueries(3):
+            scoreboard.build_rows(self.contest, scoreboard.LIVE)
+
+        for i in range(1, 6):
+            self.add_participant(f'normal{i}', i)
+        with self.assertNumQueries(3):
+            scoreboard.build_rows(self.contest, scoreboard.LIVE)
+
+    def test_frozen_rows_use_snapshot(self):
+        """프리즈 중 일반 사용자에게는 프리즈 이후의 문제별 결과가 보이지 않는다."""
+        participant = self.add_participant('normal0', 0)
+        freeze_scoreboard(self.contest)
+        ParticipantProblemResult.objects.create(
+            participant=participant, contest=self.contest, problem=self.problems[1], solved=True,
+            accepted_at=timezone.now(),
+        )
+        scoreboard.bump_version(self.contest.id)
+
+        row = self.client.get(self.url).data['participants'][0]
+        self.assertEqual([(r['index'], r['solved'], r['accepted_at']) for r in row['problem_results']],
+                         [('A', True, None), ('B', False, None)])
+
+    def test_backfill_from_problem_status(self):
+        """문제별 상태가 없는 기존 참가자는 마이그레이션이 풀이 현황 문자열로 채운다."""
+        backfill = import_module('contest.migrations.0020_backfill_problem_results').backfill_problem_results
+        self.add_participant('normal0', 1)
+        user = User.objects.create(username='legacy')
+        Participant.objects.create(contest=self.contest, user=user, total_score=1000, problem_status='+:-2')
+
+        backfill(apps, None)
+
+        rows = {r['user_username']: r['problem_results'] for r in self.client.get(self.url).data['participants']}
+        self.assertEqual([(r['index'], r['solved'], r['attempts']) for r in rows['legacy']],
+                         [('A', True, 0), ('B', False, 2)])
+        # 이미 상태가 있는 참가자는 그대로
+        self.assertEqual(ParticipantProblemResult.objects.filter(participant__user__username='normal0').count(), 1)
+
+    def test_problem_stats_header(self):
+        """스코어보드 응답에 미리 집계된 문제별 통계가 포함되고, 프리즈 중에는 스냅샷 통계를 보여준다."""
+        participant = self.add_participant('normal0', 1)
+        ProblemStatistics.objects.create(
+            contest=self.contest, problem=self.problems[0], solved_count=1, tried_count=1, attempt_count=2,
+            first_solver=participant, first_solved_at=self.contest.start_time + timedelta(minutes=5),
+        )
+        freeze_scoreboard(self.contest)
+        ProblemStatistics.objects.filter(problem=self.problems[0]).update(solved_count=2, tried_count=2)
+        scoreboard.bump_version(self.contest.id)
+
+        public = self.client.get(self.url).data['problem_stats']
+        self.assertEqual([(s['index'], s['solved_count'], s['first_solver']) for s in public],
+                         [('A', 1, 'normal0'), ('B', 0, None)])
+
+        self.client.force_authenticate(User.objects.create_superuser(username='admin', password='pw'))
+        live = self.client.get(self.url).data['problem_stats']
+        self.assertEqual([(s['solved_count'], s['tried_count']) for s in live], [(2, 2), (0, 0)])
+
+
+@patch('contest.ranking.get_redis', return_value=None)
+class ScoreboardWindowTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.contest = Contest.objects.create(
+            id=8103,
+            name='Window Round',
+            start_time=timezone.now() - timedelta(hours=2),
+            end_time=timezone.now() + timedelta(minutes=10),
+        )
+        for i in range(10):
+            user = User.objects.create(username=f'window{i}')
+            Participant.objects.create(contest=self.contest, user=user, total_score=1000 - i * 100)
+        self.url = f'/api/contests/contests/{self.contest.virtual_id}/scoreboard/'
+
+    def test_offset_limit_window(self, _get_redis):
+        response = self.client.get(self.url, {'offset': 3, 'limit': 4})
+        self.assertEqual((response.data['offset'], response.data['limit'], response.data['total']), (3, 4, 10))
+        self.assertEqual([(row['user_username'], row['rank']) for row in response.data['participants']],
+                         [('window3', 4), ('window4', 5), ('window5', 6), ('window6', 7)])
+        self.assertIn('problem_stats', response.data)
+
+    def test_around_user_centers_window(self, _get_redis):
+        response = self.client.get(self.url, {'around': 'window8', 'limit': 3})
+        self.assertEqual([row['user_username'] for row in response.data['participants']],
+                         ['window7', 'window8', 'window9'])
+
+        missing = self.client.get(self.url, {'around': 'nobody'})
+        self.assertEqual(missing.status_code, 404)
+
+    def test_windows_have_separate_etags(self, _get_redis):
+        first = self.client.get(self.url, {'offset': 0, 'limit': 2})
+        same = self.client.get(self.url, {'offset': 0, 'limit': 2}, HTTP_IF_NONE_MATCH=first['ETag'])
+        other = self.client.get(self.url, {'offset': 2, 'limit': 2}, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(same.status_code, 304)
+        self.assertEqual(other.status_code, 200)
+
+    def test_invalid_window_params(self, _get_redis):
+        self.assertEqual(self.client.get(self.url, {'limit': 'x'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'limit': 0}).status_code, 400)
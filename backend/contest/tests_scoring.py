@@ -0,0 +1,164 @@
+import random
+import numpy as np
+from datetime import datetime, timedelta, timezone as datetime_timezone
+from django.test import SimpleTestCase
+from .models import Contest, Participant, Problem
+from .scoring import (
+    ScoringContext, apply_submissions, batch_summaries, new_state, new_statistics, score_batch, snapshot, summarize,
+    update_statistics,
+)
+from .utils import calculate_participant_stats, to_submission_record
+
+START = datetime(2026, 1, 1, 12, 0, tzinfo=datetime_timezone.utc)
+END = START + timedelta(hours=2)
+VERDICTS = ['OK', 'WRONG_ANSWER', 'TIME_LIMIT_EXCEEDED', 'COMPILATION_ERROR']
+
+
+def random_submissions(rng, count, indexes):
+    start = int(START.timestamp())
+    # 대회 시작 전/종료 후 제출도 섞음
+    times = sorted(rng.randint(start - 600, start + 3 * 3600) for _ in range(count))
+    return [
+        {
+            'id': sub_id,
+            'creationTimeSeconds': created,
+            'problem': {'index': rng.choice(indexes)},
+            'verdict': rng.choice(VERDICTS),
+        }
+        for sub_id, created in enumerate(times, start=1)
+    ]
+
+
+def records(submissions):
+    """업데이터 입력 형식(시간순 SubmissionRecord)으로 변환"""
+    return sorted(to_submission_record(sub) for sub in submissions)
+
+
+def split_batches(rng, submissions):
+    batches = []
+    position = 0
+    while position < len(submissions):
+        size = rng.randint(1, 8)
+        batches.append(submissions[position:position + size])
+        position += size
+    return batches
+
+
+class ScoringEquivalenceTests(SimpleTestCase):
+
+    def setUp(self):
+        self.problems = [
+            Problem(id=i, index=index, points=points)
+            for i, (index, points) in enumerate([('A', 500), ('B', 1000), ('C', 1500), ('D', 2000)], start=1)
+        ]
+        self.participant = Participant(id=1)
+        self.context = ScoringContext(self.problems, START, END)
+
+    def empty_states(self):
+        return {p.index: new_state(self.participant, p) for p in self.problems}
+
+    def test_incremental_events_match_full_recomputation(self):
+        """새 제출을 나눠서 이벤트로 적용한 결과가 전체 재계산과 같다."""
+        rng = random.Random(1234)
+        indexes = [p.index for p in self.problems]
+        for _ in range(200):
+            submissions = random_submissions(rng, rng.randint(0, 40), indexes)
+            expected = calculate_participant_stats(submissions, self.problems, START, END)
+            # 대회마다 한 번 만든 컨텍스트를 넘겨도 결과가 같다
+            self.assertEqual(calculate_participant_stats(submissions, self.context), expected)
+
+            states = self.empty_states()
+            for batch in split_batches(rng, submissions):
+                apply_submissions(states, records(batch), self.context)
+
+            self.assertEqual(summarize(states, self.context), expected)
+
+    def test_replayed_submissions_are_ignored(self):
+        """이미 반영한 제출이 다시 들어와도 상태가 바뀌지 않는다."""
+        submissions = [
+            {'id': 1, 'creationTimeSeconds': int(START.timestamp()) + 60, 'problem': {'index': 'A'}, 'verdict': 'WRONG_ANSWER'},
+            {'id': 2, 'creationTimeSeconds': int(START.timestamp()) + 600, 'problem': {'index': 'A'}, 'verdict': 'OK'},
+        ]
+        states = self.empty_states()
+        self.assertEqual(len(apply_submissions(states, records(submissions), self.context)), 1)
+        self.assertEqual(apply_submissions(states, records(submissions), self.context), [])
+
+        self.assertEqual(summarize(states, self.context)['penalty'], 10 + 20)
+
+
+class ProblemStatisticsTests(SimpleTestCase):
+
+    def setUp(self):
+        self.contest = Contest(id=1)
+        self.problems = [Problem(id=i, index=index, points=500) for i, index in enumerate('ABC', start=1)]
+        self.participants = [Participant(id=i) for i in range(1, 6)]
+        self.context = ScoringContext(self.problems, START, END)
+
+    def test_incremental_statistics_match_final_states(self):
+        """제출을 나눠서 반영하며 증분으로 갱신한 통계가 최종 상태를 집계한 값과 같다."""
+        rng = random.Random(7)
+        indexes = [p.index for p in self.problems]
+        for _ in range(50):
+            statistics = {p.id: new_statistics(self.contest, p) for p in self.problems}
+            states = {pt.id: {p.index: new_state(pt, p) for p in self.problems} for pt in self.participants}
+            submissions = {pt.id: random_submissions(rng, rng.randint(0, 20), indexes) for pt in self.participants}
+            batches = {pt_id: split_batches(rng, subs) for pt_id, subs in submissions.items()}
+
+            for round_number in range(max([len(b) for b in batches.values()], default=0)):
+                for pt_id, participant_batches in batches.items():
+                    if round_number >= len(participant_batches):
+                        continue
+                    before = {id(state): snapshot(state) for state in states[pt_id].values()}
+                    for state in apply_submissions(states[pt_id], records(participant_batches[round_number]), self.context):
+                        update_statistics(statistics[state.problem_id], state, before[id(state)])
+
+            for p in self.problems:
+                finals = [states[pt.id][p.index] for pt in self.participants]
+                solved = [s for s in finals if s.solved]
+                stats = statistics[p.id]
+                self.assertEqual(stats.solved_count, len(solved))
+                self.assertEqual(stats.tried_count, sum(1 for s in finals if s.solved or s.attempts))
+                self.assertEqual(stats.attempt_count, sum(s.attempts + s.solved for s in finals))
+                self.assertEqual(stats.first_solved_at, min((s.accepted_at for s in solved), default=None))
+
+
+class BatchScoringTests(SimpleTestCase):
+
+    def setUp(self):
+        self.problems = [
+            Problem(id=i, index=index, points=points)
+            for i, (index, points) in enumerate([('A', 500), ('B', 1000), ('C', 1500)], start=1)
+        ]
+        self.handles = [f'h{i}' for i in range(8)]
+        self.context = ScoringContext(self.problems, START, END)
+
+    def columns(self, submissions):
+        handle_position = {handle: i for i, handle in enumerate(self.handles)}
+        index_position = {p.index: i for i, p in enumerate(self.problems)}
+        return {
+            'ids': np.asarray([s['id'] for s in submissions], dtype=np.int64),
+            'participant': np.asarray([handle_position.get(s['handle'], -1) for s in submissions], dtype=np.int64),
+            'problem': np.asarray([index_position.get(s['problem']['index'], -1) for s in submissions], dtype=np.int64),
+            'time': np.asarray([s['creationTimeSeconds'] for s in submissions], dtype=np.float64),
+            'accepted': np.asarray([s['verdict'] == 'OK' for s in submissions], dtype=bool),
+        }
+
+    def test_batch_matches_per_participant_calculation(self):
+        """한 번에 계산한 결과가 참가자마다 calculate_participant_stats를 호출한 결과와 같다."""
+        rng = random.Random(2024)
+        for _ in range(50):
+            submissions = random_submissions(rng, rng.randint(0, 120), ['A', 'B', 'C', 'Z'])
+            for sub in submissions:
+                sub['handle'] = rng.choice(self.handles + ['stranger'])
+
+            result = score_batch(self.columns(submissions), self.context, len(self.handles))
+
+            expected = [
+                calculate_participant_stats([s for s in submissions if s['handle'] == handle], self.problems, START, END)
+                for handle in self.handles
+            ]
+            self.assertEqual(batch_summaries(result), expected)
+
+    def test_empty_submissions(self):
+        result = score_batch(self.columns([]), self.context, 2)
+        self.assertEqual(batch_summaries(result), [{'problem_status': '0:0:0', 'total_score': 0.0, 'penalty': 0}] * 2)
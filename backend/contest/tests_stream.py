@@ -0,0 +1,145 @@
+import json
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, SimpleTestCase
+from django.utils import timezone
+from datetime import timedelta
+from unittest.mock import patch, MagicMock
+from .models import Contest, Participant
+from .scoreboard import diff_rows, ranked
+from .streams import build_message, event_stream
+from .tasks import refresh_scoreboard_cache
+from .utils import freeze_scoreboard
+
+User = get_user_model()
+
+
+def row(pid, score, penalty=0, status=''):
+    return {'id': pid, 'user_username': f'u{pid}', 'problem_status': status, 'total_score': score, 'penalty': penalty}
+
+
+async def fake_messages(*messages):
+    for message in messages:
+        yield message
+
+
+class ScoreboardDiffTests(SimpleTestCase):
+
+    def test_ranked_shares_rank_on_ties(self):
+        rows = ranked([row(1, 1000), row(2, 500, 10), row(3, 500, 10), row(4, 0)])
+        self.assertEqual([r['rank'] for r in rows], [1, 2, 2, 4])
+
+    def test_diff_contains_only_changed_rows(self):
+        """점수가 바뀐 행과 그로 인해 순위가 바뀐 행만 포함된다."""
+        old = [row(1, 1000), row(2, 500), row(3, 0)]
+        new = [row(2, 1500, 20, '+'), row(1, 1000), row(3, 0)]
+
+        delta = diff_rows(old, new)
+        self.assertEqual([(r['id'], r['rank']) for r in delta['changed']], [(2, 1), (1, 2)])
+        self.assertEqual(delta['removed'], [])
+
+    def test_public_delta_respects_freeze(self):
+        """프리즈 중에는 실시간 변경이 일반 사용자 쪽 메시지에 포함되지 않는다."""
+        frozen = [row(1, 1000), row(2, 500)]
+        previous = {'live': frozen, 'public': frozen}
+        current = {'live': [row(2, 1500), row(1, 1000)], 'public': frozen}
+
+        message = build_message('v2', True, previous, current)
+        self.assertEqual(len(message['live']['changed']), 2)
+        self.assertEqual(message['public']['changed'], [])
+
+
+class EventStreamTests(SimpleTestCase):
+
+    async def collect(self, is_admin, *messages):
+        return [chunk async for chunk in event_stream(None, is_admin, fake_messages(*messages))]
+
+    async def test_sends_only_audience_changes(self):
+        message = build_message(
+            'v2', True,
+            {'live': [row(1, 0)], 'public': [row(1, 0)]},
+            {'live': [row(1, 500)], 'public': [row(1, 0)]},
+        )
+
+        public = await self.collect(False, message, None)
+        self.assertEqual(public, ['retry: 3000\n\n', ': keep-alive\n\n'])
+
+        admin = await self.collect(True, message)
+        self.assertTrue(admin[1].startswith('event: delta\n'))
+        data = json.loads(admin[1].split('data: ', 1)[1])
+        self.assertEqual(data['changed'][0]['total_score'], 500)
+        self.assertTrue(data['is_frozen'])
+
+
+@patch('contest.locks.get_redis', return_value=None)
+class ScoreboardPublishTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.contest = Contest.objects.create(
+            id=8301, name='Stream Round',
+            start_time=timezone.now() - timedelta(hours=1), end_time=timezone.now() + timedelta(minutes=10),
+        )
+        users = [User.objects.create_user(username=f'stream{i}', password='pw') for i in range(2)]
+        self.participants = [
+            Participant.objects.create(contest=self.contest, user=user, total_score=score)
+            for user, score in zip(users, [500, 0])
+        ]
+
+    def publish_after(self, change):
+        redis_client = MagicMock()
+        with patch('contest.streams.get_redis', return_value=redis_client):
+            refresh_scoreboard_cache(self.contest)
+            change()
+            refresh_scoreboard_cache(self.contest)
+        channel, payload = redis_client.publish.call_args.args
+        self.assertEqual(channel, f"scoreboard:events:{self.contest.id}")
+        return json.loads(payload)
+
+    def test_publishes_changed_rows_once_per_update(self, _get_redis):
+        def solve():
+            Participant.objects.filter(pk=self.participants[1].pk).update(total_score=1000, penalty=5)
+
+        message = self.publish_after(solve)
+        self.assertFalse(message['is_frozen'])
+        self.assertEqual([(r['id'], r['rank']) for r in message['public']['changed']],
+                         [(self.participants[1].id, 1), (self.participants[0].id, 2)])
+
+    def test_frozen_updates_hide_live_changes_from_public(self, _get_redis):
+        freeze_scoreboard(self.contest)
+
+        def solve():
+            Participant.objects.filter(pk=self.participants[1].pk).update(total_score=1000)
+
+        message = self.publish_after(solve)
+        self.assertTrue(message['is_frozen'])
+        self.assertEqual(message['public']['changed'], [])
+        self.assertEqual(len(message['live']['changed']), 2)
+
+
+class ScoreboardStreamViewTests(TestCase):
+
+    def setUp(self):
+        self.contest = Contest.objects.create(
+            id=8302, name='Stream View',
+            start_time=timezone.now() + timedelta(hours=1), end_time=timezone.now() + timedelta(hours=3),
+        )
+        self.url = f'/api/contests/contests/{self.contest.virtual_id}/scoreboard/stream/'
+
+    async def test_rejected_before_start(self):
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response.status_code, 403)
+
+    async def test_streams_events(self):
+        await Contest.objects.filter(pk=self.contest.pk).aupdate(start_time=timezone.now() - timedelta(hours=1))
+
+        async def finite_stream(contest, is_admin):
+            yield 'retry: 3000\n\n'
+
+        with patch('contest.views.streams.event_stream', side_effect=finite_stream):
+            response = await self.async_client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        body = b''.join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(body, b'retry: 3000\n\n')
@@ -0,0 +1,191 @@
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from datetime import timedelta
+from unittest.mock import patch, MagicMock
+from rest_framework.test import APITestCase
+from main.celery import app
+from .models import Contest, Participant, RatingHistory
+from .rating_calculator import apply_contest_rating, replay_ratings
+from .tasks import (
+    update_active_contests_task, update_contest_task, summarize_contest_updates,
+    start_rating_job, get_rating_job_status, unapply_contest_ratings, RATING_JOB_TTL, _rating_job_key,
+)
+from .locks import claim_job
+from user.models import Profile
+
+User = get_user_model()
+
+
+class UpdateActiveContestsTaskTests(TestCase):
+
+    def setUp(self):
+        now = timezone.now()
+        self.running = [
+            Contest.objects.create(id=7001, name='Round A', start_time=now - timedelta(hours=1), end_time=now + timedelta(hours=1)),
+            Contest.objects.create(id=7002, name='Round B', start_time=now - timedelta(hours=1), end_time=now + timedelta(hours=1)),
+        ]
+        Contest.objects.create(id=7003, name='Finished', start_time=now - timedelta(days=1), end_time=now - timedelta(hours=20))
+
+        # 브로커 없이 chord를 즉시 실행
+        app.conf.task_always_eager = True
+        self.addCleanup(setattr, app.conf, 'task_always_eager', False)
+
+    def test_no_active_contests(self):
+        Contest.objects.filter(id__in=[7001, 7002]).delete()
+        self.assertEqual(update_active_contests_task(), "No active contests")
+
+    @patch('contest.tasks.update_single_contest_task', return_value="Updated 0 participants")
+    def test_dispatches_one_subtask_per_active_contest(self, update_single):
+        """진행 중인 대회마다 서브태스크가 하나씩 실행된다."""
+        result = update_active_contests_task()
+
+        updated_ids = sorted(call.args[0].id for call in update_single.call_args_list)
+        self.assertEqual(updated_ids, [7001, 7002])
+        self.assertIn("Dispatched 2 contest updates", result)
+
+    def test_summary_joins_subtask_results(self):
+        """chord 콜백이 대회별 결과를 기존 형식의 요약 문자열로 합친다."""
+        summary = summarize_contest_updates([
+            {'contest': 'Round A', 'result': "Updated 1 participants", 'failed': False},
+            {'contest': 'Round B', 'result': "No new submissions", 'failed': False},
+        ])
+        self.assertEqual(summary, "Round A: Updated 1 participants\nRound B: No new submissions")
+
+    def test_failed_subtask_still_produces_summary(self):
+        """한 대회의 갱신이 예외로 끝나도 요약은 만들어지고 실패한 대회를 보고한다."""
+        def update(contest):
+            if contest.id == 7001:
+                raise RuntimeError("boom")
+            return "Updated 1 participants"
+
+        with patch('contest.tasks.update_single_contest_task', side_effect=update), \
+                self.assertLogs('contest.tasks', level='ERROR'):
+            records = [update_contest_task(7001), update_contest_task(7002)]
+            # chord 전체도 예외 없이 끝남
+            self.assertIn("Dispatched 2 contest updates", update_active_contests_task())
+
+        summary = summarize_contest_updates(records)
+        self.assertIn("Round A: Failed (RuntimeError: boom)", summary)
+        self.assertIn("Round B: Updated 1 participants", summary)
+        self.assertTrue(summary.endswith("Failed 1 contests: Round A"))
+
+
+@patch('contest.locks.get_redis', return_value=None)
+class RatingJobTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        now = timezone.now()
+        self.contest = Contest.objects.create(
+            id=7101, name='Rated Round', start_time=now - timedelta(hours=3), end_time=now - timedelta(hours=1)
+        )
+        for i, score in enumerate([3000, 2000, 1000]):
+            user = User.objects.create_user(username=f'job{i}', password='pw')
+            Profile.objects.create(
+                user=user, school='S', department='D', student_id=f'71{i}', real_name=f'J{i}', codeforces_id=f'job{i}'
+            )
+            Participant.objects.create(contest=self.contest, user=user, total_score=score)
+
+        self.admin = User.objects.create_superuser(username='admin', password='pw')
+        app.conf.task_always_eager = True
+        self.addCleanup(setattr, app.conf, 'task_always_eager', False)
+
+    def test_duplicate_requests_share_one_job(self, _get_redis):
+        """같은 대회에 대한 재요청은 기존 작업 ID를 돌려주고 한 번만 반영한다."""
+        with patch('contest.tasks.apply_contest_rating', wraps=apply_contest_rating) as apply:
+            job_id, created = start_rating_job(self.contest.id)
+            again_id, again_created = start_rating_job(self.contest.id)
+
+        self.assertTrue(created)
+        self.assertFalse(again_created)
+        self.assertEqual(job_id, again_id)
+        apply.assert_called_once()
+        self.assertEqual(RatingHistory.objects.filter(contest=self.contest).count(), 3)
+
+    def test_failed_job_can_be_resubmitted(self, _get_redis):
+        """반영에 실패하면 멱등 키가 풀려 다시 접수할 수 있다."""
+        Participant.objects.filter(contest=self.contest).exclude(user__username='job0').delete()
+        first_id, _ = start_rating_job(self.contest.id)
+        second_id, created = start_rating_job(self.contest.id)
+
+        self.assertTrue(created)
+        self.assertNotEqual(first_id, second_id)
+
+    def test_dispatch_failure_releases_job_key(self, _get_redis):
+        """작업 접수(apply_async)에 실패하면 멱등 키가 풀려 다시 접수할 수 있다."""
+        with patch('contest.tasks.apply_contest_rating_task.apply_async', side_effect=ConnectionError('broker down')):
+            with self.assertRaises(ConnectionError):
+                start_rating_job(self.contest.id)
+
+        job_id, created = start_rating_job(self.contest.id)
+        self.assertTrue(created)
+        self.contest.refresh_from_db()
+        self.assertTrue(self.contest.is_rating_applied)
+
+    def test_reverted_contest_can_be_reapplied(self, _get_redis):
+        """반영을 취소하면 멱등 키도 풀려 바로 다시 반영할 수 있다."""
+        first_id, _ = start_rating_job(self.contest.id)
+        self.assertEqual(unapply_contest_ratings([self.contest.id]), 1)
+
+        second_id, created = start_rating_job(self.contest.id)
+        self.assertTrue(created)
+        self.assertNotEqual(first_id, second_id)
+        self.contest.refresh_from_db()
+        self.assertTrue(self.contest.is_rating_applied)
+
+    def test_replay_refuses_while_rating_job_is_running(self, _get_redis):
+        """반영 중인 작업이 있으면 재계산 명령은 레이팅 기록을 건드리지 않는다."""
+        claim_job(_rating_job_key(self.contest.id), 'running-job', RATING_JOB_TTL)
+        out = StringIO()
+        with patch('contest.tasks.replay_ratings') as replay:
+            call_command('replay_ratings', stdout=out)
+
+        replay.assert_not_called()
+        self.assertIn("Rating job in progress", out.getvalue())
+
+    def test_replay_holds_rating_job_keys(self, _get_redis):
+        """재계산 중에는 새 반영 작업이 접수되지 않고, 끝나면 다시 접수할 수 있다."""
+        started = []
+
+        def replay():
+            started.append(start_rating_job(self.contest.id))
+            return replay_ratings()
+
+        out = StringIO()
+        with patch('contest.tasks.replay_ratings', side_effect=replay):
+            call_command('replay_ratings', stdout=out)
+
+        self.assertFalse(started[0][1])
+        self.assertFalse(RatingHistory.objects.exists())
+        _, created = start_rating_job(self.contest.id)
+        self.assertTrue(created)
+
+    def test_apply_rating_endpoint_returns_job_id(self, _get_redis):
+        self.client.force_authenticate(self.admin)
+        with patch('contest.views.start_rating_job', return_value=('job-1', True)) as start:
+            response = self.client.post(f'/api/contests/admin/contests/{self.contest.id}/apply_rating/')
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['job_id'], 'job-1')
+        start.assert_called_once_with(self.contest.id)
+
+    def test_rating_status_reports_progress(self, _get_redis):
+        """진행 중인 작업은 단계와 진행률을 돌려준다."""
+        self.client.force_authenticate(self.admin)
+        result = MagicMock(state='PROGRESS', info={'phase': 'writing', 'done': 500, 'total': 1200})
+        with patch('contest.tasks.AsyncResult', return_value=result):
+            response = self.client.get(f'/api/contests/admin/contests/{self.contest.id}/rating_status/?job_id=job-1')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['phase'], 'writing')
+        self.assertEqual((response.data['done'], response.data['total']), (500, 1200))
+
+    def test_rating_status_without_job(self, _get_redis):
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(f'/api/contests/admin/contests/{self.contest.id}/rating_status/')
+        self.assertEqual(response.status_code, 404)
+        self.assertIsNone(get_rating_job_status(self.contest.id))
@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import AdminContestViewSet, AdminProblemViewSet, ContestViewSet, ProblemViewSet, AdminParticipantViewSet, RatingHistoryViewSet
+from .views import AdminContestViewSet, AdminProblemViewSet, ContestViewSet, ProblemViewSet, AdminParticipantViewSet, RatingHistoryViewSet, scoreboard_stream
 
 app_name = 'contest'
 
@@ -17,6 +17,8 @@ urlpatterns = [
     path('contests/<uuid:virtual_id>/unregister/', ContestViewSet.as_view({'delete': 'unregister'})),
     path('contests/<uuid:virtual_id>/editorial/', ContestViewSet.as_view({'get': 'editorial'})),
     path('contests/<uuid:virtual_id>/scoreboard/', ContestViewSet.as_view({'get': 'scoreboard'})),
+    path('contests/<uuid:virtual_id>/scoreboard/stream/', scoreboard_stream),
+    path('contests/<uuid:virtual_id>/me/', ContestViewSet.as_view({'get': 'me'})),
     path('problems/', ProblemViewSet.as_view({'get': 'list'})),
     path('problems/<uuid:virtual_id>/', ProblemViewSet.as_view({'get': 'list_by_contest'})),
     path('problems/<uuid:virtual_id>/<int:pk>/', ProblemViewSet.as_view({'get': 'retrieve_by_contest'})),
@@ -33,7 +35,9 @@ urlpatterns = [
 # PATCH  /admin/contests/{pk}/     : 특정 대회 일부 수정 (Partial Update)
 # DELETE /admin/contests/{pk}/     : 특정 대회 삭제 (Destroy)
 # POST   /admin/contests/{pk}/sync_codeforces/ : Codeforces 데이터 수동 동기화
-# POST   /admin/contests/{pk}/apply_rating/    : ELO 레이팅 반영 (관리자 전용)
+# POST   /admin/contests/{pk}/apply_rating/    : ELO 레이팅 반영 작업 접수 (관리자 전용, job_id 반환)
+# GET    /admin/contests/{pk}/rating_status/   : 레이팅 반영 작업 단계/진행률 조회
+#        ?job_id={id}                      : 특정 작업 지정 (생략 시 최근 작업)
 
 
 # 2. 문제 관리 (AdminProblemViewSet)
@@ -56,6 +60,8 @@ urlpatterns = [
 # GET    /api/contests/contests/{virtual_id}/ : 특정 대회 상세 조회 (Retrieve)
 # POST   /api/contests/contests/{virtual_id}/register/ : 대회 참가 신청
 # DELETE /api/contests/contests/{virtual_id}/unregister/ : 대회 참가 취소
+# GET    /api/contests/contests/{virtual_id}/scoreboard/stream/ : 스코어보드 변경분 실시간 스트림 (SSE)
+# GET    /api/contests/contests/{virtual_id}/me/ : 내 풀이 현황, 순위, 바로 위/아래 참가자 (로그인한 참가자)
 
 # 4. 관리자 참가자 관리 (AdminParticipantViewSet)
 # Base URL: admin/participants/
@@ -1,9 +1,12 @@
-import requests
+from collections import namedtuple
+from operator import itemgetter
+from django.db.models import F
 from django.utils import timezone
 from datetime import datetime, timezone as datetime_timezone, timedelta
-from .models import Contest, Problem, Participant
-
-API_COOLDOWN = 0.5  # API 호출 간 대기 시간 (초)
+from .models import Contest, Problem, Participant, ProblemStatistics, Submission
+from .codeforces import call_api, CodeforcesAPIError
+from .scoring import ScoringContext
+from . import ranking
 
 
 def is_contest_in_freeze(contest):
@@ -33,8 +36,20 @@ def freeze_scoreboard(contest):
             ['frozen_problem_status', 'frozen_total_score', 'frozen_penalty']
         )
 
+    # 순위 인덱스도 스냅샷 점수로 프리즈용 집합을 만듦
+    ranking.rebuild(contest.id, frozen=True)
+
+    # 문제별 통계도 같은 시점으로 스냅샷
+    ProblemStatistics.objects.filter(contest=contest).update(
+        frozen_solved_count=F('solved_count'),
+        frozen_tried_count=F('tried_count'),
+        frozen_attempt_count=F('attempt_count'),
+        frozen_first_solver=F('first_solver'),
+        frozen_first_solved_at=F('first_solved_at'),
+    )
+
     contest.is_frozen = True
-    contest.save(update_fields=['is_frozen'])
+    contest.save(update_fields=['is_frozen', 'updated_at'])
 
 def fetch_contest_data(contest_id):
     
@@ -49,19 +64,14 @@ def fetch_contest_data(contest_id):
     # 1. 대회 세부 정보 및 문제 조회 (contest.standings API 사용)
     # standings API는 'contest' 객체와 'problems' 리스트를 동시에 반환
     # from=1&count=1로 설정하여 랭킹 정보는 최소화하고 문제 정보만 가져오기(요청 최소값이 1)
-    url = f"https://codeforces.com/api/contest.standings?contestId={contest_id}&from=1&count=1"
-    
     try:
-        response = requests.get(url)
-        response.raise_for_status() # HTTP 에러 발생 시 예외 처리
-        data = response.json()
-        
-        # API 상태 확인
-        if data['status'] != 'OK':
-            print(f"Error fetching contest {contest_id}: {data.get('comment')}")
+        # HTTP 에러, 재시도, 호출 제한은 공용 클라이언트에서 처리
+        try:
+            result = call_api('contest.standings', {'contestId': contest_id, 'from': 1, 'count': 1})
+        except CodeforcesAPIError as e:
+            print(f"Error fetching contest {contest_id}: {e.comment}")
             return False
 
-        result = data['result']
         contest_data = result['contest'] # 대회 정보
         problems_data = result['problems'] # 문제 목록
 
@@ -108,49 +118,146 @@ def fetch_contest_data(contest_id):
 
     
 
-def fetch_contest_latest_submissions(contest_id):
+SUBMISSION_PAGE_SIZE = 1000  # contest.status 한 번에 가져올 제출 수
+
+# 아직 채점 중인 제출의 verdict (채점이 끝나야 결과를 반영할 수 있음)
+PENDING_VERDICTS = (None, 'TESTING')
+
+# 업데이터가 쓰는 제출 정보만 담은 레코드 (Codeforces 응답 dict 대신 보관)
+# 필드 순서가 (제출 시각, 제출 ID) 순이라 별도 key 함수 없이 정렬하면 시간순이 됨
+SubmissionRecord = namedtuple('SubmissionRecord', ['creation_time', 'id', 'handle', 'problem_index', 'verdict'])
+
+
+def to_submission_record(sub, participant_handles=()):
     """
-    대회의 최근 제출 기록 1000개를 가져옵니다.
+    Codeforces 제출 dict를 SubmissionRecord로 변환
+    팀 제출은 참가자 핸들을 우선으로 기록 (작성자가 없으면 handle=None)
     """
-    url = f"https://codeforces.com/api/contest.status?contestId={contest_id}&from=1&count=1000"
+    members = sub.get('author', {}).get('members', [])
+    handles = [m.get('handle') for m in members if m.get('handle')]
+    handle = next((h for h in handles if h in participant_handles), handles[0] if handles else None)
+    return SubmissionRecord(sub['creationTimeSeconds'], sub['id'], handle, sub['problem']['index'], sub.get('verdict'))
+
+
+def fetch_contest_new_submissions(contest_id, since_id=0, start_timestamp=None, participant_handles=()):
+    """
+    대회의 새 제출 기록을 워터마크(since_id) 이후로만 가져옵니다.
+
+    contest.status는 최신순으로 반환하므로 페이지를 뒤로 넘기면서
+    since_id 이하의 제출이나 대회 시작 전 제출을 만나면 중단합니다.
+    채점 중인 제출이 있으면 그 직전까지만 반환하고, 나머지는 다음 수집 때 다시 가져옵니다.
+    응답 dict는 페이지마다 SubmissionRecord로 바꿔 필요한 값만 남깁니다.
+
+    Returns:
+        (list, int): 시간순 SubmissionRecord 목록, 새 워터마크 (실패 시 ([], since_id))
+    """
+    new_submissions = {}
+    offset = 1
+
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
-        if data['status'] != 'OK':
-             print(f"Error fetching submissions for contest {contest_id}: {data.get('comment')}")
-             return []
-        return data['result']
+        while True:
+            try:
+                page = call_api('contest.status', {
+                    'contestId': contest_id, 'from': offset, 'count': SUBMISSION_PAGE_SIZE,
+                })
+            except CodeforcesAPIError as e:
+                print(f"Error fetching submissions for contest {contest_id}: {e.comment}")
+                return [], since_id
+
+            reached_watermark = False
+            for sub in page:
+                if sub['id'] <= since_id:
+                    reached_watermark = True
+                    break
+                if start_timestamp is not None and sub['creationTimeSeconds'] < start_timestamp:
+                    reached_watermark = True
+                    break
+                # 페이지를 넘기는 사이 새 제출이 들어오면 같은 제출이 다시 보일 수 있음
+                if sub['id'] not in new_submissions:
+                    new_submissions[sub['id']] = to_submission_record(sub, participant_handles)
+
+            if reached_watermark or len(page) < SUBMISSION_PAGE_SIZE:
+                break
+            offset += SUBMISSION_PAGE_SIZE
     except Exception as e:
+        # 중간 페이지에서 실패하면 빈 구간이 생기므로 워터마크를 올리지 않음
         print(f"Exception fetching submissions for contest {contest_id}: {e}")
-        return []
+        return [], since_id
+
+    pending_ids = [sid for sid, record in new_submissions.items() if record.verdict in PENDING_VERDICTS]
+    limit = min(pending_ids) if pending_ids else None
+
+    ready = sorted(record for sid, record in new_submissions.items() if limit is None or sid < limit)
+    watermark = max(record.id for record in ready) if ready else since_id
+    return ready, watermark
+
+
+def archive_submissions(contest, records):
+    """
+    수집한 제출 기록(SubmissionRecord)을 Submission 테이블에 일괄 저장 (이미 있는 제출 ID는 무시)
+    """
+    rows = [
+        Submission(
+            id=record.id,
+            contest=contest,
+            handle=record.handle,
+            problem_index=record.problem_index,
+            verdict=record.verdict,
+            creation_time=datetime.fromtimestamp(record.creation_time, tz=datetime_timezone.utc),
+        )
+        for record in records
+        if record.handle
+    ]
+
+    if rows:
+        Submission.objects.bulk_create(rows, batch_size=500, ignore_conflicts=True)
+    return len(rows)
+
+
+def parse_problem_status(problem_status, problems):
+    """
+    "+:+2:-1" 형태의 풀이 현황 문자열을 문제별 상태로 되돌립니다.
+    문제 수와 맞지 않으면 빈 상태로 간주합니다.
+    """
+    parts = problem_status.split(':') if problem_status else []
+    if len(parts) != len(problems):
+        return {}
+
+    parsed = {}
+    for p, part in zip(problems, parts):
+        solved = part.startswith('+')
+        digits = part.lstrip('+-')
+        attempts = int(digits) if digits else 0
+        parsed[p.index] = {"solved": solved, "attempts": attempts}
+    return parsed
+
 
-def calculate_participant_stats(submissions, problems, contest_start_time, contest_end_time):
+def calculate_participant_stats(submissions, problems, contest_start_time=None, contest_end_time=None):
     """
     제출 기록과 문제 정보를 바탕으로 풀이 현황, 총점, 패널티를 계산합니다.
+    problems: 문제 목록 또는 대회마다 한 번 만든 ScoringContext (이 경우 시작/종료 시간은 컨텍스트 값 사용)
     contest_start_time: datetime 객체 (대회 시작 시간)
+    contest_end_time: datetime 객체 (대회 종료 시간, None이면 종료 제한 없음)
     """
-    # 문제별 상태 추적용 딕셔너리
-    problem_stats = { p.index: { "solved": False, "attempts": 0, "penalty_time": 0 } for p in problems }
+    context = problems if isinstance(problems, ScoringContext) else ScoringContext(problems, contest_start_time, contest_end_time)
+    slots = context.slots
+
+    # 문제별 상태 (칸 위치는 context.slots)
+    solved = [False] * len(context.problems)
+    attempts = [0] * len(context.problems)
+    penalty_time = [0] * len(context.problems)
     
     # 제출 기록은 최신순(내림차순)으로 오므로, 역순(시간순)으로 뒤집어서 처리
-    submissions = sorted(submissions, key=lambda x: x['creationTimeSeconds'])
-    
-    contest_start_timestamp = contest_start_time.timestamp()
+    submissions = sorted(submissions, key=itemgetter('creationTimeSeconds'))
     
+    contest_start_timestamp = context.start
+    contest_end_timestamp = context.end
     
     for sub in submissions:
-        problem_index = sub['problem']['index']
+        slot = slots.get(sub['problem']['index'])
         
-        if problem_index not in problem_stats:
+        if slot is None or solved[slot]:
             continue
-        
-        stats = problem_stats[problem_index]
-        
-        if stats["solved"]:
-            continue
-            
-        verdict = sub.get('verdict')
 
         # Codeforces의 relativeTimeSeconds 대신 우리 대회 시작 시간 기준 계산
         submission_time = sub['creationTimeSeconds']
@@ -161,81 +268,53 @@ def calculate_participant_stats(submissions, problems, contest_start_time, conte
             continue
 
         # 대회 종료 후 제출 무시
-        if(submission_time > contest_end_time.timestamp()):
+        if contest_end_timestamp is not None and submission_time > contest_end_timestamp:
             continue
         
-        if verdict == 'OK':
-            stats["solved"] = True
-            
-            # 음수일 경우 0 처리 (대회 시작 전 제출 등)
-            relative_seconds = max(0, relative_seconds)
-            
-            stats["penalty_time"] = int(relative_seconds / 60)
-        elif verdict != 'OK':
-            stats["attempts"] += 1
+        if sub.get('verdict') == 'OK':
+            solved[slot] = True
+            penalty_time[slot] = int(relative_seconds / 60)
+        else:
+            attempts[slot] += 1
 
     # 결과 집계
     status_parts = []
     total_score = 0.0
     total_penalty = 0
     
-    for p in problems:
-        stats = problem_stats[p.index]
-        status_str = "0"
-        
-        if stats["solved"]:
-            if stats["attempts"] == 0:
-                status_str = "+"
-            else:
-                status_str = f"+{stats['attempts']}"
-            
-            total_score += p.points
-            total_penalty += stats["penalty_time"] + (stats["attempts"] * 20)
-            
+    for slot, points in enumerate(context.points):
+        if solved[slot]:
+            status_parts.append("+" if attempts[slot] == 0 else f"+{attempts[slot]}")
+            total_score += points
+            total_penalty += penalty_time[slot] + (attempts[slot] * 20)
+        elif attempts[slot] > 0:
+            status_parts.append(f"-{attempts[slot]}")
         else:
-            if stats["attempts"] > 0:
-                status_str = f"-{stats['attempts']}"
-            else:
-                status_str = "0"
-        
-        status_parts.append(status_str)
-        
-    final_status_str = ":".join(status_parts)
+            status_parts.append("0")
     
     return {
-        "problem_status": final_status_str,
+        "problem_status": ":".join(status_parts),
         "total_score": total_score,
         "penalty": total_penalty
     }
 
-def fetch_participant_status(contest_id, handle):
+def fetch_participant_submissions(contest_id, handle):
     """
-    단일 사용자의 기록을 가져와 처리
+    단일 사용자의 대회 제출 기록을 가져와 보관용 SubmissionRecord로 변환
+    채점 중인 제출이 있으면 그 직전까지만 반환 (나머지는 업데이터가 다음 수집 때 반영)
+
+    Returns:
+        시간순 SubmissionRecord 목록 (실패 시 None)
     """
-    url = f"https://codeforces.com/api/contest.status?contestId={contest_id}&handle={handle}&from=1&count=1000"
-    
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
-        
-        if data['status'] != 'OK':
-            return None
-            
-        submissions = data['result']
-        
-        try:
-            contest = Contest.objects.get(id=contest_id)
-            problems = contest.problems.all().order_by('index')
-        except Contest.DoesNotExist:
-            return None
-            
-        if not problems:
-            return None
-
-        # 공통 계산 로직 사용
-        return calculate_participant_stats(submissions, problems, contest.start_time, contest.end_time)
-        
-    except Exception as e:
-        print(f"Exception fetching status for {handle}: {e}")
+        submissions = call_api('contest.status', {
+            'contestId': contest_id, 'handle': handle, 'from': 1, 'count': 1000,
+        })
+    except CodeforcesAPIError as e:
+        print(f"Error fetching submissions of {handle} for contest {contest_id}: {e.comment}")
         return None
+
+    records = [to_submission_record(sub, {handle}) for sub in submissions]
+    pending_ids = [record.id for record in records if record.verdict in PENDING_VERDICTS]
+    limit = min(pending_ids) if pending_ids else None
+    return sorted(record for record in records if limit is None or record.id < limit)
@@ -1,18 +1,48 @@
+import hashlib
 import os
 from django.shortcuts import render, get_object_or_404
-from django.http import FileResponse
+from django.http import FileResponse, JsonResponse, StreamingHttpResponse
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
 from rest_framework import viewsets
 from rest_framework.permissions import IsAdminUser, IsAuthenticated, AllowAny
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
 from .models import Contest, Problem, Participant, RatingHistory
-from .serializers import ContestSerializer, ProblemSerializer, ParticipantSerializer, ParticipantAdminSerializer, PublicProblemSerializer, RatingHistorySerializer, ScoreboardParticipantSerializer, EditorialUploadSerializer
+from .serializers import ContestSerializer, ProblemSerializer, ParticipantSerializer, ParticipantAdminSerializer, PublicProblemSerializer, RatingHistorySerializer, EditorialUploadSerializer
 from .utils import fetch_contest_data, is_contest_in_freeze
+from .tasks import start_rating_job, get_rating_job_status
+from . import ranking, scoreboard, streams
 from django.utils import timezone
 
 # Create your views here.
 
+def _make_etag(*parts):
+    """버전을 구성하는 값들로 ETag 생성 (해시로 감싸 대회 ID 등 내부 값은 노출하지 않음)"""
+    return hashlib.md5('-'.join(str(part) for part in parts).encode()).hexdigest()
+
+
+def _conditional_response(request, etag, last_modified=None):
+    """
+    클라이언트가 가진 버전(If-None-Match / If-Modified-Since)이 최신이면 304 응답을 반환, 아니면 None
+    etag는 따옴표 없이 전달 (응답 헤더는 _set_validators로 추가)
+    """
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    return get_conditional_response(request, etag=quote_etag(etag), last_modified=timestamp)
+
+
+def _set_validators(response, etag, last_modified=None):
+    """응답에 ETag/Last-Modified를 붙이고, 브라우저가 매번 재검증하도록 설정"""
+    response['ETag'] = quote_etag(etag)
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    # 관리자/일반 사용자 응답이 다르므로 공유 캐시에는 저장하지 않음
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
 class AdminContestViewSet(viewsets.ModelViewSet):
     """
     관리자 전용 대회 관리 ViewSet
@@ -55,16 +85,25 @@ class AdminContestViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=['post'])
     def apply_rating(self, request, pk=None):
-        """대회 결과를 바탕으로 ELO 레이팅 반영 (관리자 전용)"""
+        """대회 결과를 바탕으로 ELO 레이팅 반영 작업 접수 (관리자 전용, 진행 상황은 rating_status로 조회)"""
         contest = self.get_object()
-        from .rating_calculator import apply_contest_rating
-        
-        result = apply_contest_rating(contest.id)
-        
-        if result['success']:
-            return Response({'status': '성공', 'message': result['message']})
-        else:
-            return Response({'status': '실패', 'message': result['message']}, status=400)
+
+        if contest.is_rating_applied:
+            return Response({'status': '실패', 'message': f"Rating already applied for contest {contest.id}"}, status=400)
+
+        job_id, created = start_rating_job(contest.id)
+        message = '레이팅 반영 작업이 접수되었습니다.' if created else '이미 접수된 레이팅 반영 작업이 있습니다.'
+        return Response({'status': '접수', 'message': message, 'job_id': job_id}, status=202)
+
+    @action(detail=True, methods=['get'])
+    def rating_status(self, request, pk=None):
+        """레이팅 반영 작업의 단계/진행률 조회 (?job_id=로 특정 작업 지정 가능)"""
+        contest = self.get_object()
+        job_status = get_rating_job_status(contest.id, request.query_params.get('job_id'))
+
+        if job_status is None:
+            return Response({'status': '없음', 'message': '접수된 레이팅 반영 작업이 없습니다.', 'is_rating_applied': contest.is_rating_applied}, status=404)
+        return Response(job_status)
 
     @action(detail=True, methods=['post'], parser_classes=[MultiPartParser, FormParser])
     def upload_editorial(self, request, pk=None):
@@ -150,6 +189,23 @@ class ContestViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = ContestSerializer
     lookup_field = 'virtual_id'
 
+    def retrieve(self, request, *args, **kwargs):
+        """대회 상세 조회 (변경이 없으면 304)"""
+        contest = self.get_object()
+        serializer = self.get_serializer(contest)
+        # 버전은 대회/문제 수정 시각과 진행 상태로만 구성 (status는 시작/종료 시점에만 바뀜)
+        # remaining_seconds는 매초 바뀌므로 버전에서 제외 (프론트 타이머는 start_time/end_time으로 계산)
+        problems_updated_at = contest.problems.aggregate(last=Max('updated_at'))['last']
+        etag = _make_etag(
+            contest.id, contest.updated_at.timestamp(), problems_updated_at.timestamp() if problems_updated_at else None,
+            contest.is_frozen, bool(contest.editorial_pdf), serializer.get_status(contest), request.user.is_staff,
+        )
+
+        not_modified = _conditional_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+        return _set_validators(Response(serializer.data), etag)
+
     @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated])
     def register(self, request, virtual_id=None):
         """대회 참가 신청"""
@@ -159,6 +215,7 @@ class ContestViewSet(viewsets.ReadOnlyModelViewSet):
         if Participant.objects.filter(contest=contest, user=user).exists():
            return Response({'error': '이미 등록된 대회입니다.'}, status=400)
            
+        # 이미 수집된 제출 중 새 참가자의 기록은 post_save 시그널이 보관소에서 다시 계산해 반영
         participant = Participant.objects.create(contest=contest, user=user)
         serializer = ParticipantSerializer(participant)
         return Response({'message': '대회에 성공적으로 등록되었습니다.', 'participant': serializer.data}, status=201)
@@ -208,7 +265,10 @@ class ContestViewSet(viewsets.ReadOnlyModelViewSet):
 
     @action(detail=True, methods=['get'])
     def scoreboard(self, request, virtual_id=None):
-        """스코어보드 조회 (프리즈 상태 반영)"""
+        """
+        스코어보드 조회 (프리즈 상태 반영)
+        ?since=<version>: 바뀐 행만, ?offset=&limit= / ?around=<username>&limit=: 순위 구간만
+        """
         contest = self.get_object()
         now = timezone.now()
 
@@ -216,23 +276,132 @@ class ContestViewSet(viewsets.ReadOnlyModelViewSet):
         if not request.user.is_staff and contest.start_time and now < contest.start_time:
             return Response({'error': '대회가 시작되지 않았습니다.'}, status=403)
 
-        participants = Participant.objects.filter(contest=contest).order_by('-total_score', 'penalty')
-
         # 프리즈 상태 판단: 대회 진행 중 + 프리즈 구간 + 스냅샷 저장 완료
         show_frozen = contest.is_frozen and is_contest_in_freeze(contest)
 
-        serializer = ScoreboardParticipantSerializer(
-            participants,
-            many=True,
-            context={'request': request, 'show_frozen': show_frozen}
-        )
-
-        return Response({
+        # 관리자는 프리즈 중에도 실시간 데이터, 행은 버전별로 캐시된 값을 사용
+        variant = scoreboard.FROZEN if show_frozen and not request.user.is_staff else scoreboard.LIVE
+
+        # ?offset=&limit= 또는 ?around=<username>&limit=: 순위 인덱스로 해당 구간만 조회
+        params = request.query_params
+        windowed = any(name in params for name in ('offset', 'limit', 'around'))
+        if windowed:
+            try:
+                offset = max(0, int(params.get('offset', 0)))
+                limit = min(int(params.get('limit', scoreboard.WINDOW_DEFAULT_LIMIT)), scoreboard.WINDOW_MAX_LIMIT)
+            except ValueError:
+                return Response({'error': 'offset, limit은 정수여야 합니다.'}, status=400)
+            if limit <= 0:
+                return Response({'error': 'limit은 1 이상이어야 합니다.'}, status=400)
+
+        # 스코어보드 버전이 같으면 참가자 테이블/캐시 조회 없이 304
+        version = scoreboard.get_version(contest.id)
+        etag = _make_etag(version, variant, show_frozen, *((offset, limit, params.get('around', '')) if windowed else ()))
+        not_modified = _conditional_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+
+        payload = {
             'contest': str(contest.virtual_id),
             'contest_name': contest.name,
             'is_frozen': show_frozen,
-            'participants': serializer.data
-        })
+            'version': version,
+            # 문제별 통계(정답자/시도자/제출 수, 최초 정답자)는 업데이터가 집계해 둔 값
+            'problem_stats': scoreboard.get_problem_stats(contest, variant, version),
+        }
+
+        if windowed:
+            around = params.get('around')
+            if around:
+                # 해당 사용자가 가운데 오도록 구간 시작 위치 계산
+                participant = Participant.objects.filter(contest=contest, user__username=around).values_list('id', flat=True).first()
+                found = participant and ranking.rank(contest.id, participant, frozen=variant == scoreboard.FROZEN)
+                if not found:
+                    return Response({'error': '해당 사용자는 이 대회의 참가자가 아닙니다.'}, status=404)
+                offset = max(0, found['position'] - limit // 2)
+            payload.update({'full': True, **scoreboard.window(contest, variant, offset, limit)})
+            return _set_validators(Response(payload), etag)
+
+        rows = scoreboard.get_rows(contest, variant, version)
+
+        # ?since=<version>: 그 버전 이후 바뀐 행(순위 변화 포함)만 전달, 너무 오래된 버전이면 전체
+        since = request.query_params.get('since')
+        delta = scoreboard.rows_since(contest.id, variant, since, rows) if since else None
+        if delta is not None:
+            payload.update({'full': False, 'since': since, **delta})
+        else:
+            payload.update({'full': True, 'participants': rows})
+
+        return _set_validators(Response(payload), etag)
+
+
+    @action(detail=True, methods=['get'], permission_classes=[IsAuthenticated])
+    def me(self, request, virtual_id=None):
+        """
+        로그인한 참가자의 풀이 현황, 순위와 바로 위/아래 참가자 (프리즈 상태 반영)
+        순위 인덱스로 필요한 행만 조회하므로 스코어보드 전체 대신 자주 폴링하는 용도
+        """
+        contest = self.get_object()
+
+        if not request.user.is_staff and contest.start_time and timezone.now() < contest.start_time:
+            return Response({'error': '대회가 시작되지 않았습니다.'}, status=403)
+
+        participant = Participant.objects.filter(contest=contest, user=request.user).values_list('id', flat=True).first()
+        if participant is None:
+            return Response({'error': '신청하지 않은 대회입니다.'}, status=404)
+
+        show_frozen = contest.is_frozen and is_contest_in_freeze(contest)
+        variant = scoreboard.FROZEN if show_frozen and not request.user.is_staff else scoreboard.LIVE
+
+        # 스코어보드 버전이 같으면 순위 조회 없이 304
+        version = scoreboard.get_version(contest.id)
+        etag = _make_etag(version, variant, show_frozen, 'me', participant)
+        not_modified = _conditional_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+
+        frozen = variant == scoreboard.FROZEN
+        neighbours = ranking.around(contest.id, participant, 1, frozen=frozen)
+        rows = scoreboard.rows_by_id(contest, [entry['id'] for entry in neighbours], variant)
+        ranked_rows = [{**rows[entry['id']], 'rank': entry['rank']} for entry in neighbours if entry['id'] in rows]
+
+        position = next((i for i, row in enumerate(ranked_rows) if row['id'] == participant), None)
+        if position is None:
+            return Response({'error': '신청하지 않은 대회입니다.'}, status=404)
+        me = ranked_rows[position]
+
+        payload = {
+            'contest': str(contest.virtual_id),
+            'is_frozen': show_frozen,
+            'version': version,
+            'participant_count': ranking.count(contest.id, frozen=frozen),
+            'rank': me['rank'],
+            'participant': me,
+            'above': ranked_rows[position - 1] if position > 0 else None,
+            'below': ranked_rows[position + 1] if position + 1 < len(ranked_rows) else None,
+        }
+        return _set_validators(Response(payload), etag)
+
+
+async def scoreboard_stream(request, virtual_id):
+    """
+    스코어보드 변경분 실시간 스트림 (SSE, ASGI 서버 전용)
+    업데이터가 갱신할 때마다 바뀐 행(순위, 풀이 현황, 점수, 패널티)만 전달하며,
+    일반 사용자에게는 프리즈 규칙이 적용된 값만 보냄
+    """
+    contest = await Contest.objects.filter(virtual_id=virtual_id).afirst()
+    if contest is None:
+        return JsonResponse({'error': '대회를 찾을 수 없습니다.'}, status=404)
+
+    user = await request.auser()
+    if not user.is_staff and contest.start_time and timezone.now() < contest.start_time:
+        return JsonResponse({'error': '대회가 시작되지 않았습니다.'}, status=403)
+
+    response = StreamingHttpResponse(streams.event_stream(contest, user.is_staff), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # nginx 프록시가 이벤트를 모아서 보내지 않도록
+    response['X-Accel-Buffering'] = 'no'
+    return response
 
 
 class ProblemViewSet(viewsets.ReadOnlyModelViewSet):
@@ -261,8 +430,17 @@ class ProblemViewSet(viewsets.ReadOnlyModelViewSet):
             return Response({'error': '대회가 시작되지 않았습니다.'}, status=403)
 
         queryset = self.queryset.filter(contest=contest)
+
+        # 문제 수와 마지막 수정 시각으로 버전 판단 (변경이 없으면 직렬화 없이 304)
+        summary = queryset.aggregate(count=Count('id'), last_modified=Max('updated_at'))
+        last_modified = summary['last_modified'] or contest.updated_at
+        etag = _make_etag(contest.id, summary['count'], last_modified.timestamp())
+        not_modified = _conditional_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+
         serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        return _set_validators(Response(serializer.data), etag, last_modified)
 
     def retrieve_by_contest(self, request, virtual_id=None, pk=None):
         """특정 문제 조회 (virtual_id 검증 포함)"""
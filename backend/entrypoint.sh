@@ -7,5 +7,5 @@ python manage.py collectstatic --noinput
 echo "Applying database migrations..."
 python manage.py migrate
 
-echo "Starting Gunicorn..."
-exec gunicorn main.wsgi:application --bind 0.0.0.0:8000
+echo "Starting Gunicorn (ASGI, Uvicorn workers)..."
+exec gunicorn main.asgi:application -k uvicorn_worker.UvicornWorker --bind 0.0.0.0:8000
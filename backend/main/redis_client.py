@@ -0,0 +1,39 @@
+import time
+import redis
+from django.conf import settings
+
+# 연결 실패 후 다시 시도하기까지 대기 시간 (초)
+RECONNECT_INTERVAL = 30
+
+_client = None
+_unavailable_until = 0.0
+
+
+def get_redis():
+    """
+    gunicorn, Celery 워커, 관리 명령이 함께 쓰는 Redis 연결을 반환
+    연결할 수 없으면 None (호출하는 쪽에서 로컬 방식으로 대체)
+    """
+    global _client, _unavailable_until
+
+    if _client is not None:
+        return _client
+    if time.monotonic() < _unavailable_until:
+        return None
+
+    try:
+        client = redis.Redis.from_url(settings.REDIS_URL, socket_connect_timeout=1, socket_timeout=2)
+        client.ping()
+    except redis.RedisError:
+        _unavailable_until = time.monotonic() + RECONNECT_INTERVAL
+        return None
+
+    _client = client
+    return _client
+
+
+def mark_redis_unavailable():
+    """명령 실행 중 연결이 끊긴 경우 호출 (잠시 로컬 방식으로 대체)"""
+    global _client, _unavailable_until
+    _client = None
+    _unavailable_until = time.monotonic() + RECONNECT_INTERVAL
@@ -317,6 +317,39 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'Asia/Seoul'
 
+# Redis (호출 제한, 락 등 프로세스 간 공유 상태)
+REDIS_URL = os.environ.get('REDIS_URL', CELERY_BROKER_URL)
+
+# Codeforces API 클라이언트 설정
+CODEFORCES_API_RATE = float(os.environ.get('CODEFORCES_API_RATE', 2))  # 초당 호출 수 (전체 프로세스 합산)
+CODEFORCES_API_BURST = int(os.environ.get('CODEFORCES_API_BURST', 2))  # 한 번에 몰아서 쓸 수 있는 호출 수
+CODEFORCES_API_TIMEOUT = 10  # 요청 타임아웃 (초)
+CODEFORCES_API_MAX_RETRIES = 3  # 네트워크 오류/5xx/호출 제한 초과 시 재시도 횟수
+CODEFORCES_API_BACKOFF = 1.0  # 재시도 기본 대기 시간 (초, 지수 증가 + 지터)
+CODEFORCES_API_POOL_SIZE = 10  # keep-alive 커넥션 풀 크기
+
+# 대회 갱신 락 유지 시간 (초, 작업 중 프로세스가 죽어도 이 시간 뒤에는 해제)
+CONTEST_UPDATE_LOCK_TTL = 600
+
+# 캐시: gunicorn/Celery 워커/관리 명령이 스코어보드 버전, 빌드 락 등을 공유하도록 REDIS_URL(Redis) 사용
+# LocMem은 프로세스마다 따로 생기므로 단일 프로세스에서만 사용
+# (LOCAL_CACHE=True로 띄운 개발 서버, 테스트는 TEST_RUNNER / main.settings_test에서 지정)
+LOCAL_CACHE = os.environ.get('LOCAL_CACHE', 'False') == 'True'
+
+if REDIS_URL and not LOCAL_CACHE:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+
+# manage.py test는 LocMem 캐시로 실행 (실제 Redis의 캐시를 건드리지 않도록)
+TEST_RUNNER = 'main.test_runner.LocalCacheTestRunner'
+
+# 스코어보드 캐시 유지 시간 (초, 점수가 바뀌면 버전이 바뀌므로 오래된 값은 조회되지 않음)
+SCOREBOARD_CACHE_TIMEOUT = 60 * 60
+
 # Celery Beat Schedule
 CELERY_BEAT_SCHEDULE = {
     'update-active-contests-every-60-seconds': {
@@ -0,0 +1,8 @@
+"""
+테스트용 설정 (pytest 등 Django 테스트 러너를 거치지 않는 실행기에서 사용)
+예: DJANGO_SETTINGS_MODULE=main.settings_test pytest
+"""
+from .settings import *  # noqa: F401,F403
+from .test_runner import TEST_CACHES
+
+CACHES = TEST_CACHES
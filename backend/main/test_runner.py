@@ -0,0 +1,25 @@
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+# 테스트 전용 캐시 (프로세스 하나에서 실행되므로 LocMem으로 충분)
+TEST_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+
+class LocalCacheTestRunner(DiscoverRunner):
+    """
+    manage.py test(coverage, IDE의 Django 실행 포함)용 러너
+    설정의 캐시(배포 환경의 Redis)를 테스트 동안 LocMem으로 바꿔 실제 Redis를 건드리지 않음
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._cache_override = override_settings(CACHES=TEST_CACHES)
+        self._cache_override.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._cache_override.disable()
+        super().teardown_test_environment(**kwargs)
@@ -7,6 +7,7 @@ from django.contrib.auth import login, logout, authenticate
 from django.contrib.auth import get_user_model
 import requests
 
+from contest.codeforces import call_api, CodeforcesAPIError
 from .models import Profile, Whitelist
 from .serializers import (
     UserRegistrationSerializer,
@@ -291,22 +292,13 @@ class VerifyCodeforcesView(APIView):
                 'error': '이미 가입된 Codeforces 핸들입니다.'
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        # Codeforces API 호출
+        # Codeforces API 호출 (공용 클라이언트: 커넥션 재사용, 재시도, 호출 제한)
         try:
-            cf_api_url = f'https://codeforces.com/api/user.info?handles={handle}'
-            response = requests.get(cf_api_url, timeout=10)
-
-            if response.status_code != 200:
-                return Response({
-                    'exists': False,
-                    'error': 'Codeforces API 호출에 실패했습니다.'
-                }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
-
-            data = response.json()
+            result = call_api('user.info', {'handles': handle}, timeout=10)
 
             # Codeforces API 응답 확인
-            if data.get('status') == 'OK' and len(data.get('result', [])) > 0:
-                user_info = data['result'][0]
+            if len(result) > 0:
+                user_info = result[0]
                 return Response({
                     'exists': True,
                     'handle': user_info.get('handle')
@@ -317,6 +309,18 @@ class VerifyCodeforcesView(APIView):
                     'message': '해당 Codeforces handle이 존재하지 않습니다.'
                 }, status=status.HTTP_404_NOT_FOUND)
 
+        except CodeforcesAPIError as e:
+            # 존재하지 않는 핸들은 status=FAILED("... not found")로 응답됨
+            if e.not_found:
+                return Response({
+                    'exists': False,
+                    'message': '해당 Codeforces handle이 존재하지 않습니다.'
+                }, status=status.HTTP_404_NOT_FOUND)
+            # 재시도 후에도 남은 호출 제한 초과 등 그 밖의 실패는 핸들 여부를 알 수 없음
+            return Response({
+                'exists': False,
+                'error': f'Codeforces API 요청이 실패했습니다: {e.comment}'
+            }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
         except requests.exceptions.Timeout:
             return Response({
                 'exists': False,
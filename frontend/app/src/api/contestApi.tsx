@@ -17,23 +17,84 @@ interface ContestListResponse {
     results: Contest[];
 }
 
+export interface LeaderboardProblemResult {
+    index: string;
+    solved: boolean;
+    attempts: number;
+    accepted_at: string | null;
+}
+
 export interface LeaderboardParticipant {
     id: number;
     user: number;
     user_username: string;
     contest: string;
     problem_status: string;
+    problem_results: LeaderboardProblemResult[];
     total_score: number;
     penalty: number;
 }
 
+export interface LeaderboardProblemStats {
+    id: number;
+    index: string;
+    solved_count: number;
+    tried_count: number;
+    attempt_count: number;
+    first_solver: string | null;
+    first_solved_at: string | null;
+}
+
 export interface LeaderboardResponse {
     contest: string;
     contest_name: string;
     is_frozen: boolean;
-    participants: LeaderboardParticipant[];
+    version: string;
+    full: boolean;
+    problem_stats: LeaderboardProblemStats[];
+    // 구간 조회(offset/limit/around)일 때만 포함
+    offset?: number;
+    limit?: number;
+    total?: number;
+    // full=true일 때만 포함 (?since=로 바뀐 행만 받으면 changed/removed가 대신 옴)
+    participants?: LeaderboardParticipant[];
+    since?: string;
+    changed?: RankedParticipant[];
+    removed?: number[];
 }
 
+export interface RankedParticipant extends LeaderboardParticipant {
+    rank: number;
+}
+
+export interface MyStandingResponse {
+    contest: string;
+    is_frozen: boolean;
+    version: string;
+    participant_count: number;
+    rank: number;
+    participant: RankedParticipant;
+    above: RankedParticipant | null;
+    below: RankedParticipant | null;
+}
+
+// 남은 시간(초)을 시작/종료 시각으로 계산 (304로 재사용한 응답의 remaining_seconds는 오래된 값일 수 있음)
+export const getRemainingSeconds = (contest: Contest) => {
+    if (contest.status === 'FINISHED') return 0;
+    const target = contest.status === 'UPCOMING' ? contest.start_time : contest.end_time;
+    return Math.max(0, Math.floor((new Date(target).getTime() - Date.now()) / 1000));
+};
+
+// 스코어보드 응답을 현재 참가자 목록에 반영 (전체 응답이면 교체, 변경분 응답이면 바뀐 행만 덮어씀)
+export const applyLeaderboardResponse = (current: LeaderboardParticipant[], data: LeaderboardResponse) => {
+    if (data.full) return data.participants ?? [];
+    const removed = new Set(data.removed ?? []);
+    const changed = new Map((data.changed ?? []).map((row) => [row.id, row]));
+    return current
+        .filter((row) => !removed.has(row.id) && !changed.has(row.id))
+        .concat(Array.from(changed.values()));
+};
+
 export const contestApi = {
     getAllContests: async () => {
         const response = await client.get<ContestListResponse>('/api/contests/contests/');
@@ -55,8 +116,20 @@ export const contestApi = {
         const response = await client.get(`/api/contests/admin/participants/?virtual_id=${virtual_id}`);
         return response.data.results;
     },
-    getLeaderboard: async (virtual_id: string | null) => {
-        const response = await client.get<LeaderboardResponse>(`/api/contests/contests/${virtual_id}/scoreboard/`);
+    getLeaderboard: async (virtual_id: string | null, since?: string) => {
+        const response = await client.get<LeaderboardResponse>(
+            `/api/contests/contests/${virtual_id}/scoreboard/`, { params: since ? { since } : undefined }
+        );
+        return response.data;
+    },
+    getLeaderboardWindow: async (virtual_id: string, params: { offset?: number; limit?: number; around?: string }) => {
+        const response = await client.get<LeaderboardResponse & { participants: RankedParticipant[] }>(
+            `/api/contests/contests/${virtual_id}/scoreboard/`, { params }
+        );
+        return response.data;
+    },
+    getMyStanding: async (virtual_id: string) => {
+        const response = await client.get<MyStandingResponse>(`/api/contests/contests/${virtual_id}/me/`);
         return response.data;
     },
     downloadEditorial: async (virtual_id: string) => {
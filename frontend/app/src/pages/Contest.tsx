@@ -2,7 +2,7 @@ import { useState, useEffect } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
 import Navbar from '../components/Navbar';
 import { problemApi, Problem } from '../api/problemApi';
-import { contestApi, Contest as ContestType } from '../api/contestApi';
+import { contestApi, Contest as ContestType, getRemainingSeconds } from '../api/contestApi';
 import { useAuth } from '../context/AuthContext';
 import ProblemSet from '../components/ProblemSet';
 import Leaderboard from './Leaderboard';
@@ -96,7 +96,7 @@ const Contest = () => {
 
         const updateTimer = () => {
             setRemainingSeconds((prev) => {
-                if (prev === null) return contest.remaining_seconds;
+                if (prev === null) return getRemainingSeconds(contest);
                 return prev - 1;
             });
             
@@ -1,7 +1,7 @@
 import { useState, useEffect, useRef } from 'react';
 import { useParams } from 'react-router-dom';
 import { problemApi, Problem } from '../api/problemApi';
-import { contestApi, LeaderboardParticipant } from '../api/contestApi';
+import { contestApi, applyLeaderboardResponse, LeaderboardParticipant } from '../api/contestApi';
 import './Leaderboard.css';
 
 const Leaderboard = () => {
@@ -16,11 +16,12 @@ const Leaderboard = () => {
             const leaderboardData = await contestApi.getLeaderboard(contestId);
             setIsFrozen(leaderboardData.is_frozen);
             
-            const sortedParticipants = leaderboardData.participants.sort((a, b) => {
-                if (a.total_score !== b.total_score) return b.total_score - a.total_score;
-                return a.penalty - b.penalty;
-            });
-            setParticipants(sortedParticipants);
+            setParticipants((current) =>
+                applyLeaderboardResponse(current, leaderboardData).sort((a, b) => {
+                    if (a.total_score !== b.total_score) return b.total_score - a.total_score;
+                    return a.penalty - b.penalty;
+                })
+            );
         } catch (error) {
             console.error("Failed to fetch leaderboard data:", error);
         }